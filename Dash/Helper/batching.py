@@ -0,0 +1,74 @@
+# CAN ECUs answer up to six PIDs in a single Mode 01 request
+MAX_BATCH = 6
+
+# ELM327 protocol numbers for ISO 15765-4 CAN
+CAN_PROTOCOLS = ("6", "7", "8", "9")
+
+def build_batch_command(channels):
+    """
+    Builds a single Mode 01 request that asks for several PIDs at once.
+
+    Args:
+        channels (list): The channels to read, at most `MAX_BATCH` of them.
+
+    Returns:
+        obd.OBDCommand: A command whose response value is a dictionary of channel name to converted value.
+
+    Description:
+        - The request is the mode followed by every PID, e.g. `010C0D102F`.
+        - The combined response is split back into each PID's data bytes.
+        - Each PID is then decoded with python-obd's own decoder for that command and converted to the dash's units.
+    """
+
+    # python-obd is slow to import and the lean ELM327 driver only needs `split_batch_response`
+    import obd
+    from obd.protocols import ECU
+    from obd.protocols.protocol import Message
+
+    commands = {int(channel.pid, 16): (channel, obd.commands[channel.command]) for channel in channels}
+    request = b"01" + b"".join(f"{pid:02X}".encode() for pid in commands)
+
+    def decode(messages):
+        values = {}
+        sizes = {pid: command.bytes - 2 for pid, (_, command) in commands.items()}
+        for message in messages:
+            for pid, data in split_batch_response(message.data, sizes).items():
+                channel, command = commands[pid]
+
+                # Hand the decoder a message that looks like a single PID response
+                single = Message([])
+                single.data = bytearray([0x41, pid]) + data
+                values[channel.name] = channel.convert(command.decode([single]))
+        return values
+
+    return obd.OBDCommand("BATCH_" + request[2:].decode(), "Multiple PIDs", request, 0, decode, ECU.ENGINE, True)
+
+def split_batch_response(data, sizes):
+    """
+    Splits the data of a multi-PID Mode 01 response into each PID's bytes.
+
+    Args:
+        data (bytes): The response data starting with the mode byte (0x41).
+        sizes (dict): Number of data bytes returned for each PID that was requested.
+
+    Returns:
+        dict: The data bytes for each PID found in the response.
+
+    Description:
+        - The response is the mode byte followed by each PID and its data bytes, e.g. `41 0C 1A F8 0D 32`.
+        - Parsing stops at the first PID that was not requested, since its length is unknown.
+    """
+
+    found = {}
+    if not data or data[0] != 0x41:
+        return found
+
+    i = 1
+    while i < len(data):
+        pid = data[i]
+        if pid not in sizes or i + 1 + sizes[pid] > len(data):
+            break
+        found[pid] = bytes(data[i + 1:i + 1 + sizes[pid]])
+        i += 1 + sizes[pid]
+
+    return found
@@ -1,8 +1,10 @@
 import time
-import matplotlib.pyplot as plt
 import os
 from math import pi
+from collections import OrderedDict
 from .builder import *
+from .supported import SupportedPids
+from .plot import GraphWorker
 
 # Path to the brightness file
 brightness_file = "/sys/class/backlight/10-0045/brightness"
@@ -154,25 +156,38 @@ def check_wifi():
         wifi = 0
     return wifi
 
-def draw_text(screen, text, font, color, x, y, max_width=None):
+# Rendered text kept between frames, the least recently drawn is dropped once there are more than TEXT_CACHE_SIZE
+TEXT_CACHE_SIZE = 256
+text_cache = OrderedDict()
+text_cache_stats = {"hits": 0, "misses": 0}
+
+def render_text(text, font, color, max_width=None):
     """
-    Draws text on the screen with word wrapping support.
+    Wraps and renders text, reusing the result from an earlier call with the same arguments.
 
     Args:
-        screen (pygame.Surface): The surface to draw the text on.
-        text (str): The text to be displayed.
+        text (str): The text to be rendered.
         font (pygame.font.Font): The font used for the text.
         color (tuple): The color of the text in (R, G, B) format.
-        x (int): The x-coordinate of the text's starting position.
-        y (int): The y-coordinate of the text's starting position.
         max_width (int, optional): The maximum width for the text before wrapping. Defaults to the screen width.
 
+    Returns:
+        list: A rendered surface for each line of the wrapped text.
+
     Description:
         - Splits the text into words and calculates the space needed to render each line.
         - Wraps the text so it fits within the specified `max_width`.
-        - Draws each line of text at the specified (x, y) position.
+        - Keeps the rendered lines in `text_cache`, so labels that don't change (e.g. "RPM") are only rendered once.
     """
 
+    key = (text, font, tuple(color), max_width)
+    lines = text_cache.get(key)
+    if lines is not None:
+        text_cache.move_to_end(key)
+        text_cache_stats["hits"] += 1
+        return lines
+    text_cache_stats["misses"] += 1
+
     words = text.split(' ')
     space_width, _ = font.size(' ')
     max_width = max_width or SCREEN_WIDTH
@@ -192,11 +207,104 @@ def draw_text(screen, text, font, color, x, y, max_width=None):
             current_width = word_width + space_width
     
     lines.append(' '.join(current_line))
-    
-    for i, line in enumerate(lines):
-        text_surface = font.render(line, True, color)
+    lines = [font.render(line, True, color) for line in lines]
+
+    text_cache[key] = lines
+    if len(text_cache) > TEXT_CACHE_SIZE:
+        text_cache.popitem(last=False)
+    return lines
+
+def draw_text(screen, text, font, color, x, y, max_width=None):
+    """
+    Draws text on the screen with word wrapping support.
+
+    Args:
+        screen (pygame.Surface): The surface to draw the text on.
+        text (str): The text to be displayed.
+        font (pygame.font.Font): The font used for the text.
+        color (tuple): The color of the text in (R, G, B) format.
+        x (int): The x-coordinate of the text's starting position.
+        y (int): The y-coordinate of the text's starting position.
+        max_width (int, optional): The maximum width for the text before wrapping. Defaults to the screen width.
+
+    Returns:
+        pygame.Rect: The area the text was drawn in.
+
+    Description:
+        - Gets the wrapped and rendered lines from `render_text`.
+        - Draws each line of text at the specified (x, y) position.
+    """
+
+    drawn_rect = None
+    for i, text_surface in enumerate(render_text(text, font, color, max_width)):
         text_rect = text_surface.get_rect(center=(x, y + i * font.get_height()))
         screen.blit(text_surface, text_rect)
+        drawn_rect = text_rect if drawn_rect is None else drawn_rect.union(text_rect)
+
+    return drawn_rect
+
+# Characters of the readings that are drawn from pre-rendered glyphs
+GLYPH_CHARACTERS = "0123456789.%- vF"
+glyph_atlases = {}
+
+def glyph_atlas(font, color):
+    """
+    Gets every character in `GLYPH_CHARACTERS` rendered in a font and color, rendering them the first time.
+
+    Args:
+        font (pygame.font.Font): The font of the glyphs.
+        color (tuple): The color of the glyphs in (R, G, B) format.
+
+    Returns:
+        dict: The rendered surface of each character.
+    """
+
+    key = (font, tuple(color))
+    atlas = glyph_atlases.get(key)
+    if atlas is None:
+        atlas = {character: font.render(character, True, color) for character in GLYPH_CHARACTERS}
+        glyph_atlases[key] = atlas
+    return atlas
+
+def draw_number(screen, text, font, color, x, y):
+    """
+    Draws a reading on the screen from pre-rendered glyphs, centered on (x, y) like `draw_text`.
+
+    Args:
+        screen (pygame.Surface): The surface to draw the reading on.
+        text (str): The reading, e.g. "6543", "55.3%" or "14.2 v".
+        font (pygame.font.Font): The font used for the reading.
+        color (tuple): The color of the reading in (R, G, B) format.
+        x (int): The x-coordinate of the reading's center.
+        y (int): The y-coordinate of the reading's center.
+
+    Returns:
+        pygame.Rect: The area the reading was drawn in.
+
+    Description:
+        - Readings change every frame, so instead of rendering the whole string each glyph is rendered once and blitted.
+        - Every digit takes the width of the widest one, with narrow digits (the 1) on the right like a seven segment
+          display, so digits don't shift around as the reading changes.
+        - Text with characters that don't have a glyph is drawn with `draw_text`.
+    """
+
+    if any(character not in GLYPH_CHARACTERS for character in text):
+        return draw_text(screen, text, font, color, x, y)
+
+    atlas = glyph_atlas(font, color)
+    digit_width = max(atlas[digit].get_width() for digit in "0123456789")
+    widths = [digit_width if character.isdigit() else atlas[character].get_width() for character in text]
+
+    drawn_rect = pygame.Rect(0, 0, sum(widths), font.get_height())
+    drawn_rect.center = (x, y)
+
+    glyph_x = drawn_rect.left
+    for character, width in zip(text, widths):
+        glyph = atlas[character]
+        screen.blit(glyph, (glyph_x + width - glyph.get_width(), drawn_rect.top))
+        glyph_x += width
+
+    return drawn_rect
 
 def draw_rounded_rect(surface, color, rect, radius):
     """
@@ -231,6 +339,37 @@ def draw_rounded_rect(surface, color, rect, radius):
     for corner in corners:
         pygame.draw.circle(surface, color, corner, radius)
 
+def changed_regions(regions, previous_regions):
+    """
+    Finds the parts of the screen that look different from the last frame.
+
+    Args:
+        regions (dict): The regions a page drew this frame, each name maps to (rect, value) where the value is
+            whatever decides how the region looks (e.g. the text drawn in it).
+        previous_regions (dict): The regions the page drew last frame.
+
+    Returns:
+        list: The rects that need to be drawn to the display again.
+
+    Description:
+        - A region is changed if its value is different, or if it was only drawn in one of the two frames.
+        - The rect covers where the region is now and where it was, so a shorter value also clears the longer one.
+    """
+
+    rects = []
+    for name, (rect, value) in regions.items():
+        previous = previous_regions.get(name)
+        if previous is None:
+            rects.append(rect)
+        elif previous[1] != value:
+            rects.append(rect.union(previous[0]))
+
+    for name, (rect, _) in previous_regions.items():
+        if name not in regions:
+            rects.append(rect)
+
+    return rects
+
 def display_logo(screen):
     """
     Displays the Chevrolet logo with a rotating and scaling animation on the given screen.
@@ -303,45 +442,126 @@ def calculate_mpg(speed, maf):
     mpg = speed / gph
     return round(mpg * 10, 1)
 
-def load_supported():
+# Where the connection saves what it learned about the car and the adapter, so the next start connects faster
+SUPPORTED_FILE = "Data/supported_pids.txt"
+ADAPTER_FILE = "Data/adapter.txt"
+
+def read_supported_file():
     """
-    Loads supported PIDs from a file.
+    Reads every car's saved supported PIDs.
+
+    Returns:
+        dict: The supported PIDs bitmap (as hex) for each VIN.
+    """
+
+    cars = {}
+    try:
+        with open(SUPPORTED_FILE, 'r') as file:
+            for line in file.read().splitlines():
+                parts = line.split()
+                if len(parts) == 2:
+                    cars[parts[0]] = parts[1]
+    except FileNotFoundError:
+        pass
+    return cars
+
+def load_supported(vin):
+    """
+    Loads the supported PIDs saved for a car.
+
+    Args:
+        vin (str): The car's VIN.
 
     Returns:
-        list: A list of supported PIDs.
+        SupportedPids: The car's supported PIDs, empty if they have not been saved yet.
 
     Description:
-        - Reads the "Data/supported.txt" file and loads each line as a PID.
-        - If an error occurs while loading, it prints an error message and returns an empty list.
+        - Reads the "Data/supported_pids.txt" file, which has a line with the VIN and supported PIDs bitmap for each car.
+        - If an error occurs while loading, it prints an error message and returns no PIDs.
     """
 
-    supported = []
+    supported = SupportedPids()
     try:
-        with open("Data/supported.txt", 'r') as file:
-            supported = file.read().splitlines()  # Load each PID as a list item
+        bitmap = read_supported_file().get(vin)
+        if bitmap:
+            supported = SupportedPids.from_hex(bitmap)
     except Exception as e:
         print(f"Error loading supported PIDs from file: {e}")
     return supported
 
-def save_supported(supported):
+def save_supported(vin, supported):
     """
-    Saves supported PIDs to a file.
+    Saves a car's supported PIDs.
 
     Args:
-        supported (list): A list of supported PIDs.
+        vin (str): The car's VIN.
+        supported (SupportedPids): The car's supported PIDs.
 
     Description:
-        - Writes each PID in the list to the "Data/supported.txt" file.
+        - Updates the car's line in the "Data/supported_pids.txt" file, keeping the other cars' lines.
         - If an error occurs during the save operation, it prints an error message.
     """
 
     try:
-        with open("Data/supported.txt", 'w') as file:
-            for pid in supported:
-                file.write(f"{pid}\n")
+        cars = read_supported_file()
+        cars[vin] = supported.to_hex()
+        with open(SUPPORTED_FILE, 'w') as file:
+            for car, bitmap in cars.items():
+                file.write(f"{car} {bitmap}\n")
     except Exception as e:
         print(f"Error saving supported PIDs to file: {e}")
 
+def save_adapter(baudrate, protocol):
+    """
+    Saves the adapter settings that last connected to the car.
+
+    Args:
+        baudrate (int): The adapter's baud rate, or None if it was not detected.
+        protocol (str): The ELM327 protocol number (e.g. "6").
+
+    Description:
+        - Writes the baud rate and protocol to the "Data/adapter.txt" file, separated by a comma.
+    """
+
+    try:
+        with open(ADAPTER_FILE, "w") as file:
+            file.write(f"{baudrate or ''},{protocol}")
+    except Exception as e:
+        print(f"Error saving adapter settings to file: {e}")
+
+def forget_adapter():
+    """
+    Deletes the saved adapter settings, so the next connection detects them.
+    """
+
+    try:
+        os.remove(ADAPTER_FILE)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"Error deleting adapter settings: {e}")
+
+def load_adapter():
+    """
+    Loads the adapter settings that last connected to the car.
+
+    Returns:
+        tuple: The baud rate (or None) and the protocol number (or None if no settings are saved).
+
+    Description:
+        - Reads the baud rate and protocol from the "Data/adapter.txt" file.
+    """
+
+    try:
+        with open(ADAPTER_FILE, "r") as file:
+            data = file.read().strip().split(",")
+            return (int(data[0]) if data[0] else None), (data[1] or None)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"Error loading adapter settings from file: {e}")
+    return None, None
+
 def tint_image(image, tint_color):
     """
     Applies a tint to an image.
@@ -362,6 +582,120 @@ def tint_image(image, tint_color):
     tinted_image.fill(tint_color, special_flags=pygame.BLEND_RGB_MULT)
     return tinted_image
 
+# Decoded and scaled images, the least recently used are dropped once they take up more than ASSET_CACHE_BYTES
+ASSET_CACHE_BYTES = 16 * 1024 * 1024
+asset_cache = OrderedDict()
+asset_cache_bytes = 0
+
+def load_image(path, size):
+    """
+    Loads an image scaled to a size, decoding it from disk only the first time or when the file changes.
+
+    Args:
+        path (str): The path of the image.
+        size (tuple): The (width, height) to scale the image to.
+
+    Returns:
+        pygame.Surface: The scaled image, or None if the file doesn't exist.
+
+    Description:
+        - Keeps the images in `asset_cache` keyed by (path, modified time, size), so a file that is written again
+          is loaded again and its old versions are dropped.
+        - Images are converted to the display's pixel format, keeping transparency, so blitting them needs no conversion.
+    """
+
+    global asset_cache_bytes
+
+    try:
+        modified = os.path.getmtime(path)
+    except OSError:
+        return None
+
+    key = (path, modified, tuple(size))
+    image = asset_cache.get(key)
+    if image is not None:
+        asset_cache.move_to_end(key)
+        return image
+
+    # Drop the versions of the file from before it changed
+    for old_key in [old_key for old_key in asset_cache if old_key[0] == path and old_key[1] != modified]:
+        old_image = asset_cache.pop(old_key)
+        asset_cache_bytes -= old_image.get_height() * old_image.get_pitch()
+
+    image = pygame.transform.scale(pygame.image.load(path), size)
+    if pygame.display.get_surface() is not None:
+        image = image.convert_alpha() if image.get_flags() & pygame.SRCALPHA else image.convert()
+
+    asset_cache[key] = image
+    asset_cache_bytes += image.get_height() * image.get_pitch()
+    while asset_cache_bytes > ASSET_CACHE_BYTES and len(asset_cache) > 1:
+        _, old_image = asset_cache.popitem(last=False)
+        asset_cache_bytes -= old_image.get_height() * old_image.get_pitch()
+    return image
+
+# Tinted backgrounds, the least recently used are dropped once there are more than BACKGROUND_CACHE_SIZE
+BACKGROUND_CACHE_SIZE = 4
+background_cache = OrderedDict()
+
+def get_background(path, tint_color=None):
+    """
+    Gets a background image scaled to the screen, loading and tinting it only the first time it is needed.
+
+    Args:
+        path (str): The path of the background image.
+        tint_color (tuple, optional): The color to tint the image with in (R, G, B) format.
+
+    Returns:
+        pygame.Surface: The scaled background, tinted if a color was given.
+
+    Description:
+        - The scaled image comes from `load_image`, converted to the display's pixel format.
+        - If the image is missing, a plain background in the tint color (or black) is used instead.
+        - Keeps each tinted version in `background_cache`, so the background is only tinted again when the image or
+          color changes.
+    """
+
+    if tint_color:
+        key = (path, tuple(tint_color))
+        background = background_cache.get(key)
+        if background is not None:
+            background_cache.move_to_end(key)
+            return background
+
+    image = load_image(path, (SCREEN_WIDTH, SCREEN_HEIGHT))
+    if image is None:
+        background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        background.fill(tint_color or BLACK)
+        return background
+
+    if not tint_color:
+        return image
+
+    background = tint_image(image, tint_color)
+
+    background_cache[key] = background
+    if len(background_cache) > BACKGROUND_CACHE_SIZE:
+        background_cache.popitem(last=False)
+    return background
+
+def prewarm_backgrounds(images, image_index, tint_color):
+    """
+    Gets the backgrounds next to the selected one ready, so switching to them on the Custom page doesn't stall a frame.
+
+    Args:
+        images (list): The paths of the background images.
+        image_index (int): The index of the selected background image.
+        tint_color (tuple): The color the backgrounds are tinted with in (R, G, B) format.
+
+    Description:
+        - Called when the Custom page comes on screen and when another background is picked, not every frame.
+    """
+
+    for index in (image_index + 1, image_index - 1):
+        path = images[index % len(images)]
+        if (path, tuple(tint_color)) not in background_cache:
+            get_background(path, tint_color)
+
 def find_images(directory):
     """
     Finds and returns a list of image files in the specified directory.
@@ -514,6 +848,13 @@ def update_blink_pattern():
         last_blink_time = current_time  # Reset the last blink time
 
 def draw_shift_light(screen, FONT_COLOR, BACKGROUND_2_COLOR, shift_color_1, shift_color_2, shift_color_3, shift_color_4, shift_padding, rpm, shift, shift_light_height=.17):
+    """
+    Draws the row of shift lights, lighting more of them the closer the RPM gets to the shift point.
+
+    Returns:
+        tuple: The area the lights were drawn in, and the color each light was filled with (None if it is off).
+    """
+
     circle_radius = 24
     circle_spacing = 4
 
@@ -533,6 +874,7 @@ def draw_shift_light(screen, FONT_COLOR, BACKGROUND_2_COLOR, shift_color_1, shif
     update_blink_pattern()  # Update the blink pattern based on the time
 
     # Draw each shift light
+    fills = []
     for i in range(len(light_colors)):
         color = light_colors[i]
 
@@ -540,25 +882,26 @@ def draw_shift_light(screen, FONT_COLOR, BACKGROUND_2_COLOR, shift_color_1, shif
         pygame.draw.circle(screen, BACKGROUND_2_COLOR, (circle_x, circle_y), circle_radius - 3)
 
         # Logic for blinking shift lights based on RPM
+        fill = None
         if rpm > shift:
-            if blink_on:
-                pygame.draw.circle(screen, COLORS[shift_color_4], (circle_x, circle_y), circle_radius)
-            else:
-                pygame.draw.circle(screen, BACKGROUND_2_COLOR, (circle_x, circle_y), circle_radius)
+            fill = COLORS[shift_color_4] if blink_on else BACKGROUND_2_COLOR
 
         if rpm > shift - (((len(light_colors) + 2) - i) * shift_padding):
             if rpm > shift:
-                if blink_on:
-                    pygame.draw.circle(screen, COLORS[shift_color_4], (circle_x, circle_y), circle_radius)
-                else:
-                    pygame.draw.circle(screen, BACKGROUND_2_COLOR, (circle_x, circle_y), circle_radius)
+                fill = COLORS[shift_color_4] if blink_on else BACKGROUND_2_COLOR
             elif rpm < shift and rpm > shift - 200:
-                pygame.draw.circle(screen, COLORS[shift_color_4], (circle_x, circle_y), circle_radius)
+                fill = COLORS[shift_color_4]
             else:
-                pygame.draw.circle(screen, color, (circle_x, circle_y), circle_radius)
+                fill = color
+
+        if fill is not None:
+            pygame.draw.circle(screen, fill, (circle_x, circle_y), circle_radius)
+        fills.append(fill)
 
         circle_x += 2 * (circle_radius + circle_spacing)
 
+    return pygame.Rect(start_x, circle_y - circle_radius, total_circle_width, 2 * circle_radius), tuple(fills)
+
 def save_performance(top_speed):
     """
     Saves performance stats to a file.
@@ -597,123 +940,102 @@ def load_performance():
 
     return top_speed
 
-# Function to convert RGB values to matplotlib-compatible RGBA format
-def rgb_to_rgba(rgb_tuple):
+# The graphs of the last tracked run by name, drawn at the size the graph pages show them
+GRAPH_SIZE = (int(SCREEN_WIDTH*.97), int(SCREEN_HEIGHT*.94))
+graphs = {}
+graph_worker = GraphWorker(GRAPH_SIZE)
+
+def collect_graphs():
     """
-    Converts RGB values to RGBA.
+    Puts the graphs the worker finished drawing into `graphs`.
 
     Returns:
-        list: RGBA values.
+        bool: True if graphs of a new run came in.
     """
-    return tuple([x / 255.0 for x in rgb_tuple])
 
-# Function to create and save a graph from speed times and RPM
-def create_speed_time_graph(speed_times, FONT_COLOR, filename="speed_time_graph.png"):
-    # Convert the provided RGB colors to normalized RGBA format
-    FONT_COLOR = rgb_to_rgba(FONT_COLOR)
-    blue = rgb_to_rgba(BLUE)
+    new_graphs = graph_worker.poll()
+    if new_graphs is None:
+        return False
 
-    # Extract times, speeds, and RPMs
-    times, speeds, rpms = zip(*speed_times)
+    # Convert the graphs to the display's pixel format once, instead of on every blit
+    if pygame.display.get_surface() is not None:
+        new_graphs = {name: graph.convert_alpha() for name, graph in new_graphs.items()}
+    graphs.update(new_graphs)
+    return True
 
-    # Convert times to seconds relative to the first timestamp
-    relative_times = [t - times[0] for t in times]
+def launch_time(previous, sample):
+    """
+    Works out when the car started moving.
 
-    # Create a figure and a set of subplots with a secondary y-axis
-    fig, ax1 = plt.subplots(figsize=(10, 5))
+    Args:
+        previous (tuple): The (time, speed, error) of the reading before the first moving one, or None.
+        sample (tuple): The (time, speed, error) of the first moving reading.
 
-    # Plot speed data with the primary y-axis (left)
-    ax1.plot(relative_times, speeds, marker='o', linestyle='-', color=FONT_COLOR, label='Speed')
-    ax1.set_xlabel('Time (seconds)', color=FONT_COLOR)
-    ax1.set_ylabel('Speed (MPH)', color=FONT_COLOR)
-    ax1.tick_params(axis='x', colors=FONT_COLOR)
-    ax1.tick_params(axis='y', colors=FONT_COLOR)
+    Returns:
+        tuple: The time the car started moving and how many seconds it may be off by.
 
-    # Create a secondary y-axis for RPM
-    ax2 = ax1.twinx()
-    ax2.plot(relative_times, rpms, marker='.', linestyle='-', color=blue, label='RPM')
-    ax2.set_ylabel('RPM', color=blue)
-    ax2.tick_params(axis='y', colors=blue)
+    Description:
+        - The car started somewhere between the last reading at a stop and the first moving one, so the middle is
+          used, which is off by at most half the time between them.
+        - If the car was already moving when the last reading was taken, the run starts at the first reading.
+    """
 
-    # Plot the biggest circle for the top speed and RPM
-    max_speed = max(speeds)
-    max_rpm = max(rpms)
+    if previous is None or previous[1] > 0:
+        return sample[0], sample[2]
 
-    # Add a larger circle at the max speed and max RPM
-    ax1.scatter(relative_times[speeds.index(max_speed)], max_speed, s=200, color='green', edgecolor='black', label='Top Speed', zorder=5)
-    ax2.scatter(relative_times[rpms.index(max_rpm)], max_rpm, s=200, color='purple', edgecolor='black', label='Top RPM', zorder=5)
+    t0, _, e0 = previous
+    t1, _, e1 = sample
+    return (t0 + t1) / 2, (t1 - t0) / 2 + max(e0, e1)
 
-    # Find the time at which speed reaches or exceeds 60 and 100
-    time_at_60 = None
-    time_at_100 = None
-    
-    for rel_time, speed in zip(relative_times, speeds):
-        if speed >= 60 and time_at_60 is None:
-            time_at_60 = rel_time
-        if speed >= 100 and time_at_100 is None:
-            time_at_100 = rel_time
-    
-    # Draw vertical lines at the times when speed first reaches 60 and 100
-    if time_at_60 is not None:
-        ax1.axvline(x=time_at_60, color='red', linestyle='--', label='60 MPH Reached')
-    if time_at_100 is not None:
-        ax1.axvline(x=time_at_100, color='red', linestyle='--', label='100 MPH Reached')
-
-    # Customize the plot title and grid color
-    plt.title('Speed and RPM Over Time', color=FONT_COLOR)
-    ax1.grid(True, color=FONT_COLOR, linestyle='--', linewidth=0.5)
-
-    # Combine legends from both axes
-    lines, labels = ax1.get_legend_handles_labels()
-    lines2, labels2 = ax2.get_legend_handles_labels()
-    ax1.legend(lines + lines2, labels + labels2, loc='upper left')
-
-    # Save the plot to a file with a transparent background
-    plt.savefig(filename, transparent=True, bbox_inches='tight')
-    plt.close()  # Close the figure to release memory
-
-# Function to create and save a speed-RPM graph
-def create_speed_rpm_graph(speed_times, FONT_COLOR, filename="speed_rpm_graph.png"):
-    # Convert the provided RGB colors to normalized RGBA format
-    FONT_COLOR = rgb_to_rgba(FONT_COLOR)
-
-    # Extract speeds and RPMs
-    _, speeds, rpms = zip(*speed_times)
-
-    # Create a new figure for RPM vs Speed
-    plt.figure(figsize=(10, 5))
-
-    # Plot RPM vs Speed using FONT_COLOR
-    plt.scatter(speeds, rpms, color=FONT_COLOR, marker='o', label='RPM vs Speed', alpha=0.7)
-
-    # Highlight the maximum RPM point
-    max_rpm = max(rpms)
-    max_speed = speeds[rpms.index(max_rpm)]
-    plt.scatter(max_speed, max_rpm, s=200, color=FONT_COLOR, edgecolor='black', label='Max RPM', zorder=5)
-
-    # Customize the plot with FONT_COLOR
-    plt.xlabel('Speed (MPH)', color=FONT_COLOR)
-    plt.ylabel('RPM', color=FONT_COLOR)
-    plt.title('RPM vs Speed', color=FONT_COLOR)
-    plt.grid(True, linestyle='--', linewidth=0.5, color=FONT_COLOR)
-    plt.tick_params(axis='x', colors=FONT_COLOR)
-    plt.tick_params(axis='y', colors=FONT_COLOR)
-    plt.legend(loc='upper left')
-
-    # Save the plot to a file with a transparent background
-    plt.savefig(filename, transparent=True, bbox_inches='tight')
-    plt.close()  # Close the figure to release memory
-
-def calculate_performance(FONT_COLOR, speed, top_speed, last_top_speed, tracking, speed_times, rpm, elapsed_time):
-    graph_made = False
+def crossing_time(threshold, before, previous, sample):
+    """
+    Works out when the speed crossed a threshold between two readings.
+
+    Args:
+        threshold (float): The speed crossed, in MPH.
+        before (tuple): The (time, speed, error) of the reading before `previous`, or None.
+        previous (tuple): The (time, speed, error) of the last reading, or None.
+        sample (tuple): The (time, speed, error) of the first reading at or over the threshold.
+
+    Returns:
+        tuple: The time the threshold was crossed at and how many seconds it may be off by.
+
+    Description:
+        - The speed is taken to rise in a straight line between the two readings.
+        - The error is how far the times of the readings may be off, plus how far the speed may curve away from the
+          line, estimated from how much the acceleration changed since the reading before. It is never more than the
+          distance to the readings, since the crossing is always between them.
+        - If the speed was already over the threshold at the last reading, the first reading is used as is.
+    """
+
+    if previous is None or previous[1] >= threshold:
+        return sample[0], sample[2]
+
+    t0, v0, e0 = previous
+    t1, v1, e1 = sample
+    crossing = t0 + (t1 - t0) * (threshold - v0) / (v1 - v0)
+    bound = max(crossing - t0, t1 - crossing)
+
+    # A straight line is off by half the change in acceleration times the distance to both readings
+    if before is not None and before[0] < t0:
+        acceleration = (v1 - v0) / (t1 - t0)
+        previous_acceleration = (v0 - before[1]) / (t0 - before[0])
+        jerk = (acceleration - previous_acceleration) / ((t1 - before[0]) / 2)
+        bound = min(bound, abs(jerk) * (crossing - t0) * (t1 - crossing) / 2 / acceleration)
 
+    return crossing, bound + max(e0, e1)
+
+def calculate_performance(FONT_COLOR, speed, top_speed, last_top_speed, tracking, speed_times, rpm, elapsed_time, speed_time, speed_error):
     # Initialize variables for tracking
     if 'start_time' not in calculate_performance.__dict__:
         calculate_performance.start_time = None
+        calculate_performance.start_error = 0
     if 'zero_to_sixty_time' not in calculate_performance.__dict__:
         calculate_performance.zero_to_sixty_time = None
+        calculate_performance.zero_to_sixty_error = None
     if 'zero_to_hundred_time' not in calculate_performance.__dict__:
         calculate_performance.zero_to_hundred_time = None
+        calculate_performance.zero_to_hundred_error = None
 
     # Check for top speed
     if speed > top_speed:
@@ -724,35 +1046,51 @@ def calculate_performance(FONT_COLOR, speed, top_speed, last_top_speed, tracking
     if 'previous_speed' not in calculate_performance.__dict__:
         calculate_performance.previous_speed = speed
 
+    # Keep the last two readings of the speed, the run is timed from when they were read instead of when they are drawn
+    if 'previous_sample' not in calculate_performance.__dict__:
+        calculate_performance.sample_before = None
+        calculate_performance.previous_sample = None
+    before = calculate_performance.sample_before
+    previous = calculate_performance.previous_sample
+    sample = (speed_time, speed, speed_error)
+    new_sample = previous is None or speed_time != previous[0]
+
     if tracking:
         if not speed_times:
             # Reset tracking variables when speed_times is empty
             calculate_performance.start_time = None
             calculate_performance.zero_to_sixty_time = None
+            calculate_performance.zero_to_sixty_error = None
             calculate_performance.zero_to_hundred_time = None
+            calculate_performance.zero_to_hundred_error = None
             last_top_speed = 0
 
-        # Start the timer only if speed is greater than 0
-        if speed > 0 and calculate_performance.start_time is None:
-            calculate_performance.start_time = time.time()  # Set start time when speed > 0
+        if new_sample:
+            # Start the timer only if speed is greater than 0
+            if speed > 0 and calculate_performance.start_time is None:
+                calculate_performance.start_time, calculate_performance.start_error = launch_time(previous, sample)
+
+            if calculate_performance.start_time is not None:
+                # Append the time the speed was read at, speed, and RPM to speed_times
+                speed_times.append(speed_time - calculate_performance.start_time, speed, rpm)
+
+                # Check for 0-60 time
+                if speed >= 60 and calculate_performance.zero_to_sixty_time is None:
+                    crossing, error = crossing_time(60, before, previous, sample)
+                    calculate_performance.zero_to_sixty_time = crossing - calculate_performance.start_time
+                    calculate_performance.zero_to_sixty_error = error + calculate_performance.start_error
+
+                # Check for 0-100 time
+                if speed >= 100 and calculate_performance.zero_to_hundred_time is None:
+                    crossing, error = crossing_time(100, before, previous, sample)
+                    calculate_performance.zero_to_hundred_time = crossing - calculate_performance.start_time
+                    calculate_performance.zero_to_hundred_error = error + calculate_performance.start_error
 
         if speed > last_top_speed:
             last_top_speed = speed
 
         # Calculate elapsed time only if start_time is valid
         elapsed_time = time.time() - calculate_performance.start_time if calculate_performance.start_time else None
-        
-        # Append elapsed time, speed, and RPM to speed_times
-        if elapsed_time:
-            speed_times.append((elapsed_time, speed, rpm))
-
-        # Check for 0-60 time
-        if speed >= 60 and calculate_performance.zero_to_sixty_time is None:
-            calculate_performance.zero_to_sixty_time = elapsed_time
-
-        # Check for 0-100 time
-        if speed >= 100 and calculate_performance.zero_to_hundred_time is None:
-            calculate_performance.zero_to_hundred_time = elapsed_time
 
         # Check for downward trend in speed
         # TODO change this to better suit the time tracking rather than all situations
@@ -764,27 +1102,28 @@ def calculate_performance(FONT_COLOR, speed, top_speed, last_top_speed, tracking
 
     else:
         if speed_times:
-            # Create a graph on a different thread, then reset speed_times
-            create_speed_time_graph(speed_times, FONT_COLOR)
-            create_speed_rpm_graph(speed_times, FONT_COLOR)
-            speed_times = []
-            graph_made = True
+            # Draw the graphs of the run on the worker's thread, marking the interpolated 0-60 and 0-100 times, then reset speed_times
+            graph_worker.submit(speed_times, FONT_COLOR, ((60, calculate_performance.zero_to_sixty_time),
+                                                          (100, calculate_performance.zero_to_hundred_time)))
+            speed_times.clear()
 
-    return (top_speed, last_top_speed, speed_times, graph_made, 
+    if new_sample:
+        calculate_performance.sample_before = previous
+        calculate_performance.previous_sample = sample
+
+    return (top_speed, last_top_speed, speed_times, 
             elapsed_time, 
             calculate_performance.zero_to_sixty_time, 
-            calculate_performance.zero_to_hundred_time)
-
-# Define a helper function to load and display the graph
-def display_graph(screen, filename, position, width, height):
-    if os.path.exists(filename):
-        # Load the image
-        graph_image = pygame.image.load(filename)
+            calculate_performance.zero_to_sixty_error, 
+            calculate_performance.zero_to_hundred_time, 
+            calculate_performance.zero_to_hundred_error)
 
-        # Scale the image to the full screen size
-        graph_image = pygame.transform.scale(graph_image, (width, height))
+# Define a helper function to display the graph
+def display_graph(screen, name, position):
+    graph_image = graphs.get(name)
 
-        # Draw the image on the screen, filling it completely
+    if graph_image is not None:
+        # Draw the graph on the screen, it is already the size of the page
         screen.blit(graph_image, position)
     else:
-        print(f"Graph file {filename} does not exist.")
\ No newline at end of file
+        print(f"Graph {name} has not been made.")
\ No newline at end of file
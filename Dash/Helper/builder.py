@@ -9,6 +9,9 @@ SCREEN_WIDTH, SCREEN_HEIGHT = 800, 480
 # Frames rendered per second
 FPS = 30
 
+# Frames rendered per second while nothing on screen is changing
+IDLE_FPS = 5
+
 # Colors
 RED = (255, 0, 0)
 DARK_RED = (139, 0, 0)
@@ -88,4 +91,5 @@ font_xlarge_clean = pygame.font.Font(size=200)
 font_large_clean = pygame.font.Font(size=120)
 font_medlar_clean = pygame.font.Font(size=100)
 font_medium_clean = pygame.font.Font(size=48)
-font_small_clean = pygame.font.Font(size=36)
\ No newline at end of file
+font_small_clean = pygame.font.Font(size=36)
+font_xsmall_clean = pygame.font.Font(size=24)
\ No newline at end of file
@@ -0,0 +1,322 @@
+import re
+import time
+import serial
+from .batching import split_batch_response, MAX_BATCH, CAN_PROTOCOLS
+from .supported import SupportedPids, parse_vin
+
+class Elm327Backend:
+    """
+    Lean ELM327 driver that talks to the adapter directly instead of going through python-obd.
+
+    Args:
+        port (str): The serial port of the OBD-II adapter.
+        baudrate (int): The baud rate of the adapter.
+        timeout (float): Seconds to wait for the adapter before giving up on a response.
+        protocol (str, optional): The ELM327 protocol number that worked last time.
+
+    Description:
+        - Turns off echo, linefeeds, spaces and headers so responses are as short as possible.
+        - With a saved protocol the adapter's reset and protocol search are skipped, going back to them if the car doesn't answer.
+        - Requests are encoded once per set of channels and reused.
+        - Responses are read until the `>` prompt and decoded with each channel's integer formula straight into the dash's units.
+        - On CAN protocols several PIDs are read in one request, like the python-obd backend.
+    """
+
+    PROMPT = b">"
+
+    def __init__(self, port, baudrate=38400, timeout=2, protocol=None):
+        self.port = None
+        self.protocol = ""
+        self.connected = False
+        self.batching = False
+        self.batch_failures = 0
+        self.requests = {}
+
+        try:
+            self.port = serial.serial_for_url(port, baudrate=baudrate, timeout=timeout)
+            self.connected = self.initialize(protocol)
+        except (serial.SerialException, OSError) as e:
+            print(f"Error opening {port}: {e}")
+            self.close()
+
+    def initialize(self, protocol=None):
+        """
+        Sets up the adapter and finds the car's protocol.
+
+        Args:
+            protocol (str, optional): The protocol to try first.
+
+        Returns:
+            bool: True if the car answered.
+        """
+
+        if protocol:
+            if self.setup(protocol):
+                return True
+            print("Saved adapter settings did not work, detecting them again.")
+        return self.setup()
+
+    def setup(self, protocol=None):
+        """
+        Sets the adapter's settings and checks that the car answers.
+
+        Args:
+            protocol (str, optional): The protocol to use, or None to reset the adapter and let it search for the protocol.
+
+        Returns:
+            bool: True if the car answered.
+        """
+
+        if protocol is None:
+            self.send(b"ATZ", delay=1)  # Reset, the output can be junk so don't check it
+
+        for command in (b"ATE0", b"ATL0", b"ATS0", b"ATH0", b"ATSP" + (protocol or "0").encode()):
+            if "OK" not in self.send(command):
+                print(f"{command.decode()} did not return 'OK'")
+                return False
+
+        # The first request makes the adapter search for the protocol
+        lines = self.send(b"0100")
+        if not self.parse(lines):
+            print("Connected to the adapter, but not to the car")
+            return False
+
+        lines = self.send(b"ATDPN")
+        self.protocol = lines[0][1:] if lines and lines[0].startswith("A") else (lines[0] if lines else "")
+        self.batching = self.protocol in CAN_PROTOCOLS
+        return True
+
+    def send(self, command, delay=None):
+        """
+        Sends a command and reads the response up to the prompt.
+
+        Args:
+            command (bytes): The command without the carriage return.
+            delay (float, optional): Seconds to wait before reading.
+
+        Returns:
+            list: The non-empty response lines, or an empty list if the adapter did not answer in time.
+        """
+
+        buffer = bytearray()
+        try:
+            self.port.reset_input_buffer()
+            self.port.write(command + b"\r")
+            if delay:
+                time.sleep(delay)
+
+            while not buffer.endswith(self.PROMPT):
+                data = self.port.read(self.port.in_waiting or 1)
+                if not data:
+                    return []  # Timed out without a prompt
+                buffer.extend(data)
+        except (serial.SerialException, OSError):
+            self.connected = False  # The port went away, so the connection has to be opened again
+            raise
+
+        text = buffer[:-1].replace(b"\x00", b"").decode("ascii", "ignore")
+        return [line.strip() for line in re.split("[\r\n]", text) if line.strip() and line.strip() != "SEARCHING..."]
+
+    def parse(self, lines):
+        """
+        Turns response lines into message data.
+
+        Args:
+            lines (list): The response lines from `send`.
+
+        Returns:
+            list: The data of each message as a bytearray.
+
+        Description:
+            - Single frame responses are one line of hex each, e.g. `410C1AF8`.
+            - Multi-frame CAN responses start with the byte count, then numbered lines like `0:410C1AF80D`.
+            - Anything else (NO DATA, STOPPED, errors) is ignored.
+        """
+
+        messages = []
+        length = None
+        for line in lines:
+            line = line.replace(" ", "")
+            if re.fullmatch(r"[0-9A-F]{3}", line):
+                length = int(line, 16)
+                messages.append(bytearray())
+            elif length is not None and re.fullmatch(r"[0-9A-F]:([0-9A-F]{2})+", line):
+                messages[-1] += bytes.fromhex(line[2:])
+            elif re.fullmatch(r"([0-9A-F]{2})+", line):
+                messages.append(bytearray.fromhex(line))
+
+        if length is not None:
+            messages = [message[:length] if len(message) > length else message for message in messages]
+
+        return [message for message in messages if message]
+
+    def is_connected(self):
+        return self.connected
+
+    def protocol_id(self):
+        return self.protocol
+
+    def baudrate(self):
+        return self.port.baudrate if self.port is not None else None
+
+    def batch_limit(self):
+        """
+        Returns:
+            int: The most channels that can be read in one request.
+        """
+
+        return MAX_BATCH if self.batching else 1
+
+    def request_for(self, channels):
+        """
+        Encodes the request for a set of channels once and caches it.
+
+        Args:
+            channels (list): The channels to read.
+
+        Returns:
+            tuple: The request bytes, the data size of each PID, and the channel for each PID.
+        """
+
+        key = tuple(channel.name for channel in channels)
+        if key not in self.requests:
+            pids = {int(channel.pid, 16): channel for channel in channels}
+            request = b"01" + b"".join(f"{pid:02X}".encode() for pid in pids)
+            self.requests[key] = (request, {pid: channel.size for pid, channel in pids.items()}, pids)
+        return self.requests[key]
+
+    def read_pids(self, channels):
+        """
+        Reads Mode 01 channels in a single request.
+
+        Args:
+            channels (list): The channels to read.
+
+        Returns:
+            dict: The value of each channel found in the response.
+        """
+
+        request, sizes, pids = self.request_for(channels)
+        values = {}
+        for message in self.parse(self.send(request)):
+            for pid, data in split_batch_response(message, sizes).items():
+                channel = pids[pid]
+                values[channel.name] = channel.formula(data)
+        return values
+
+    def read(self, channels):
+        """
+        Reads one or more values from the car.
+
+        Args:
+            channels (list): The channels to read.
+
+        Returns:
+            dict: The value of each channel that was read successfully, in the dash's units.
+        """
+
+        if len(channels) > 1:
+            values = self.read_pids(channels)
+            if values:
+                self.batch_failures = 0
+                return values
+
+            # Go back to single requests if the ECU keeps rejecting multi-PID requests
+            self.batch_failures += 1
+            if self.batch_failures >= 3:
+                print("Multi-PID requests are not supported, reading PIDs one at a time.")
+                self.batching = False
+
+        values = {}
+        for channel in channels:
+            if channel.command == "GET_DTC":
+                values[channel.name] = self.read_codes()
+            elif channel.formula is not None:
+                value = self.read_pids([channel])
+                if not value:
+                    break  # The car stopped answering, the other requests would only wait as well
+                values.update(value)
+        return values
+
+    def read_codes(self):
+        """
+        Reads the stored trouble codes.
+
+        Returns:
+            list: Tuples of (code, description) like python-obd's GET_DTC.
+
+        Description:
+            - CAN responses have the number of codes after the mode byte, other protocols pad each line with zeros.
+            - Each code is two bytes, the top two bits pick the P/C/B/U letter.
+        """
+
+        from obd.codes import DTC
+
+        codes = []
+        for message in self.parse(self.send(b"03")):
+            if message[0] != 0x43:
+                continue
+            data = message[2:2 + message[1] * 2] if self.protocol in CAN_PROTOCOLS else message[1:]
+
+            for i in range(0, len(data) - 1, 2):
+                if data[i] == 0 and data[i + 1] == 0:
+                    continue
+                code = f"{'PCBU'[data[i] >> 6]}{(data[i] >> 4) & 3}{data[i] & 0xF:X}{data[i + 1]:02X}"
+                codes.append((code, DTC.get(code, "")))
+        return codes
+
+    def clear_codes(self):
+        """
+        Clears the trouble codes.
+
+        Returns:
+            bool: True if the car accepted the request.
+        """
+
+        return any(message[0] == 0x44 for message in self.parse(self.send(b"04")))
+
+    def supported_pids(self):
+        """
+        Queries the car for the PIDs it supports.
+
+        Returns:
+            SupportedPids: The supported PIDs.
+
+        Description:
+            - Each of 0100, 0120 and 0140 returns 4 bytes, one bit per PID in its range.
+            - The last bit of a range says if the next range can be queried.
+        """
+
+        supported = SupportedPids()
+        for base in (0x00, 0x20, 0x40):
+            if base and base not in supported:
+                break
+            for message in self.parse(self.send(f"01{base:02X}".encode())):
+                if len(message) >= 6 and message[0] == 0x41 and message[1] == base:
+                    supported.add_range(base, int.from_bytes(message[2:6], "big"))
+                    break
+        return supported
+
+    def vin(self):
+        """
+        Queries the car for its VIN.
+
+        Returns:
+            str: The VIN, or None if the car did not give one.
+
+        Description:
+            - CAN cars send the VIN in one multi-frame message, older protocols in several messages of 4 characters.
+            - Each message starts with 49 02 and a message number, which are dropped.
+        """
+
+        data = bytearray()
+        for message in self.parse(self.send(b"0902")):
+            if len(message) > 3 and message[0] == 0x49 and message[1] == 0x02:
+                data += message[3:]
+        return parse_vin(data)
+
+    def close(self):
+        self.connected = False
+        if self.port is not None:
+            self.port.close()
+            self.port = None
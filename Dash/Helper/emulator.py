@@ -0,0 +1,465 @@
+import os
+import random
+import re
+import select
+import tempfile
+import time
+import threading
+import tty
+from math import sin
+
+# Faults the emulator can inject, by scenario name
+# - no_data, stopped and partial are the chance of each request getting that fault
+# - jitter is the most extra latency added to a request, in seconds
+# - dropout_every and dropout_for stop the adapter answering for a few seconds at a time, after which it has been power cycled
+# - hangup_every and hangup_for close the port for a few seconds at a time, like a Bluetooth connection dropping
+FAULT_PROFILES = {
+    "clean": {},
+    "no_data": {"no_data": .1},
+    "partial": {"partial": .1},
+    "jitter": {"jitter": .1},
+    "stopped": {"stopped": .05},
+    "dropout": {"dropout_every": 8, "dropout_for": 3},
+    "disconnect": {"hangup_every": 8, "hangup_for": 3},
+    "mixed": {"no_data": .03, "partial": .03, "jitter": .05, "stopped": .02, "hangup_every": 12, "hangup_for": 2},
+}
+
+class Elm327Emulator:
+    """
+    Pretends to be an ELM327 adapter plugged into a running car, on a pseudo-terminal.
+
+    Args:
+        latency (float): Seconds to wait before answering each OBD request, like the Bluetooth link and ECU would.
+        protocol (str): The ELM327 protocol number to report, "6" is ISO 15765-4 CAN (11 bit, 500 kbaud).
+        faults (dict, optional): Faults to inject, see `FAULT_PROFILES`.
+
+    Description:
+        - `start()` opens a pseudo-terminal and returns its port name, which can be handed to python-obd or the lean ELM327 driver.
+        - Answers the AT commands both drivers use (reset, echo, linefeeds, spaces, headers, protocol and voltage).
+        - Answers PIDS_A/B/C, Mode 01 requests for up to six PIDs at once, GET_DTC (03), CLEAR_DTC (04) and the VIN (0902).
+        - Responses are formatted like a CAN adapter, including multi-frame responses, with or without headers.
+        - The car's values move over time so the dash shows realistic readings.
+        - Faults can be injected to see how the dash copes with a bad link, each dropout or disconnect is recorded in `outages`.
+        - With disconnects, `start()` returns a link that keeps pointing at the newest pseudo-terminal, like /dev/rfcomm0 does.
+    """
+
+    # PIDs the emulated car supports, the range PIDs (0x20 and 0x40) are added automatically
+    SUPPORTED = (0x04, 0x05, 0x0C, 0x0D, 0x0F, 0x10, 0x11, 0x2F, 0x42, 0x46)
+    VIN = "1G1ZT51806F100001"
+
+    def __init__(self, latency=0.0, protocol="6", faults=None):
+        self.latency = latency
+        self.protocol = protocol
+        self.faults = faults or {}
+        self.outages = []  # (start, end) time of each simulated disconnect
+        self.port = None
+        self.link = None
+        self.master = None
+        self.slave = None
+        self.running = False
+        self.start_time = time.time()
+        self.codes = ["P0104", "B0123", "C0300"]
+        self.supported = set(self.SUPPORTED) | {base for base in (0x20, 0x40) for pid in self.SUPPORTED if pid > base}
+        self.reset()
+
+    def reset(self):
+        """
+        Puts the adapter back into its power on settings, like ATZ does.
+        """
+
+        self.echo = True
+        self.linefeeds = False
+        self.spaces = True
+        self.headers = False
+        self.last_command = ""
+        self.selected = "0"  # The protocol set with ATSP or ATTP, "0" searches for it
+
+    def start(self):
+        """
+        Opens the pseudo-terminal and starts answering requests on a background thread.
+
+        Returns:
+            str: The port name to connect to (e.g. "/dev/pts/3").
+        """
+
+        if self.faults.get("hangup_every"):
+            self.link = os.path.join(tempfile.gettempdir(), f"elm327-emulator-{os.getpid()}-{id(self)}")
+        self.open()
+        self.running = True
+        threading.Thread(target=self.serve, daemon=True).start()
+        return self.link or self.port
+
+    def open(self):
+        """
+        Opens a new pseudo-terminal, and points the link at it if there is one.
+        """
+
+        self.master, self.slave = os.openpty()
+        tty.setraw(self.slave)
+        self.port = os.ttyname(self.slave)
+
+        if self.link:
+            temporary = self.link + ".new"
+            os.symlink(self.port, temporary)
+            os.replace(temporary, self.link)
+
+    def close(self):
+        """
+        Closes the pseudo-terminal, anything using it gets an error on its next read or write.
+        """
+
+        for fd in (self.master, self.slave):
+            try:
+                os.close(fd)
+            except (OSError, TypeError):
+                pass
+        self.master = None
+        self.slave = None
+
+    def stop(self):
+        """
+        Stops answering requests and closes the pseudo-terminal.
+        """
+
+        self.running = False
+        self.close()
+        if self.link and os.path.lexists(self.link):
+            os.remove(self.link)
+
+    def serve(self):
+        """
+        Reads commands from the pseudo-terminal and writes back the responses.
+        """
+
+        buffer = b""
+        while self.running:
+            if self.hung_up():
+                buffer = b""
+                time.sleep(.05)
+                continue
+
+            try:
+                ready, _, _ = select.select([self.master], [], [], .1)
+                if not ready:
+                    continue
+                data = os.read(self.master, 1024)
+            except (OSError, TypeError, ValueError):
+                if not self.running:
+                    break
+                continue
+
+            buffer += data
+            while b"\r" in buffer:
+                line, buffer = buffer.split(b"\r", 1)
+                if self.outage("dropout") is not None:
+                    continue  # Nothing gets through while the adapter is out
+
+                command = line.decode("ascii", "ignore").strip()
+                self.write(self.respond(command), command)
+
+    def outage(self, fault):
+        """
+        Checks if a dropout or disconnect is happening.
+
+        Args:
+            fault (str): "dropout" or "hangup".
+
+        Returns:
+            float: The time the outage started, or None if there isn't one right now.
+
+        Description:
+            - The outage lasts `<fault>_for` seconds at the end of every `<fault>_every` seconds.
+            - When it starts it is recorded in `outages`, and the adapter loses its settings like after a power cycle,
+              so the driver has to set it up again.
+        """
+
+        every = self.faults.get(f"{fault}_every")
+        if not every:
+            return None
+
+        length = self.faults.get(f"{fault}_for", 1)
+        t = time.time() - self.start_time
+        start = self.start_time + (t // every) * every + every - length
+        if time.time() < start:
+            return None
+
+        if not self.outages or self.outages[-1][0] != start:
+            self.outages.append((start, start + length))
+            self.reset()
+        return start
+
+    def hung_up(self):
+        """
+        Closes the pseudo-terminal during a disconnect, and opens a new one once it is over.
+
+        Returns:
+            bool: True while disconnected.
+        """
+
+        if self.outage("hangup") is None:
+            if self.master is None:
+                self.open()
+            return False
+
+        if self.master is not None:
+            self.close()
+        return True
+
+    def write(self, lines, command):
+        """
+        Sends response lines back to the driver, followed by the prompt.
+
+        Args:
+            lines (list): The response lines.
+            command (str): The command being answered, echoed back if echo is on.
+        """
+
+        newline = "\r\n" if self.linefeeds else "\r"
+        response = (command + newline if self.echo else "") + newline.join(lines) + newline + newline + ">"
+        try:
+            os.write(self.master, response.encode())
+        except (OSError, TypeError):
+            pass
+
+    def respond(self, command):
+        """
+        Works out the response to a single command.
+
+        Args:
+            command (str): The command as sent by the driver, without the carriage return.
+
+        Returns:
+            list: The response lines.
+        """
+
+        command = command.replace(" ", "").upper()
+
+        # An empty command repeats the last one
+        if command == "":
+            command = self.last_command
+        self.last_command = command
+
+        if command.startswith("AT"):
+            return self.respond_at(command[2:])
+
+        if not re.fullmatch(r"[0-9A-F]+", command):
+            return ["?"]
+
+        # The car can't be reached on the wrong protocol
+        if self.selected not in ("0", self.protocol) and not self.selected.startswith("A"):
+            return ["UNABLE TO CONNECT"]
+
+        latency = self.latency + random.uniform(0, self.faults.get("jitter", 0))
+        if latency:
+            time.sleep(latency)
+
+        if random.random() < self.faults.get("no_data", 0):
+            return ["NO DATA"]
+        if random.random() < self.faults.get("stopped", 0):
+            return ["STOPPED"]
+
+        mode = command[:2]
+        if mode == "01":
+            lines = self.respond_pids(command[2:])
+        elif mode == "03":
+            lines = self.format(self.trouble_codes())
+        elif mode == "04":
+            self.codes = []
+            lines = self.format([0x44])
+        elif command == "0900":
+            lines = self.format([0x49, 0x00, 0x40, 0x00, 0x00, 0x00])  # Only the VIN is supported
+        elif command == "0902":
+            lines = self.format([0x49, 0x02, 0x01] + list(self.VIN.encode()))
+        else:
+            lines = ["NO DATA"]
+
+        # Cut the response off part way through, like a garbled Bluetooth link
+        if random.random() < self.faults.get("partial", 0):
+            text = "\r".join(lines)
+            lines = text[:random.randrange(1, len(text))].split("\r") if len(text) > 1 else lines
+        return lines
+
+    def respond_at(self, command):
+        """
+        Answers an AT command.
+
+        Args:
+            command (str): The AT command without the "AT" prefix.
+
+        Returns:
+            list: The response lines.
+        """
+
+        if command in ("Z", "WS", "D"):
+            self.reset()
+            return ["", "ELM327 v1.5"]
+        elif command == "I":
+            return ["ELM327 v1.5"]
+        elif command == "RV":
+            return [f"{self.value('Voltage'):.1f}V"]
+        elif command == "DPN":
+            return [self.selected if self.selected not in ("0", "A" + self.protocol) else "A" + self.protocol]
+        elif command == "DP":
+            return ["AUTO, ISO 15765-4 (CAN 11/500)"]
+        elif command in ("E0", "E1"):
+            self.echo = command == "E1"
+        elif command in ("L0", "L1"):
+            self.linefeeds = command == "L1"
+        elif command in ("S0", "S1"):
+            self.spaces = command == "S1"
+        elif command in ("H0", "H1"):
+            self.headers = command == "H1"
+        elif re.fullmatch(r"(SP|TP)A?[0-9A-C]", command):
+            self.selected = command[2:]
+        elif not re.fullmatch(r"(SP|TP|SH|ST|AT|CAF|AL|M|CS|PC|LP)[0-9A-F]*", command):
+            return ["?"]
+        return ["OK"]
+
+    def respond_pids(self, pids):
+        """
+        Answers a Mode 01 request for one or more PIDs.
+
+        Args:
+            pids (str): The requested PIDs as hex, possibly followed by a single response count digit.
+
+        Returns:
+            list: The response lines.
+        """
+
+        # python-obd can add the number of expected responses to the end
+        if len(pids) % 2:
+            pids = pids[:-1]
+
+        data = [0x41]
+        for i in range(0, min(len(pids), 12), 2):
+            pid = int(pids[i:i + 2], 16)
+            value = self.pid_data(pid)
+            if value is not None:
+                data += [pid] + value
+
+        if len(data) == 1:
+            return ["NO DATA"]
+        return self.format(data)
+
+    def pid_data(self, pid):
+        """
+        Encodes a PID's current value as the car would send it.
+
+        Args:
+            pid (int): The PID being requested.
+
+        Returns:
+            list: The data bytes, or None if the PID is not supported.
+        """
+
+        if pid in (0x00, 0x20, 0x40):
+            # One bit per PID in the range, most significant bit first
+            bits = 0
+            for i in range(32):
+                if pid + i + 1 in self.supported:
+                    bits |= 1 << (31 - i)
+            return list(bits.to_bytes(4, "big"))
+
+        if pid not in self.supported:
+            return None
+        elif pid == 0x0C:
+            raw = int(self.value("RPM") * 4)
+            return [raw >> 8, raw & 0xFF]
+        elif pid == 0x0D:
+            return [min(255, int(self.value("Speed") / 0.621371))]
+        elif pid == 0x10:
+            raw = int(self.value("MAF") * 100)
+            return [raw >> 8, raw & 0xFF]
+        elif pid == 0x2F:
+            return [int(self.value("Fuel_Level") * 255 / 100)]
+        elif pid == 0x42:
+            raw = int(self.value("Voltage") * 1000)
+            return [raw >> 8, raw & 0xFF]
+        elif pid in (0x46, 0x0F):
+            return [int(self.value("Air_Temp")) + 40]
+        elif pid == 0x05:
+            return [90 + 40]  # Coolant temperature
+        elif pid == 0x04:
+            return [int(self.value("RPM") / 8000 * 255)]  # Engine load
+        elif pid == 0x11:
+            return [int(self.value("RPM") / 8000 * 255)]  # Throttle position
+        return [0]
+
+    def value(self, name):
+        """
+        The emulated car's current reading for a value, in the dash's units.
+
+        Args:
+            name (str): The value's channel name.
+
+        Returns:
+            float: The current reading.
+        """
+
+        t = time.time() - self.start_time
+        if name == "RPM":
+            return 2400 + 1600 * sin(t / 2)
+        elif name == "Speed":
+            return 45 + 30 * sin(t / 6)
+        elif name == "MAF":
+            return 12 + 8 * sin(t / 2)
+        elif name == "Fuel_Level":
+            return max(0, 75 - t / 60)
+        elif name == "Voltage":
+            return 14.1 + 0.2 * sin(t / 5)
+        elif name == "Air_Temp":
+            return 22
+        return 0
+
+    def trouble_codes(self):
+        """
+        Encodes the stored trouble codes as a Mode 03 CAN response.
+
+        Returns:
+            list: The response data bytes.
+        """
+
+        data = [0x43, len(self.codes)]
+        for code in self.codes:
+            first = "PCBU".index(code[0]) << 6 | int(code[1]) << 4 | int(code[2], 16)
+            data += [first, int(code[3:], 16)]
+        return data
+
+    def format(self, data):
+        """
+        Formats response data as CAN frames the way an ELM327 prints them.
+
+        Args:
+            data (list): The response data bytes, starting with the mode byte.
+
+        Returns:
+            list: The response lines.
+
+        Description:
+            - Up to 7 bytes fit in a single frame, longer responses are split into a first frame and consecutive frames.
+            - With headers on, each line starts with the ECU's CAN id and the frame's PCI bytes.
+            - With headers off, multi-frame responses start with the byte count and number each line.
+        """
+
+        separator = " " if self.spaces else ""
+
+        def line(values):
+            return separator.join(f"{value:02X}" for value in values)
+
+        if len(data) <= 7:
+            if self.headers:
+                return ["7E8" + separator + line([len(data)] + data)]
+            return [line(data)]
+
+        if self.headers:
+            lines = ["7E8" + separator + line([0x10 | (len(data) >> 8), len(data) & 0xFF] + data[:6])]
+            rest = data[6:]
+            for i in range(0, len(rest), 7):
+                lines.append("7E8" + separator + line([0x20 | ((i // 7 + 1) & 0xF)] + rest[i:i + 7]))
+            return lines
+
+        lines = [f"{len(data):03X}", "0:" + separator + line(data[:6])]
+        rest = data[6:]
+        for i in range(0, len(rest), 7):
+            lines.append(f"{(i // 7 + 1) & 0xF:X}:" + separator + line(rest[i:i + 7]))
+        return lines
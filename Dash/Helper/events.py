@@ -1,5 +1,6 @@
 from .builder import *
 from .brain import increase_brightness, decrease_brightness, save_rpm, save_performance
+from .layout import BUTTONS
 
 def swipe_event(mouse_button_down, event, swipe_start_x, swipe_start_y, swipe_threshold, current_page, pages):
     """
@@ -53,8 +54,10 @@ def rpm_event(mouseX, mouseY, rpm_max, shift):
         tuple: Updated rpm_max and shift values.
     """
 
+    button = BUTTONS["RPM"].hit(mouseX, mouseY)
+
     # Check for collision with increase rectangle
-    if mouseX < SCREEN_WIDTH * 0.2+25+SCREEN_WIDTH*.1 and mouseX > SCREEN_WIDTH * 0.2+25 and mouseY < SCREEN_HEIGHT*.3+SCREEN_HEIGHT*.1 and mouseY > SCREEN_HEIGHT*.3:
+    if button == "max_up":
         rpm_max += 100  # Increase rpm_max by 100
 
         if rpm_max > 50000:
@@ -64,7 +67,7 @@ def rpm_event(mouseX, mouseY, rpm_max, shift):
         save_rpm(rpm_max,shift)
 
     # Check for collision with decrease rectangle
-    elif mouseX < SCREEN_WIDTH * 0.2+25+SCREEN_WIDTH*.1 and mouseX > SCREEN_WIDTH * 0.2+25 and mouseY < SCREEN_HEIGHT-SCREEN_HEIGHT*.3+SCREEN_HEIGHT*.1 and mouseY > SCREEN_HEIGHT-SCREEN_HEIGHT*.3:
+    elif button == "max_down":
         rpm_max -= 100  # Decrease rpm_max by 100
         if rpm_max == 0:
             rpm_max = 100
@@ -76,7 +79,7 @@ def rpm_event(mouseX, mouseY, rpm_max, shift):
         save_rpm(rpm_max,shift)
 
     # Check for collision with increase rectangle
-    elif mouseX < SCREEN_WIDTH * 0.7-25+SCREEN_WIDTH*.1 and mouseX > SCREEN_WIDTH * 0.7-25 and mouseY < SCREEN_HEIGHT*.3+SCREEN_HEIGHT*.1 and mouseY > SCREEN_HEIGHT*.3:
+    elif button == "shift_up":
         shift += 100  # Increase shift by 100
 
         if shift > rpm_max:
@@ -86,7 +89,7 @@ def rpm_event(mouseX, mouseY, rpm_max, shift):
         save_rpm(rpm_max,shift)
 
     # Check for collision with decrease rectangle
-    elif mouseX < SCREEN_WIDTH * 0.7-25+SCREEN_WIDTH*.1 and mouseX > SCREEN_WIDTH * 0.7-25 and mouseY < SCREEN_HEIGHT-SCREEN_HEIGHT*.3+SCREEN_HEIGHT*.1 and mouseY > SCREEN_HEIGHT-SCREEN_HEIGHT*.3:
+    elif button == "shift_down":
         shift -= 100  # Decrease shift by 100
 
         if shift == 0:
@@ -116,37 +119,39 @@ def settings_event(mouseX, mouseY, brightness, optimize, FLIP, delay, reset_perf
         tuple: Updated brightness, optimize, FLIP, and delay values.
     """
 
+    button = BUTTONS["Settings"].hit(mouseX, mouseY)
+
     # Check for collision with decrease rectangle
-    if mouseX < SCREEN_WIDTH * 0.5 + SCREEN_WIDTH*.1 and mouseX > SCREEN_WIDTH * 0.5 and mouseY < SCREEN_HEIGHT*.2+SCREEN_HEIGHT*.1 and mouseY > SCREEN_HEIGHT*.2:
+    if button == "brightness_down":
         brightness = decrease_brightness()                            
     
     # Check for collision with increase rectangle
-    elif mouseX < SCREEN_WIDTH * 0.7 + SCREEN_WIDTH*.1 and mouseX > SCREEN_WIDTH * 0.7 and mouseY < SCREEN_HEIGHT*.2+SCREEN_HEIGHT*.1 and mouseY > SCREEN_HEIGHT*.2:
+    elif button == "brightness_up":
         brightness = increase_brightness()
 
     if not holding:
         # Check for collision with optimize rectangle
-        if mouseX < SCREEN_WIDTH // 2 + SCREEN_WIDTH*.2 and mouseX > SCREEN_WIDTH // 2 + SCREEN_WIDTH*.1 and mouseY < SCREEN_HEIGHT*.42 and mouseY > SCREEN_HEIGHT*.32:
+        if button == "optimize":
             if optimize:
                 optimize = False
             else:
                 optimize = True
 
         # Check for collision with flip rectangle
-        elif mouseX < SCREEN_WIDTH//2 + SCREEN_WIDTH*.05 and mouseX > SCREEN_WIDTH//2 - SCREEN_WIDTH*.05 and mouseY < SCREEN_HEIGHT-SCREEN_HEIGHT*.1 and mouseY > SCREEN_HEIGHT-SCREEN_HEIGHT*.2:
+        elif button == "flip":
             if FLIP:
                 FLIP = False
             else:
                 FLIP = True
 
         # Check for collision with delay rectangle
-        elif mouseX < SCREEN_WIDTH // 2 + SCREEN_WIDTH*.2 and mouseX > SCREEN_WIDTH // 2 + SCREEN_WIDTH*.1 and mouseY < SCREEN_HEIGHT*.54 and mouseY > SCREEN_HEIGHT*.44:
+        elif button == "delay":
             if delay:
                 delay = False
             else:
                 delay = True
 
-        elif mouseX < SCREEN_WIDTH // 2 + SCREEN_WIDTH*.2 and mouseX > SCREEN_WIDTH // 2 + SCREEN_WIDTH*.1 and mouseY < SCREEN_HEIGHT*.66 and mouseY > SCREEN_HEIGHT*.56:
+        elif button == "reset_performance":
             save_performance(0)
             top_speed = 0
             reset_performance = True
@@ -166,9 +171,11 @@ def trouble_event(mouseX, mouseY, clear):
         bool: Updated clear status.
     """
 
+    button = BUTTONS["Trouble"].hit(mouseX, mouseY)
+
     # Check for collision with exit rectangle
     if not clear: # To prevent multiple clears
-        if mouseX < SCREEN_WIDTH//2 + SCREEN_WIDTH*.06 and mouseX > SCREEN_WIDTH//2 - SCREEN_WIDTH*.06 and mouseY < SCREEN_HEIGHT-SCREEN_HEIGHT*.1 and mouseY > SCREEN_HEIGHT-SCREEN_HEIGHT*.2:
+        if button == "clear":
             clear = True
 
     return clear
@@ -188,20 +195,22 @@ def info_event(mouseX, mouseY, wifi, logging, exit_text, development_mode):
     Returns:
         tuple: Updated logging status, exit text, and development mode status.
     """
+
+    button = BUTTONS["Info"].hit(mouseX, mouseY)
     
     # Check for collision with exit rectangle
-    if mouseX < SCREEN_WIDTH//2 + SCREEN_WIDTH*.05 and mouseX > SCREEN_WIDTH//2 - SCREEN_WIDTH*.05 and mouseY < SCREEN_HEIGHT-SCREEN_HEIGHT*.1 and mouseY > SCREEN_HEIGHT-SCREEN_HEIGHT*.2:
+    if button == "exit":
         logging = False
         exit_text = "Exiting..."
     
     # Check for collision with update rectangle
-    elif mouseX < SCREEN_WIDTH // 2 + SCREEN_WIDTH*.25 and mouseX > SCREEN_WIDTH // 2 + SCREEN_WIDTH*.05 and mouseY < SCREEN_HEIGHT*.3 and mouseY > SCREEN_HEIGHT*.2:
+    elif button == "update":
         if wifi:
             logging = False
             exit_text = "Update System"
 
     # Check for collision with update rectangle
-    elif mouseX < SCREEN_WIDTH // 2 + SCREEN_WIDTH*.2 and mouseX > SCREEN_WIDTH // 2 + SCREEN_WIDTH*.1 and mouseY < SCREEN_HEIGHT*.42 and mouseY > SCREEN_HEIGHT*.32:
+    elif button == "development_mode":
         if development_mode:
             development_mode = False
         else:
@@ -222,8 +231,10 @@ def development_event(mouseX, mouseY, show_fps):
         tuple: Updated show_fps status.
     """
 
+    button = BUTTONS["Development"].hit(mouseX, mouseY)
+
     # Check for collision with optimize rectangle
-    if mouseX < SCREEN_WIDTH // 2 + SCREEN_WIDTH*.2 and mouseX > SCREEN_WIDTH // 2 + SCREEN_WIDTH*.1 and mouseY < SCREEN_HEIGHT*.3 and mouseY > SCREEN_HEIGHT*.2:
+    if button == "show_fps":
         if show_fps:
             show_fps = False
         else:
@@ -231,7 +242,7 @@ def development_event(mouseX, mouseY, show_fps):
 
     return show_fps
 
-def custom_event(mouseX, mouseY, images, font_index, background_1_index, background_2_index, image_index, changed_image, holding = False):
+def custom_event(mouseX, mouseY, images, font_index, background_1_index, background_2_index, image_index, holding = False):
     """
     Handle custom image and font settings based on mouse clicks.
 
@@ -243,49 +254,48 @@ def custom_event(mouseX, mouseY, images, font_index, background_1_index, backgro
         background_1_index (int): Current index for background 1.
         background_2_index (int): Current index for background 2.
         image_index (int): Current image index.
-        changed_image (bool): Indicates if the image has changed.
         holding (bool): Indicates if the mouse button is held down.
 
     Returns:
-        tuple: Updated font index, background indices, image index, and changed image status.
+        tuple: Updated font index, background indices, and image index.
     """
 
+    button = BUTTONS["Custom"].hit(mouseX, mouseY)
+
     # Check for collision with left rectangle
-    if mouseX < SCREEN_WIDTH * 0.5 + SCREEN_WIDTH*.1 and mouseX > SCREEN_WIDTH * 0.5 and mouseY < SCREEN_HEIGHT*.2+SCREEN_HEIGHT*.1 and mouseY > SCREEN_HEIGHT*.2:
+    if button == "font_left":
         font_index = (font_index - 1) % len(COLORS)
 
     # Check for collision with right rectangle
-    elif mouseX < SCREEN_WIDTH * 0.7 + SCREEN_WIDTH*.1 and mouseX > SCREEN_WIDTH * 0.7 and mouseY < SCREEN_HEIGHT*.2+SCREEN_HEIGHT*.1 and mouseY > SCREEN_HEIGHT*.2:
+    elif button == "font_right":
         font_index = (font_index + 1) % len(COLORS)
 
     # Check for collision with left rectangle
-    elif mouseX < SCREEN_WIDTH * 0.5 + SCREEN_WIDTH*.1 and mouseX > SCREEN_WIDTH * 0.5 and mouseY < SCREEN_HEIGHT*.32+SCREEN_HEIGHT*.1 and mouseY > SCREEN_HEIGHT*.32:
+    elif button == "background_1_left":
         background_1_index = (background_1_index - 1) % len(COLORS)
 
     # Check for collision with right rectangle
-    elif mouseX < SCREEN_WIDTH * 0.7 + SCREEN_WIDTH*.1 and mouseX > SCREEN_WIDTH * 0.7 and mouseY < SCREEN_HEIGHT*.32+SCREEN_HEIGHT*.1 and mouseY > SCREEN_HEIGHT*.32:
+    elif button == "background_1_right":
         background_1_index = (background_1_index + 1) % len(COLORS)
 
     # Check for collision with left rectangle
-    elif mouseX < SCREEN_WIDTH * 0.5 + SCREEN_WIDTH*.1 and mouseX > SCREEN_WIDTH * 0.5 and mouseY < SCREEN_HEIGHT*.44+SCREEN_HEIGHT*.1 and mouseY > SCREEN_HEIGHT*.44:
+    elif button == "background_2_left":
         background_2_index = (background_2_index - 1) % len(COLORS)
 
     # Check for collision with right rectangle
-    elif mouseX < SCREEN_WIDTH * 0.7 + SCREEN_WIDTH*.1 and mouseX > SCREEN_WIDTH * 0.7 and mouseY < SCREEN_HEIGHT*.44+SCREEN_HEIGHT*.1 and mouseY > SCREEN_HEIGHT*.44:
+    elif button == "background_2_right":
         background_2_index = (background_2_index + 1) % len(COLORS)
 
     if not holding:
         # Check for collision with left rectangle
-        if mouseX < SCREEN_WIDTH * 0.5 + SCREEN_WIDTH*.1 and mouseX > SCREEN_WIDTH * 0.5 and mouseY < SCREEN_HEIGHT*.56+SCREEN_HEIGHT*.1 and mouseY > SCREEN_HEIGHT*.56:
+        if button == "image_left":
             image_index = (image_index - 1) % len(images)
-            changed_image = True
 
         # Check for collision with right rectangle
-        elif mouseX < SCREEN_WIDTH * 0.7 + SCREEN_WIDTH*.1 and mouseX > SCREEN_WIDTH * 0.7 and mouseY < SCREEN_HEIGHT*.56+SCREEN_HEIGHT*.1 and mouseY > SCREEN_HEIGHT*.56:
+        elif button == "image_right":
             image_index = (image_index + 1) % len(images)
-            changed_image = True
 
-    return font_index, background_1_index, background_2_index, image_index, changed_image
+    return font_index, background_1_index, background_2_index, image_index
 
 def color_1_event(mouseX, mouseY, shift_light, shift_color_1, shift_color_2, shift_color_3, shift_color_4, shift_padding):
     """
@@ -304,55 +314,57 @@ def color_1_event(mouseX, mouseY, shift_light, shift_color_1, shift_color_2, shi
     Returns:
         tuple: Updated shift light, color indices, and padding value.
     """
+
+    button = BUTTONS["Color1"].hit(mouseX, mouseY)
         
     # Check for collision with shift light rectangle
-    if mouseX < SCREEN_WIDTH // 2 + SCREEN_WIDTH*.2 and mouseX > SCREEN_WIDTH // 2 + SCREEN_WIDTH*.1 and mouseY < SCREEN_HEIGHT*.2+SCREEN_HEIGHT*.1 and mouseY > SCREEN_HEIGHT*.2:
+    if button == "shift_light":
         if shift_light:
             shift_light = False
         else:
             shift_light = True
     
     # Check for collision with left rectangle
-    elif mouseX < SCREEN_WIDTH * 0.5 + SCREEN_WIDTH*.1 and mouseX > SCREEN_WIDTH * 0.5 and mouseY < SCREEN_HEIGHT*.32+SCREEN_HEIGHT*.1 and mouseY > SCREEN_HEIGHT*.32:
+    elif button == "color_1_left":
         shift_color_1 = (shift_color_1 - 1) % len(COLORS)
 
     # Check for collision with right rectangle
-    elif mouseX < SCREEN_WIDTH * 0.7 + SCREEN_WIDTH*.1 and mouseX > SCREEN_WIDTH * 0.7 and mouseY < SCREEN_HEIGHT*.32+SCREEN_HEIGHT*.1 and mouseY > SCREEN_HEIGHT*.32:
+    elif button == "color_1_right":
         shift_color_1 = (shift_color_1 + 1) % len(COLORS)
 
     # Check for collision with left rectangle
-    elif mouseX < SCREEN_WIDTH * 0.5 + SCREEN_WIDTH*.1 and mouseX > SCREEN_WIDTH * 0.5 and mouseY < SCREEN_HEIGHT*.44+SCREEN_HEIGHT*.1 and mouseY > SCREEN_HEIGHT*.32:
+    elif button == "color_2_left":
         shift_color_2 = (shift_color_2 - 1) % len(COLORS)
 
     # Check for collision with right rectangle
-    elif mouseX < SCREEN_WIDTH * 0.7 + SCREEN_WIDTH*.1 and mouseX > SCREEN_WIDTH * 0.7 and mouseY < SCREEN_HEIGHT*.44+SCREEN_HEIGHT*.1 and mouseY > SCREEN_HEIGHT*.44:
+    elif button == "color_2_right":
         shift_color_2 = (shift_color_2 + 1) % len(COLORS)
 
     # Check for collision with left rectangle
-    elif mouseX < SCREEN_WIDTH * 0.5 + SCREEN_WIDTH*.1 and mouseX > SCREEN_WIDTH * 0.5 and mouseY < SCREEN_HEIGHT*.56+SCREEN_HEIGHT*.1 and mouseY > SCREEN_HEIGHT*.56:
+    elif button == "color_3_left":
         shift_color_3 = (shift_color_3 - 1) % len(COLORS)
 
     # Check for collision with right rectangle
-    elif mouseX < SCREEN_WIDTH * 0.7 + SCREEN_WIDTH*.1 and mouseX > SCREEN_WIDTH * 0.7 and mouseY < SCREEN_HEIGHT*.56+SCREEN_HEIGHT*.1 and mouseY > SCREEN_HEIGHT*.56:
+    elif button == "color_3_right":
         shift_color_3 = (shift_color_3 + 1) % len(COLORS)
 
     # Check for collision with left rectangle
-    elif mouseX < SCREEN_WIDTH * 0.5 + SCREEN_WIDTH*.1 and mouseX > SCREEN_WIDTH * 0.5 and mouseY < SCREEN_HEIGHT*.68+SCREEN_HEIGHT*.1 and mouseY > SCREEN_HEIGHT*.68:
+    elif button == "color_4_left":
         shift_color_4 = (shift_color_4 - 1) % len(COLORS)
 
     # Check for collision with right rectangle
-    elif mouseX < SCREEN_WIDTH * 0.7 + SCREEN_WIDTH*.1 and mouseX > SCREEN_WIDTH * 0.7 and mouseY < SCREEN_HEIGHT*.68+SCREEN_HEIGHT*.1 and mouseY > SCREEN_HEIGHT*.68:
+    elif button == "color_4_right":
         shift_color_4 = (shift_color_4 + 1) % len(COLORS)
 
     # Check for collision with left rectangle
-    elif mouseX < SCREEN_WIDTH * 0.5 + SCREEN_WIDTH*.1 and mouseX > SCREEN_WIDTH * 0.5 and mouseY < SCREEN_HEIGHT*.8+SCREEN_HEIGHT*.1 and mouseY > SCREEN_HEIGHT*.8:
+    elif button == "start_down":
         shift_padding += 10
 
         if shift_padding >= 210:
             shift_padding = 200
 
     # Check for collision with right rectangle
-    elif mouseX < SCREEN_WIDTH * 0.7 + SCREEN_WIDTH*.1 and mouseX > SCREEN_WIDTH * 0.7 and mouseY < SCREEN_HEIGHT*.8+SCREEN_HEIGHT*.1 and mouseY > SCREEN_HEIGHT*.8:
+    elif button == "start_up":
         shift_padding -= 10
 
         if shift_padding <= 0:
@@ -372,9 +384,11 @@ def performance_event(mouseX, mouseY, tracking):
     Returns:
         bool: Updated tracking status.
     """
+
+    button = BUTTONS["Performance"].hit(mouseX, mouseY)
     
     # Check for collision with exit rectangle
-    if mouseX < SCREEN_WIDTH//2 + SCREEN_WIDTH*.05 and mouseX > SCREEN_WIDTH//2 - SCREEN_WIDTH*.05 and mouseY < SCREEN_HEIGHT-SCREEN_HEIGHT*.1 and mouseY > SCREEN_HEIGHT-SCREEN_HEIGHT*.2:
+    if button == "tracking":
         if tracking:
             tracking = False
         else:
@@ -0,0 +1,43 @@
+import time
+
+class FrameScheduler:
+    """
+    Decides when the next frame is drawn.
+
+    Args:
+        fps (int): Frames per second while something on screen is changing.
+        idle_fps (int): Frames per second while nothing is.
+
+    Description:
+        - Frames are drawn at `fps` while something animates by itself (e.g. blinking shift lights or a held button).
+        - Otherwise frames are drawn at `idle_fps`, so static pages and a parked car leave the CPU to the query thread.
+        - While idling, new readings and input are checked every `1 / fps` seconds and draw the next frame straight away.
+    """
+
+    def __init__(self, fps, idle_fps):
+        self.fps = fps
+        self.idle_fps = idle_fps
+        self.last_frame = time.time()
+
+    def wait(self, animating, woken):
+        """
+        Waits until the next frame is due.
+
+        Args:
+            animating (bool): True if the screen changes by itself, so the next frame is due at `fps`.
+            woken (function): Returns True if something happened that should be drawn (e.g. new readings or input).
+        """
+
+        step = 1 / self.fps
+        deadline = self.last_frame + (step if animating else 1 / self.idle_fps)
+        next_check = self.last_frame + step
+
+        while True:
+            now = time.time()
+            if now < next_check:
+                time.sleep(next_check - now)
+            if animating or time.time() >= deadline or woken():
+                break
+            next_check += step
+
+        self.last_frame = time.time()
@@ -0,0 +1,109 @@
+from .builder import *
+
+# Size in pixels of the cells the screen is split into for finding the button under a touch
+HIT_CELL = 40
+
+# Where the buttons of each page are, as (x, y, width, height) on the screen
+LAYOUT = {
+    "RPM": {
+        "max_up": (SCREEN_WIDTH*.2+25, SCREEN_HEIGHT*.3, SCREEN_WIDTH*.1, SCREEN_HEIGHT*.1),
+        "max_down": (SCREEN_WIDTH*.2+25, SCREEN_HEIGHT-SCREEN_HEIGHT*.3, SCREEN_WIDTH*.1, SCREEN_HEIGHT*.1),
+        "shift_up": (SCREEN_WIDTH*.7-25, SCREEN_HEIGHT*.3, SCREEN_WIDTH*.1, SCREEN_HEIGHT*.1),
+        "shift_down": (SCREEN_WIDTH*.7-25, SCREEN_HEIGHT-SCREEN_HEIGHT*.3, SCREEN_WIDTH*.1, SCREEN_HEIGHT*.1),
+    },
+    "Settings": {
+        "brightness_down": (SCREEN_WIDTH*.5, SCREEN_HEIGHT*.2, SCREEN_WIDTH*.1, SCREEN_HEIGHT*.1),
+        "brightness_up": (SCREEN_WIDTH*.7, SCREEN_HEIGHT*.2, SCREEN_WIDTH*.1, SCREEN_HEIGHT*.1),
+        "optimize": (SCREEN_WIDTH//2+SCREEN_WIDTH*.1, SCREEN_HEIGHT*.32, SCREEN_WIDTH*.1, SCREEN_HEIGHT*.1),
+        "delay": (SCREEN_WIDTH//2+SCREEN_WIDTH*.1, SCREEN_HEIGHT*.44, SCREEN_WIDTH*.1, SCREEN_HEIGHT*.1),
+        "reset_performance": (SCREEN_WIDTH//2+SCREEN_WIDTH*.1, SCREEN_HEIGHT*.56, SCREEN_WIDTH*.1, SCREEN_HEIGHT*.1),
+        "flip": (SCREEN_WIDTH//2-SCREEN_WIDTH*.05, SCREEN_HEIGHT-SCREEN_HEIGHT*.2, SCREEN_WIDTH*.1, SCREEN_HEIGHT*.1),
+    },
+    "Trouble": {
+        "clear": (SCREEN_WIDTH//2-SCREEN_WIDTH*.06, SCREEN_HEIGHT-SCREEN_HEIGHT*.2, SCREEN_WIDTH*.12, SCREEN_HEIGHT*.1),
+    },
+    "Info": {
+        "exit": (SCREEN_WIDTH//2-SCREEN_WIDTH*.05, SCREEN_HEIGHT-SCREEN_HEIGHT*.2, SCREEN_WIDTH*.1, SCREEN_HEIGHT*.1),
+        "update": (SCREEN_WIDTH//2+SCREEN_WIDTH*.05, SCREEN_HEIGHT*.2, SCREEN_WIDTH*.2, SCREEN_HEIGHT*.1),
+        "development_mode": (SCREEN_WIDTH//2+SCREEN_WIDTH*.1, SCREEN_HEIGHT*.32, SCREEN_WIDTH*.1, SCREEN_HEIGHT*.1),
+    },
+    "Development": {
+        "show_fps": (SCREEN_WIDTH//2+SCREEN_WIDTH*.1, SCREEN_HEIGHT*.2, SCREEN_WIDTH*.1, SCREEN_HEIGHT*.1),
+    },
+    "Custom": {
+        "font_left": (SCREEN_WIDTH*.5, SCREEN_HEIGHT*.2, SCREEN_WIDTH*.1, SCREEN_HEIGHT*.1),
+        "font_right": (SCREEN_WIDTH*.7, SCREEN_HEIGHT*.2, SCREEN_WIDTH*.1, SCREEN_HEIGHT*.1),
+        "background_1_left": (SCREEN_WIDTH*.5, SCREEN_HEIGHT*.32, SCREEN_WIDTH*.1, SCREEN_HEIGHT*.1),
+        "background_1_right": (SCREEN_WIDTH*.7, SCREEN_HEIGHT*.32, SCREEN_WIDTH*.1, SCREEN_HEIGHT*.1),
+        "background_2_left": (SCREEN_WIDTH*.5, SCREEN_HEIGHT*.44, SCREEN_WIDTH*.1, SCREEN_HEIGHT*.1),
+        "background_2_right": (SCREEN_WIDTH*.7, SCREEN_HEIGHT*.44, SCREEN_WIDTH*.1, SCREEN_HEIGHT*.1),
+        "image_left": (SCREEN_WIDTH*.5, SCREEN_HEIGHT*.56, SCREEN_WIDTH*.1, SCREEN_HEIGHT*.1),
+        "image_right": (SCREEN_WIDTH*.7, SCREEN_HEIGHT*.56, SCREEN_WIDTH*.1, SCREEN_HEIGHT*.1),
+    },
+    "Color1": {
+        "shift_light": (SCREEN_WIDTH//2+SCREEN_WIDTH*.1, SCREEN_HEIGHT*.2, SCREEN_WIDTH*.1, SCREEN_HEIGHT*.1),
+        "color_1_left": (SCREEN_WIDTH*.5, SCREEN_HEIGHT*.32, SCREEN_WIDTH*.1, SCREEN_HEIGHT*.1),
+        "color_1_right": (SCREEN_WIDTH*.7, SCREEN_HEIGHT*.32, SCREEN_WIDTH*.1, SCREEN_HEIGHT*.1),
+        "color_2_left": (SCREEN_WIDTH*.5, SCREEN_HEIGHT*.44, SCREEN_WIDTH*.1, SCREEN_HEIGHT*.1),
+        "color_2_right": (SCREEN_WIDTH*.7, SCREEN_HEIGHT*.44, SCREEN_WIDTH*.1, SCREEN_HEIGHT*.1),
+        "color_3_left": (SCREEN_WIDTH*.5, SCREEN_HEIGHT*.56, SCREEN_WIDTH*.1, SCREEN_HEIGHT*.1),
+        "color_3_right": (SCREEN_WIDTH*.7, SCREEN_HEIGHT*.56, SCREEN_WIDTH*.1, SCREEN_HEIGHT*.1),
+        "color_4_left": (SCREEN_WIDTH*.5, SCREEN_HEIGHT*.68, SCREEN_WIDTH*.1, SCREEN_HEIGHT*.1),
+        "color_4_right": (SCREEN_WIDTH*.7, SCREEN_HEIGHT*.68, SCREEN_WIDTH*.1, SCREEN_HEIGHT*.1),
+        "start_down": (SCREEN_WIDTH*.5, SCREEN_HEIGHT*.8, SCREEN_WIDTH*.1, SCREEN_HEIGHT*.1),
+        "start_up": (SCREEN_WIDTH*.7, SCREEN_HEIGHT*.8, SCREEN_WIDTH*.1, SCREEN_HEIGHT*.1),
+    },
+    "Performance": {
+        "tracking": (SCREEN_WIDTH//2-SCREEN_WIDTH*.05, SCREEN_HEIGHT-SCREEN_HEIGHT*.2, SCREEN_WIDTH*.1, SCREEN_HEIGHT*.1),
+    },
+}
+
+class ButtonTable:
+    """
+    The buttons of a page, compiled once from their spec in `LAYOUT`.
+
+    Args:
+        spec (dict): The (x, y, width, height) of each button by name.
+
+    Description:
+        - Each button becomes one pygame.Rect that the page draws and the events check touches against, so what is
+          drawn and what can be touched are always the same.
+        - The screen is split into `HIT_CELL` sized cells that each list the buttons overlapping them, so a touch is
+          only checked against the buttons in its cell instead of every button on the page.
+        - Where buttons overlap, the one listed first in the spec is the one touched.
+    """
+
+    __slots__ = ("rects", "cells")
+
+    def __init__(self, spec):
+        self.rects = {name: pygame.Rect(rect) for name, rect in spec.items()}
+        self.cells = {}
+
+        for name, rect in self.rects.items():
+            for column in range(rect.left // HIT_CELL, (rect.right - 1) // HIT_CELL + 1):
+                for row in range(rect.top // HIT_CELL, (rect.bottom - 1) // HIT_CELL + 1):
+                    self.cells.setdefault((column, row), []).append((name, rect))
+
+    def __getitem__(self, name):
+        return self.rects[name]
+
+    def hit(self, x, y):
+        """
+        Finds the button under a touch.
+
+        Args:
+            x (int): X position of the touch.
+            y (int): Y position of the touch.
+
+        Returns:
+            str: The name of the button, or None if the touch missed every button.
+        """
+
+        x, y = int(x), int(y)
+        for name, rect in self.cells.get((x // HIT_CELL, y // HIT_CELL), ()):
+            if rect.collidepoint(x, y):
+                return name
+        return None
+
+# The buttons of every page by page name
+BUTTONS = {page: ButtonTable(spec) for page, spec in LAYOUT.items()}
@@ -0,0 +1,266 @@
+import threading
+import obd
+import serial
+from .batching import build_batch_command, MAX_BATCH, CAN_PROTOCOLS
+from .supported import SupportedPids, parse_vin
+
+class SerialOpener:
+    """
+    Stands in for the serial module inside python-obd while it connects, to open its port with a shorter read timeout.
+
+    Args:
+        timeout (float): Seconds to wait for the adapter on each read, instead of python-obd's 10.
+
+    Description:
+        - Everything besides `serial_for_url` comes from the real serial module.
+        - Keeps the ports it opened, so `close_all` can give up on a connection that is taking too long.
+    """
+
+    def __init__(self, timeout):
+        self.timeout = timeout
+        self.ports = []
+        self.closed = False
+
+    def __getattr__(self, name):
+        return getattr(serial, name)
+
+    def serial_for_url(self, *args, **kwargs):
+        kwargs["timeout"] = self.timeout
+        port = serial.serial_for_url(*args, **kwargs)
+        self.ports.append(port)
+        return port
+
+    def close_all(self):
+        """
+        Closes the ports python-obd opened, its reads and writes on them fail straight away after that.
+        """
+
+        self.closed = True
+        for port in self.ports:
+            try:
+                port.close()
+            except Exception:
+                pass
+
+class ObdBackend:
+    """
+    Reads values from the car through python-obd.
+
+    Args:
+        port (str): The serial port of the OBD-II adapter.
+        baudrate (int, optional): The baud rate that worked last time.
+        protocol (str, optional): The ELM327 protocol number that worked last time.
+
+    Description:
+        - Connects with python-obd, trying the saved baud rate and protocol first since detecting them takes seconds.
+        - Connecting is bounded: python-obd reads with `CONNECT_TIMEOUT` instead of 10 seconds, and gives up if it is
+          still connecting after `CONNECT_DEADLINE`, so the reconnect backoff can try again.
+        - Falls back to python-obd detecting the baud rate and protocol if the saved ones don't reach the car.
+        - On CAN protocols several PIDs are read in one request, going back to single requests if the ECU keeps rejecting them.
+        - Once connected the serial read timeout is shortened, python-obd's 10 seconds (retried up to 10 times) would
+          freeze the queries for minutes when the link drops.
+        - For the same reason, when the baud rate is known the adapter is checked quickly before python-obd is started,
+          raising ConnectionError if it doesn't answer. The caller forgets the saved settings if that keeps happening,
+          e.g. after a different adapter was plugged in.
+    """
+
+    READ_TIMEOUT = .5  # Seconds to wait for the adapter on each read once connected
+    CONNECT_TIMEOUT = 3  # Seconds to wait for the adapter on each read while connecting, long enough for a protocol search
+    CONNECT_DEADLINE = 12  # Most seconds python-obd may take to connect before it is given up on
+
+    def __init__(self, port, baudrate=None, protocol=None):
+        if baudrate and not self.adapter_answers(port, baudrate):
+            raise ConnectionError(f"The adapter on {port} is not answering at {baudrate} baud")
+
+        self.connection = None
+        self.gave_up = False
+        if protocol:
+            self.connection = self.open(port, baudrate=baudrate, protocol=protocol)
+
+            # A wrong protocol can still connect, so make sure the car answers. If connecting was given up on, the adapter
+            # stopped answering and detecting the settings would be given up on too, so leave it to the next attempt
+            if not self.gave_up and (not self.connection.is_connected() or self.connection.query(obd.commands.PIDS_A).is_null()):
+                print("Saved adapter settings did not work, detecting them again.")
+                self.connection.close()
+                self.connection = None
+
+        if self.connection is None:
+            self.connection = self.open(port)
+
+        port = self.serial_port()
+        if port is not None:
+            port.timeout = self.READ_TIMEOUT
+        self.batching = self.connection.is_connected() and self.connection.protocol_id() in CAN_PROTOCOLS
+        self.batch_failures = 0
+        self.batch_commands = {}
+
+    def open(self, port, **settings):
+        """
+        Connects with python-obd, giving up if it takes longer than `CONNECT_DEADLINE`.
+
+        Args:
+            port (str): The serial port of the OBD-II adapter.
+            **settings: The baud rate and protocol to pass to python-obd, if they are known.
+
+        Returns:
+            obd.OBD: The python-obd connection, which is not connected if it was given up on (`gave_up` is then True).
+
+        Description:
+            - python-obd waits up to 10 seconds on each command the adapter doesn't answer and moves on to the next one,
+              which adds up to minutes if the adapter goes silent while it connects.
+            - Its serial module is swapped for a `SerialOpener` while it connects, and the port is closed once the
+              deadline passes so the rest of its commands fail straight away.
+        """
+
+        opener = SerialOpener(self.CONNECT_TIMEOUT)
+        deadline = threading.Timer(self.CONNECT_DEADLINE, opener.close_all)
+        obd.elm327.serial = opener
+        deadline.start()
+        try:
+            connection = obd.OBD(portstr=port, **settings)
+        finally:
+            deadline.cancel()
+            obd.elm327.serial = serial
+
+        # python-obd may have connected just before the port was closed, so make sure it counts as not connected
+        if opener.closed:
+            print(f"Connecting took longer than {self.CONNECT_DEADLINE} seconds, giving up.")
+            connection.close()
+            self.gave_up = True
+        return connection
+
+    def adapter_answers(self, port, baudrate):
+        """
+        Checks that the adapter answers at all, without waiting as long as python-obd would.
+
+        Args:
+            port (str): The serial port of the OBD-II adapter.
+            baudrate (int): The adapter's baud rate.
+
+        Returns:
+            bool: True if the adapter sent back a prompt.
+        """
+
+        try:
+            with serial.serial_for_url(port, baudrate=baudrate, timeout=self.READ_TIMEOUT * 2) as adapter:
+                adapter.reset_input_buffer()
+                adapter.write(b"ATI\r")
+                return b">" in adapter.read_until(b">")
+        except (serial.SerialException, OSError):
+            return False
+
+    def is_connected(self):
+        return self.connection.is_connected()
+
+    def protocol_id(self):
+        return self.connection.protocol_id()
+
+    def serial_port(self):
+        """
+        Returns:
+            serial.Serial: python-obd's serial port, or None if it is not open.
+        """
+
+        # python-obd doesn't share its serial port, so look it up by its private name
+        return getattr(self.connection.interface, "_ELM327__port", None)
+
+    def baudrate(self):
+        """
+        Returns:
+            int: The baud rate python-obd settled on, or None if it is not known.
+        """
+
+        return getattr(self.serial_port(), "baudrate", None)
+
+    def batch_limit(self):
+        """
+        Returns:
+            int: The most channels that can be read in one request.
+        """
+
+        return MAX_BATCH if self.batching else 1
+
+    def supported_pids(self):
+        """
+        Queries the car for the PIDs it supports.
+
+        Returns:
+            SupportedPids: The supported PIDs.
+
+        Description:
+            - Queries the supported PIDs for different ranges (commands A, B, and C).
+            - The 4 data bytes of each response are added to the bitmap as they are.
+        """
+
+        supported = SupportedPids()
+
+        for base, command in ((0x00, obd.commands.PIDS_A), (0x20, obd.commands.PIDS_B), (0x40, obd.commands.PIDS_C)):
+            response = self.connection.query(command)
+            if not response.is_null() and len(response.messages[0].data) >= 6:
+                supported.add_range(base, int.from_bytes(response.messages[0].data[2:6], "big"))
+
+        return supported
+
+    def vin(self):
+        """
+        Queries the car for its VIN.
+
+        Returns:
+            str: The VIN, or None if the car did not give one.
+        """
+
+        # Mode 09 support is not checked while connecting, so force the request
+        response = self.connection.query(obd.commands.VIN, force=True)
+        if response.is_null():
+            return None
+        return parse_vin(response.value)
+
+    def read(self, channels):
+        """
+        Reads one or more values from the car.
+
+        Args:
+            channels (list): The channels to read.
+
+        Returns:
+            dict: The value of each channel that was read successfully, in the dash's units.
+        """
+
+        if len(channels) > 1:
+            key = tuple(channel.name for channel in channels)
+            if key not in self.batch_commands:
+                self.batch_commands[key] = build_batch_command(channels)
+
+            response = self.connection.query(self.batch_commands[key], force=True)
+            if not response.is_null() and response.value:
+                self.batch_failures = 0
+                return response.value
+
+            # Go back to single requests if the ECU keeps rejecting multi-PID requests
+            self.batch_failures += 1
+            if self.batch_failures >= 3:
+                print("Multi-PID requests are not supported, reading PIDs one at a time.")
+                self.batching = False
+
+        values = {}
+        for channel in channels:
+            response = self.connection.query(obd.commands[channel.command])
+            if not response.messages:
+                break  # The car stopped answering, the other requests would only wait as well
+            if not response.is_null():
+                values[channel.name] = channel.convert(response.value)
+        return values
+
+    def clear_codes(self):
+        """
+        Clears the trouble codes.
+
+        Returns:
+            bool: True if the car accepted the request.
+        """
+
+        # CLEAR_DTC has no value to decode, so any answer from the car counts
+        return bool(self.connection.query(obd.commands.CLEAR_DTC).messages)
+
+    def close(self):
+        self.connection.close()
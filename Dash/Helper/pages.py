@@ -1,5 +1,7 @@
+import time
 from .builder import *
-from .brain import draw_text, draw_rounded_rect, draw_shift_light, display_graph
+from .brain import draw_text, draw_number, draw_rounded_rect, draw_shift_light, display_graph, load_image, text_cache_stats
+from .layout import BUTTONS
 from math import floor
 
 def page_guide(screen, screen_2, FONT_COLOR, BACKGROUND_2_COLOR, pages, current_page):
@@ -69,30 +71,32 @@ def rpm_page(screen, FONT_COLOR, DEV, supported, rpm, rpm_max, shift, connect):
         connect: Boolean indicating connection status.
     """
     
+    buttons = BUTTONS["RPM"]
+
     draw_text(screen, "RPM Settings", font_small_clean, FONT_COLOR, SCREEN_WIDTH//2, SCREEN_HEIGHT*.05)
 
     if DEV or '0x0C' in supported:
         # Draw RPM section
         draw_text(screen, "RPM", font_medium_clean, FONT_COLOR, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 4 + 20)
-        draw_text(screen, str(rpm), font_large, FONT_COLOR, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 +20)
+        draw_number(screen, str(rpm), font_large, FONT_COLOR, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 +20)
         draw_text(screen, "Max", font_small_clean, FONT_COLOR, SCREEN_WIDTH*.28, SCREEN_HEIGHT // 2)
         draw_text(screen, str(rpm_max), font_medium, FONT_COLOR, SCREEN_WIDTH*.28, SCREEN_HEIGHT // 2 +40)
         draw_text(screen, "Shift", font_small_clean, FONT_COLOR, SCREEN_WIDTH*.72, SCREEN_HEIGHT // 2)
         draw_text(screen, str(shift), font_medium, FONT_COLOR, SCREEN_WIDTH*.72, SCREEN_HEIGHT // 2 +40)
 
         # Draw buttons for increasing and decreasing RPM
-        pygame.draw.rect(screen, GREEN, (SCREEN_WIDTH * 0.2+25, SCREEN_HEIGHT*.3, SCREEN_WIDTH * 0.1, SCREEN_HEIGHT*.1))
-        pygame.draw.rect(screen, RED, (SCREEN_WIDTH * 0.2+25, SCREEN_HEIGHT-SCREEN_HEIGHT*.3, SCREEN_WIDTH * 0.1, SCREEN_HEIGHT*.1))
+        pygame.draw.rect(screen, GREEN, buttons["max_up"])
+        pygame.draw.rect(screen, RED, buttons["max_down"])
 
-        draw_text(screen, "+", font_medium, BLACK, SCREEN_WIDTH * 0.2+25+SCREEN_WIDTH*.05, SCREEN_HEIGHT*.3+SCREEN_HEIGHT*.05)
-        draw_text(screen, "-", font_medium, BLACK, SCREEN_WIDTH * 0.2+25+SCREEN_WIDTH*.05, SCREEN_HEIGHT-SCREEN_HEIGHT*.3+SCREEN_HEIGHT*.05)
+        draw_text(screen, "+", font_medium, BLACK, *buttons["max_up"].center)
+        draw_text(screen, "-", font_medium, BLACK, *buttons["max_down"].center)
 
         # Draw another set of buttons for increasing and decreasing shift
-        pygame.draw.rect(screen, GREEN, (SCREEN_WIDTH * 0.7-25, SCREEN_HEIGHT*.3, SCREEN_WIDTH * 0.1, SCREEN_HEIGHT*.1))
-        pygame.draw.rect(screen, RED, (SCREEN_WIDTH * 0.7-25, SCREEN_HEIGHT-SCREEN_HEIGHT*.3, SCREEN_WIDTH * 0.1, SCREEN_HEIGHT*.1))
+        pygame.draw.rect(screen, GREEN, buttons["shift_up"])
+        pygame.draw.rect(screen, RED, buttons["shift_down"])
 
-        draw_text(screen, "+", font_medium, BLACK, SCREEN_WIDTH * 0.7-25+SCREEN_WIDTH*.05, SCREEN_HEIGHT*.3+SCREEN_HEIGHT*.05)
-        draw_text(screen, "-", font_medium, BLACK, SCREEN_WIDTH * 0.7-25+SCREEN_WIDTH*.05, SCREEN_HEIGHT-SCREEN_HEIGHT*.3+SCREEN_HEIGHT*.05)
+        draw_text(screen, "+", font_medium, BLACK, *buttons["shift_up"].center)
+        draw_text(screen, "-", font_medium, BLACK, *buttons["shift_down"].center)
     
     else:
         # Display connection status if RPM is not supported
@@ -101,6 +105,61 @@ def rpm_page(screen, FONT_COLOR, DEV, supported, rpm, rpm_max, shift, connect):
         else:
             draw_text(screen, "RPM is not supported by car", font_medium_clean, FONT_COLOR, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 +20)
 
+# The main page's frame for the last theme it was drawn in
+main_chrome = {"theme": None, "surface": None}
+
+def main_page_chrome(FONT_COLOR, BACKGROUND_1_COLOR, BACKGROUND_2_COLOR):
+    """
+    Get the main page's frame (the overlays, corners and separators around the bars and values) as one surface.
+
+    Parameters:
+        FONT_COLOR: Color for the text.
+        BACKGROUND_1_COLOR: Background color for the main section.
+        BACKGROUND_2_COLOR: Background color for overlays.
+
+    Returns:
+        The frame, with everything that is not part of it transparent.
+
+    Description:
+        - The frame never changes with the readings, so it is only drawn again when the theme's colors change on the Custom page.
+    """
+
+    theme = (FONT_COLOR, BACKGROUND_1_COLOR, BACKGROUND_2_COLOR)
+    if main_chrome["theme"] == theme:
+        return main_chrome["surface"]
+
+    # Make a color that is never drawn in the frame transparent
+    transparent = (BACKGROUND_2_COLOR[0] ^ 1, BACKGROUND_2_COLOR[1], BACKGROUND_2_COLOR[2])
+    chrome = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    chrome.fill(transparent)
+    chrome.set_colorkey(transparent, pygame.RLEACCEL)
+
+    # Draw rounded rectangles for overlay effects
+    pygame.draw.rect(chrome, BACKGROUND_2_COLOR, pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT),  20, 120)
+    pygame.draw.rect(chrome, BACKGROUND_2_COLOR, pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT*.03))
+    pygame.draw.rect(chrome, BACKGROUND_2_COLOR, pygame.Rect(0, SCREEN_HEIGHT-SCREEN_HEIGHT*.03, SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.draw.rect(chrome, BACKGROUND_2_COLOR, pygame.Rect(SCREEN_WIDTH-SCREEN_WIDTH*.02, 0, SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.draw.rect(chrome, BACKGROUND_2_COLOR, pygame.Rect(0, 0, SCREEN_WIDTH*.02, SCREEN_HEIGHT))
+
+    # Draw circular overlays in corners
+    pygame.draw.circle(chrome, BACKGROUND_2_COLOR, (0, 0), SCREEN_WIDTH*.085)
+    # pygame.draw.circle(chrome, BACKGROUND_2_COLOR, (0, SCREEN_HEIGHT), SCREEN_WIDTH*.085)
+    pygame.draw.circle(chrome, BACKGROUND_2_COLOR, (SCREEN_WIDTH, 0), SCREEN_WIDTH*.085)
+    pygame.draw.circle(chrome, BACKGROUND_2_COLOR, (SCREEN_WIDTH, SCREEN_HEIGHT), SCREEN_WIDTH*.085)
+
+    # Draw the main content area with rounded corners
+    draw_rounded_rect(chrome, BACKGROUND_2_COLOR, (SCREEN_WIDTH//2-((SCREEN_WIDTH*.89)//2), SCREEN_HEIGHT//2-((SCREEN_HEIGHT*.83)//2), SCREEN_WIDTH*.89, SCREEN_HEIGHT*.83), 90)
+
+    # Draw additional rectangles for aesthetic separation
+    pygame.draw.rect(chrome, BACKGROUND_2_COLOR, pygame.Rect(SCREEN_WIDTH//2-((SCREEN_WIDTH*.89)//2), SCREEN_HEIGHT//2-((SCREEN_HEIGHT*.83)//2), SCREEN_WIDTH*.89, SCREEN_HEIGHT*.83),  20, 90)
+    pygame.draw.rect(chrome, BACKGROUND_2_COLOR, (0, SCREEN_HEIGHT*.25, SCREEN_WIDTH * .22, SCREEN_HEIGHT))
+    pygame.draw.rect(chrome, BACKGROUND_2_COLOR, (SCREEN_WIDTH-SCREEN_WIDTH*.22, SCREEN_HEIGHT*.25, SCREEN_WIDTH, SCREEN_HEIGHT*.5))
+    pygame.draw.rect(chrome, BACKGROUND_2_COLOR, (SCREEN_WIDTH*.12, SCREEN_HEIGHT*.15, SCREEN_WIDTH*.75, SCREEN_HEIGHT*.7))
+
+    main_chrome["theme"] = theme
+    main_chrome["surface"] = chrome
+    return chrome
+
 def main_page(screen, FONT_COLOR, BACKGROUND_1_COLOR, BACKGROUND_2_COLOR, fuel_level, rpm, rpm_max, shift, optimize, shift_light, mpg, speed, air_temp, voltage, shift_color_1, shift_color_2, shift_color_3, shift_color_4, shift_padding):
     """
     Draw the main dashboard page displaying various vehicle metrics.
@@ -122,9 +181,13 @@ def main_page(screen, FONT_COLOR, BACKGROUND_1_COLOR, BACKGROUND_2_COLOR, fuel_l
         voltage: Current voltage level.
         shift_color_1, shift_color_2, shift_color_3, shift_color_4: Colors for shift indicators.
         shift_padding: Padding for shift lights coming on.
+
+    Returns:
+        dict: The regions that change with the readings, each name maps to (rect, value), for `changed_regions`.
     """
 
     screen.fill(BACKGROUND_1_COLOR)
+    regions = {}
 
     # Calculate the width of the filled portion based on percentage
     fuel_width = floor((SCREEN_WIDTH*.7663) * fuel_level/100)
@@ -140,6 +203,7 @@ def main_page(screen, FONT_COLOR, BACKGROUND_1_COLOR, BACKGROUND_2_COLOR, fuel_l
         fuel_color = RED
     
     pygame.draw.rect(screen, fuel_color, (SCREEN_WIDTH*.22, SCREEN_HEIGHT*.75, fuel_width, SCREEN_HEIGHT*.22))
+    regions["fuel_bar"] = (pygame.Rect(SCREEN_WIDTH*.22, SCREEN_HEIGHT*.75, SCREEN_WIDTH*.7663, SCREEN_HEIGHT*.22), (fuel_width, fuel_color))
 
     # Calculate the percentage of RPM relative to rpm_max
     rpm_percentage = min(1.0, rpm / rpm_max)  # Ensure it's between 0 and 1
@@ -157,50 +221,39 @@ def main_page(screen, FONT_COLOR, BACKGROUND_1_COLOR, BACKGROUND_2_COLOR, fuel_l
     # Draw the RPM bar and shift line
     pygame.draw.rect(screen, rpm_color, (SCREEN_WIDTH * 0.01, 0, rpm_width, SCREEN_HEIGHT*.25))
     pygame.draw.line(screen, shiftLineColor, (SCREEN_WIDTH-shift_line_x, 0), (SCREEN_WIDTH-shift_line_x, SCREEN_HEIGHT*.25), 5)
+    regions["rpm_bar"] = (pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT*.25), (rpm_width, rpm_color, shift_line_x, shiftLineColor))
 
-    # Draw rounded rectangles for overlay effects
-    pygame.draw.rect(screen, BACKGROUND_2_COLOR, pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT),  20, 120)
-    pygame.draw.rect(screen, BACKGROUND_2_COLOR, pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT*.03))
-    pygame.draw.rect(screen, BACKGROUND_2_COLOR, pygame.Rect(0, SCREEN_HEIGHT-SCREEN_HEIGHT*.03, SCREEN_WIDTH, SCREEN_HEIGHT))
-    pygame.draw.rect(screen, BACKGROUND_2_COLOR, pygame.Rect(SCREEN_WIDTH-SCREEN_WIDTH*.02, 0, SCREEN_WIDTH, SCREEN_HEIGHT))
-    pygame.draw.rect(screen, BACKGROUND_2_COLOR, pygame.Rect(0, 0, SCREEN_WIDTH*.02, SCREEN_HEIGHT))
-
-    # Draw circular overlays in corners
-    pygame.draw.circle(screen, BACKGROUND_2_COLOR, (0, 0), SCREEN_WIDTH*.085)
-    # pygame.draw.circle(screen, BACKGROUND_2_COLOR, (0, SCREEN_HEIGHT), SCREEN_WIDTH*.085)
-    pygame.draw.circle(screen, BACKGROUND_2_COLOR, (SCREEN_WIDTH, 0), SCREEN_WIDTH*.085)
-    pygame.draw.circle(screen, BACKGROUND_2_COLOR, (SCREEN_WIDTH, SCREEN_HEIGHT), SCREEN_WIDTH*.085)
+    # Draw the frame over the bars
+    screen.blit(main_page_chrome(FONT_COLOR, BACKGROUND_1_COLOR, BACKGROUND_2_COLOR), (0, 0))
 
-    # Draw the main content area with rounded corners
-    draw_rounded_rect(screen, BACKGROUND_2_COLOR, (SCREEN_WIDTH//2-((SCREEN_WIDTH*.89)//2), SCREEN_HEIGHT//2-((SCREEN_HEIGHT*.83)//2), SCREEN_WIDTH*.89, SCREEN_HEIGHT*.83), 90)
-
-    # Draw additional rectangles for aesthetic separation
-    pygame.draw.rect(screen, BACKGROUND_2_COLOR, pygame.Rect(SCREEN_WIDTH//2-((SCREEN_WIDTH*.89)//2), SCREEN_HEIGHT//2-((SCREEN_HEIGHT*.83)//2), SCREEN_WIDTH*.89, SCREEN_HEIGHT*.83),  20, 90)
-    pygame.draw.rect(screen, BACKGROUND_2_COLOR, (0, SCREEN_HEIGHT*.25, SCREEN_WIDTH * .22, SCREEN_HEIGHT))
-    pygame.draw.rect(screen, BACKGROUND_2_COLOR, (SCREEN_WIDTH-SCREEN_WIDTH*.22, SCREEN_HEIGHT*.25, SCREEN_WIDTH, SCREEN_HEIGHT*.5))
-    pygame.draw.rect(screen, BACKGROUND_2_COLOR, (SCREEN_WIDTH*.12, SCREEN_HEIGHT*.15, SCREEN_WIDTH*.75, SCREEN_HEIGHT*.7))
-    
     # Draw fuel level percentage text
-    draw_text(screen, f"{round(fuel_level,1)}%", font_medium, FONT_COLOR, SCREEN_WIDTH*.1, SCREEN_HEIGHT*.93)
+    fuel_text = f"{round(fuel_level,1)}%"
+    regions["fuel"] = (draw_number(screen, fuel_text, font_medium, FONT_COLOR, SCREEN_WIDTH*.1, SCREEN_HEIGHT*.93), fuel_text)
 
     # Draw RPM display
-    draw_text(screen, f"{rpm}", font_xlarge, FONT_COLOR, SCREEN_WIDTH // 2, SCREEN_HEIGHT//2)
+    regions["rpm"] = (draw_number(screen, f"{rpm}", font_xlarge, FONT_COLOR, SCREEN_WIDTH // 2, SCREEN_HEIGHT//2), rpm)
     draw_text(screen, "RPM", font_small_clean, FONT_COLOR, SCREEN_WIDTH // 2, SCREEN_HEIGHT*.7)
 
     # Draw additional metrics if not in optimization mode
     if not optimize:
-        draw_text(screen,f"{(round(mpg, 2))}", font_medlar, FONT_COLOR, SCREEN_WIDTH *.13, SCREEN_HEIGHT // 2)
+        mpg_text = f"{(round(mpg, 2))}"
+        regions["mpg"] = (draw_number(screen, mpg_text, font_medlar, FONT_COLOR, SCREEN_WIDTH *.13, SCREEN_HEIGHT // 2), mpg_text)
         draw_text(screen, "MPG", font_small_clean, FONT_COLOR, SCREEN_WIDTH *.13, SCREEN_HEIGHT // 2+50)
 
-        draw_text(screen, f"{int(round(speed,0))}", font_medlar, FONT_COLOR, SCREEN_WIDTH *.87, SCREEN_HEIGHT // 2)
+        speed_text = f"{int(round(speed,0))}"
+        regions["speed"] = (draw_number(screen, speed_text, font_medlar, FONT_COLOR, SCREEN_WIDTH *.87, SCREEN_HEIGHT // 2), speed_text)
         draw_text(screen, "MPH", font_small_clean, FONT_COLOR, SCREEN_WIDTH *.87, SCREEN_HEIGHT // 2+50)
 
-        draw_text(screen, f"{round((air_temp*(9/5))+32,1)}F", font_medium, FONT_COLOR, SCREEN_WIDTH*.7, SCREEN_HEIGHT - SCREEN_HEIGHT*.15)
-        draw_text(screen, f"{round(voltage,1)} v", font_medium, FONT_COLOR, SCREEN_WIDTH*.3, SCREEN_HEIGHT - SCREEN_HEIGHT*.15)
+        air_temp_text = f"{round((air_temp*(9/5))+32,1)}F"
+        voltage_text = f"{round(voltage,1)} v"
+        regions["air_temp"] = (draw_number(screen, air_temp_text, font_medium, FONT_COLOR, SCREEN_WIDTH*.7, SCREEN_HEIGHT - SCREEN_HEIGHT*.15), air_temp_text)
+        regions["voltage"] = (draw_number(screen, voltage_text, font_medium, FONT_COLOR, SCREEN_WIDTH*.3, SCREEN_HEIGHT - SCREEN_HEIGHT*.15), voltage_text)
 
     # Draw shift lights if enabled
     if shift_light:
-        draw_shift_light(screen, FONT_COLOR, BACKGROUND_2_COLOR, shift_color_1, shift_color_2, shift_color_3, shift_color_4, shift_padding, rpm, shift)
+        regions["shift_light"] = draw_shift_light(screen, FONT_COLOR, BACKGROUND_2_COLOR, shift_color_1, shift_color_2, shift_color_3, shift_color_4, shift_padding, rpm, shift)
+
+    return regions
 
 def settings_page(screen, FONT_COLOR, BACKGROUND_2_COLOR, brightness, optimize, delay, reset_performance):
     """
@@ -215,34 +268,36 @@ def settings_page(screen, FONT_COLOR, BACKGROUND_2_COLOR, brightness, optimize,
         reset_performance: Boolean to act as a flag if performance stats are reset.
     """
     
+    buttons = BUTTONS["Settings"]
+
     draw_text(screen, "General Settings", font_small_clean, FONT_COLOR, SCREEN_WIDTH//2, SCREEN_HEIGHT*.05)
 
     # Button to flip settings
-    pygame.draw.rect(screen, PURPLE, (SCREEN_WIDTH // 2 - SCREEN_WIDTH*.05, SCREEN_HEIGHT-SCREEN_HEIGHT*.2, SCREEN_WIDTH*.1, SCREEN_HEIGHT*.1))
-    draw_text(screen, "FLIP", font_small_clean, BLACK, SCREEN_WIDTH // 2, SCREEN_HEIGHT-SCREEN_HEIGHT*.15)
+    pygame.draw.rect(screen, PURPLE, buttons["flip"])
+    draw_text(screen, "FLIP", font_small_clean, BLACK, *buttons["flip"].center)
 
     # Brightness adjustment buttons
-    pygame.draw.rect(screen, RED, (SCREEN_WIDTH * 0.50, SCREEN_HEIGHT*.20, SCREEN_WIDTH * 0.1, SCREEN_HEIGHT*.1))
-    pygame.draw.rect(screen, GREEN, (SCREEN_WIDTH * 0.70, SCREEN_HEIGHT*.20, SCREEN_WIDTH * 0.1, SCREEN_HEIGHT*.1))
+    pygame.draw.rect(screen, RED, buttons["brightness_down"])
+    pygame.draw.rect(screen, GREEN, buttons["brightness_up"])
 
-    draw_text(screen, "-", font_medium, BLACK, SCREEN_WIDTH * 0.55, SCREEN_HEIGHT*.25)
-    draw_text(screen, "+", font_medium, BLACK, SCREEN_WIDTH * 0.75, SCREEN_HEIGHT*.25)
+    draw_text(screen, "-", font_medium, BLACK, *buttons["brightness_down"].center)
+    draw_text(screen, "+", font_medium, BLACK, *buttons["brightness_up"].center)
     draw_text(screen, f"{int(round((brightness/255)*100,0))}%", font_small, FONT_COLOR, (SCREEN_WIDTH//2)+SCREEN_WIDTH*.15, SCREEN_HEIGHT*.25)
     draw_text(screen, "Brightness", font_small_clean, FONT_COLOR, (SCREEN_WIDTH//2)-SCREEN_WIDTH*.15, SCREEN_HEIGHT*.25)
 
     # Optimization toggle
-    pygame.draw.rect(screen, GREEN if optimize else RED, (SCREEN_WIDTH // 2 + SCREEN_WIDTH*.1, SCREEN_HEIGHT*.32, SCREEN_WIDTH*.1, SCREEN_HEIGHT*.1))
-    draw_text(screen, "On" if optimize else "Off", font_small_clean, BLACK, (SCREEN_WIDTH//2)+SCREEN_WIDTH*.15, SCREEN_HEIGHT*.37)
+    pygame.draw.rect(screen, GREEN if optimize else RED, buttons["optimize"])
+    draw_text(screen, "On" if optimize else "Off", font_small_clean, BLACK, *buttons["optimize"].center)
     draw_text(screen, "Optimize readings", font_small_clean, FONT_COLOR, (SCREEN_WIDTH//2)-SCREEN_WIDTH*.15, SCREEN_HEIGHT*.37)
 
     # Delay toggle
-    pygame.draw.rect(screen, GREEN if delay else RED, (SCREEN_WIDTH // 2 + SCREEN_WIDTH*.1, SCREEN_HEIGHT*.44, SCREEN_WIDTH*.1, SCREEN_HEIGHT*.1))
-    draw_text(screen, "On" if delay else "Off", font_small_clean, BLACK, (SCREEN_WIDTH//2)+SCREEN_WIDTH*.15, SCREEN_HEIGHT*.49)
+    pygame.draw.rect(screen, GREEN if delay else RED, buttons["delay"])
+    draw_text(screen, "On" if delay else "Off", font_small_clean, BLACK, *buttons["delay"].center)
     draw_text(screen, "Delay readings", font_small_clean, FONT_COLOR, (SCREEN_WIDTH//2)-SCREEN_WIDTH*.15, SCREEN_HEIGHT*.49)
 
     # Reset Performance Page Stats
-    pygame.draw.rect(screen, BACKGROUND_2_COLOR if reset_performance else GREEN, (SCREEN_WIDTH // 2 + SCREEN_WIDTH*.1, SCREEN_HEIGHT*.56, SCREEN_WIDTH*.1, SCREEN_HEIGHT*.1))
-    draw_text(screen, "" if reset_performance else "Reset", font_small_clean, BLACK, (SCREEN_WIDTH//2)+SCREEN_WIDTH*.15, SCREEN_HEIGHT*.61)
+    pygame.draw.rect(screen, BACKGROUND_2_COLOR if reset_performance else GREEN, buttons["reset_performance"])
+    draw_text(screen, "" if reset_performance else "Reset", font_small_clean, BLACK, *buttons["reset_performance"].center)
     draw_text(screen, "" if reset_performance else "Reset Performance Stats", font_small_clean, FONT_COLOR, (SCREEN_WIDTH//2)-SCREEN_WIDTH*.15, SCREEN_HEIGHT*.61)
 
 def trouble_page(screen, FONT_COLOR, codes, cleared):
@@ -266,8 +321,8 @@ def trouble_page(screen, FONT_COLOR, codes, cleared):
                 error_text = "Turn off the engine before clearing codes!"
             draw_text(screen, error_text, font_small_clean, WHITE, SCREEN_WIDTH//2, SCREEN_HEIGHT-SCREEN_HEIGHT*.15)
         else:
-            pygame.draw.rect(screen, RED, (SCREEN_WIDTH//2 - SCREEN_WIDTH*.06, SCREEN_HEIGHT-SCREEN_HEIGHT*.2, SCREEN_WIDTH*.12, SCREEN_HEIGHT*.1))
-            draw_text(screen, "Clear", font_small_clean, BLACK, SCREEN_WIDTH//2, SCREEN_HEIGHT-SCREEN_HEIGHT*.15)
+            pygame.draw.rect(screen, RED, BUTTONS["Trouble"]["clear"])
+            draw_text(screen, "Clear", font_small_clean, BLACK, *BUTTONS["Trouble"]["clear"].center)
 
         code_offset = 0
         max_width = SCREEN_WIDTH * 0.8
@@ -317,21 +372,23 @@ def info_page(screen, FONT_COLOR, SYSTEM_VERSION, wifi, development_mode):
         development_mode: Boolean indicating if development mode is enabled.
     """
 
+    buttons = BUTTONS["Info"]
+
     draw_text(screen, "System Information", font_small_clean, FONT_COLOR, SCREEN_WIDTH//2, SCREEN_HEIGHT*.05)
     draw_text(screen, f"Version: {SYSTEM_VERSION}", font_small_clean, FONT_COLOR, SCREEN_WIDTH//2, SCREEN_HEIGHT*.15)
 
     # Exit button
-    pygame.draw.rect(screen, RED, (SCREEN_WIDTH//2 - SCREEN_WIDTH*.05, SCREEN_HEIGHT-SCREEN_HEIGHT*.2, SCREEN_WIDTH*.1, SCREEN_HEIGHT*.1))
-    draw_text(screen, "Exit", font_small_clean, BLACK, SCREEN_WIDTH//2, SCREEN_HEIGHT-SCREEN_HEIGHT*.15)
+    pygame.draw.rect(screen, RED, buttons["exit"])
+    draw_text(screen, "Exit", font_small_clean, BLACK, *buttons["exit"].center)
 
     # Wi-Fi status
-    pygame.draw.rect(screen, GREEN if wifi else RED, (SCREEN_WIDTH // 2 + SCREEN_WIDTH*.05, SCREEN_HEIGHT*.2, SCREEN_WIDTH*.2, SCREEN_HEIGHT*.1))
-    draw_text(screen, "Update" if wifi else "No Wifi", font_small_clean, BLACK, (SCREEN_WIDTH//2)+SCREEN_WIDTH*.15, SCREEN_HEIGHT*.25)
+    pygame.draw.rect(screen, GREEN if wifi else RED, buttons["update"])
+    draw_text(screen, "Update" if wifi else "No Wifi", font_small_clean, BLACK, *buttons["update"].center)
     draw_text(screen, "Update System", font_small_clean, FONT_COLOR, (SCREEN_WIDTH//2)-SCREEN_WIDTH*.15, SCREEN_HEIGHT*.25)
 
     # Development mode toggle
-    pygame.draw.rect(screen, GREEN if development_mode else RED, (SCREEN_WIDTH // 2 + SCREEN_WIDTH*.1, SCREEN_HEIGHT*.32, SCREEN_WIDTH*.1, SCREEN_HEIGHT*.1))
-    draw_text(screen, "On" if development_mode else "Off", font_small_clean, BLACK, (SCREEN_WIDTH//2)+SCREEN_WIDTH*.15, SCREEN_HEIGHT*.37)
+    pygame.draw.rect(screen, GREEN if development_mode else RED, buttons["development_mode"])
+    draw_text(screen, "On" if development_mode else "Off", font_small_clean, BLACK, *buttons["development_mode"].center)
     draw_text(screen, "Development Mode", font_small_clean, FONT_COLOR, (SCREEN_WIDTH//2)-SCREEN_WIDTH*.15, SCREEN_HEIGHT*.37)
 
 def custom_page(screen, FONT_COLOR, font_index, background_1_index, background_2_index, images, image_index):
@@ -348,36 +405,41 @@ def custom_page(screen, FONT_COLOR, font_index, background_1_index, background_2
         image_index: Index for the selected background image.
     """
     
+    buttons = BUTTONS["Custom"]
+
     draw_text(screen, "Customization Settings", font_small_clean, FONT_COLOR, SCREEN_WIDTH//2, SCREEN_HEIGHT*.05)
 
     # Font color selection
     pygame.draw.rect(screen, COLORS[font_index], ((SCREEN_WIDTH//2)+SCREEN_WIDTH*.1, SCREEN_HEIGHT*.2, SCREEN_WIDTH * 0.1, SCREEN_HEIGHT*.1))
-    draw_text(screen, "<", font_medium, FONT_COLOR, SCREEN_WIDTH * 0.55, SCREEN_HEIGHT*.25)
-    draw_text(screen, ">", font_medium, FONT_COLOR, SCREEN_WIDTH * 0.75, SCREEN_HEIGHT*.25)
+    draw_text(screen, "<", font_medium, FONT_COLOR, *buttons["font_left"].center)
+    draw_text(screen, ">", font_medium, FONT_COLOR, *buttons["font_right"].center)
     draw_text(screen, f"{font_index+1}", font_small, BLACK if COLORS[font_index] != BLACK else WHITE, (SCREEN_WIDTH//2)+SCREEN_WIDTH*.15, SCREEN_HEIGHT*.25)
     draw_text(screen, "Font Color", font_small_clean, FONT_COLOR, (SCREEN_WIDTH//2)-SCREEN_WIDTH*.15, SCREEN_HEIGHT*.25)
 
     # Background color 1 selection
     pygame.draw.rect(screen, COLORS[background_1_index], ((SCREEN_WIDTH//2)+SCREEN_WIDTH*.1, SCREEN_HEIGHT*.32, SCREEN_WIDTH * 0.1, SCREEN_HEIGHT*.1))
-    draw_text(screen, "<", font_medium, FONT_COLOR, SCREEN_WIDTH * 0.55, SCREEN_HEIGHT*.37)
-    draw_text(screen, ">", font_medium, FONT_COLOR, SCREEN_WIDTH * 0.75, SCREEN_HEIGHT*.37)
+    draw_text(screen, "<", font_medium, FONT_COLOR, *buttons["background_1_left"].center)
+    draw_text(screen, ">", font_medium, FONT_COLOR, *buttons["background_1_right"].center)
     draw_text(screen, f"{background_1_index+1}", font_small, BLACK if COLORS[background_1_index] != BLACK else WHITE, (SCREEN_WIDTH//2)+SCREEN_WIDTH*.15, SCREEN_HEIGHT*.37)
     draw_text(screen, "Background Color 1", font_small_clean, FONT_COLOR, (SCREEN_WIDTH//2)-SCREEN_WIDTH*.15, SCREEN_HEIGHT*.37)
 
     # Background color 2 selection
     pygame.draw.rect(screen, COLORS[background_2_index], ((SCREEN_WIDTH//2)+SCREEN_WIDTH*.1, SCREEN_HEIGHT*.44, SCREEN_WIDTH * 0.1, SCREEN_HEIGHT*.1))
-    draw_text(screen, "<", font_medium, FONT_COLOR, SCREEN_WIDTH * 0.55, SCREEN_HEIGHT*.49)
-    draw_text(screen, ">", font_medium, FONT_COLOR, SCREEN_WIDTH * 0.75, SCREEN_HEIGHT*.49)
+    draw_text(screen, "<", font_medium, FONT_COLOR, *buttons["background_2_left"].center)
+    draw_text(screen, ">", font_medium, FONT_COLOR, *buttons["background_2_right"].center)
     draw_text(screen, f"{background_2_index+1}", font_small, FONT_COLOR, (SCREEN_WIDTH//2)+SCREEN_WIDTH*.15, SCREEN_HEIGHT*.49)
     draw_text(screen, "Background Color 2", font_small_clean, FONT_COLOR, (SCREEN_WIDTH//2)-SCREEN_WIDTH*.15, SCREEN_HEIGHT*.49)
 
     # Display selected background image
-    new_image = pygame.image.load(images[image_index])
-    new_image = pygame.transform.scale(new_image, (SCREEN_WIDTH*.1, SCREEN_HEIGHT*.1))
-    screen.blit(new_image, (((SCREEN_WIDTH//2)+SCREEN_WIDTH*.1), SCREEN_HEIGHT*.56))
+    new_image = load_image(images[image_index], (SCREEN_WIDTH*.1, SCREEN_HEIGHT*.1))
+    if new_image is not None:
+        screen.blit(new_image, (((SCREEN_WIDTH//2)+SCREEN_WIDTH*.1), SCREEN_HEIGHT*.56))
+    else:
+        # The image is missing, draw a plain box in its place so the number still shows
+        pygame.draw.rect(screen, FONT_COLOR, ((SCREEN_WIDTH//2)+SCREEN_WIDTH*.1, SCREEN_HEIGHT*.56, SCREEN_WIDTH*.1, SCREEN_HEIGHT*.1))
 
-    draw_text(screen, "<", font_medium, FONT_COLOR, SCREEN_WIDTH * 0.55, SCREEN_HEIGHT*.61)
-    draw_text(screen, ">", font_medium, FONT_COLOR, SCREEN_WIDTH * 0.75, SCREEN_HEIGHT*.61)
+    draw_text(screen, "<", font_medium, FONT_COLOR, *buttons["image_left"].center)
+    draw_text(screen, ">", font_medium, FONT_COLOR, *buttons["image_right"].center)
     draw_text(screen, f"{image_index+1}", font_small, BLACK, (SCREEN_WIDTH//2)+SCREEN_WIDTH*.15, SCREEN_HEIGHT*.61)
     draw_text(screen, "Background Image", font_small_clean, FONT_COLOR, (SCREEN_WIDTH//2)-SCREEN_WIDTH*.15, SCREEN_HEIGHT*.61)
 
@@ -397,51 +459,53 @@ def color_1_page(screen, FONT_COLOR, shift, shift_light, shift_color_1, shift_co
         shift_padding: Padding value affecting the shift RPM calculation.
     """
 
+    buttons = BUTTONS["Color1"]
+
     draw_text(screen, "Shift Light Settings", font_small_clean, FONT_COLOR, SCREEN_WIDTH//2, SCREEN_HEIGHT*.05)
 
     # Shift light toggle
-    pygame.draw.rect(screen, GREEN if shift_light else RED, (SCREEN_WIDTH // 2 + SCREEN_WIDTH*.1, SCREEN_HEIGHT*.2, SCREEN_WIDTH*.1, SCREEN_HEIGHT*.1))
-    draw_text(screen, "On" if shift_light else "Off", font_small_clean, BLACK, (SCREEN_WIDTH//2)+SCREEN_WIDTH*.15, SCREEN_HEIGHT*.25)
+    pygame.draw.rect(screen, GREEN if shift_light else RED, buttons["shift_light"])
+    draw_text(screen, "On" if shift_light else "Off", font_small_clean, BLACK, *buttons["shift_light"].center)
     draw_text(screen, "Shift lights", font_small_clean, FONT_COLOR, (SCREEN_WIDTH//2)-SCREEN_WIDTH*.15, SCREEN_HEIGHT*.25)
 
     # Color selection for shift light 1
     pygame.draw.rect(screen, COLORS[shift_color_1], ((SCREEN_WIDTH//2)+SCREEN_WIDTH*.1, SCREEN_HEIGHT*.32, SCREEN_WIDTH * 0.1, SCREEN_HEIGHT*.1))
-    draw_text(screen, "<", font_medium, FONT_COLOR, SCREEN_WIDTH * 0.55, SCREEN_HEIGHT*.37)
-    draw_text(screen, ">", font_medium, FONT_COLOR, SCREEN_WIDTH * 0.75, SCREEN_HEIGHT*.37)
+    draw_text(screen, "<", font_medium, FONT_COLOR, *buttons["color_1_left"].center)
+    draw_text(screen, ">", font_medium, FONT_COLOR, *buttons["color_1_right"].center)
     draw_text(screen, f"{shift_color_1+1}", font_small, BLACK if COLORS[shift_color_1] != BLACK else WHITE, (SCREEN_WIDTH//2)+SCREEN_WIDTH*.15, SCREEN_HEIGHT*.37)
     draw_text(screen, "Shift Light Color 1", font_small_clean, FONT_COLOR, (SCREEN_WIDTH//2)-SCREEN_WIDTH*.15, SCREEN_HEIGHT*.37)
 
     # Color selection for shift light 2
     pygame.draw.rect(screen, COLORS[shift_color_2], ((SCREEN_WIDTH//2)+SCREEN_WIDTH*.1, SCREEN_HEIGHT*.44, SCREEN_WIDTH * 0.1, SCREEN_HEIGHT*.1))
-    draw_text(screen, "<", font_medium, FONT_COLOR, SCREEN_WIDTH * 0.55, SCREEN_HEIGHT*.49)
-    draw_text(screen, ">", font_medium, FONT_COLOR, SCREEN_WIDTH * 0.75, SCREEN_HEIGHT*.49)
+    draw_text(screen, "<", font_medium, FONT_COLOR, *buttons["color_2_left"].center)
+    draw_text(screen, ">", font_medium, FONT_COLOR, *buttons["color_2_right"].center)
     draw_text(screen, f"{shift_color_2+1}", font_small, BLACK if COLORS[shift_color_2] != BLACK else WHITE, (SCREEN_WIDTH//2)+SCREEN_WIDTH*.15, SCREEN_HEIGHT*.49)
     draw_text(screen, "Shift Light Color 2", font_small_clean, FONT_COLOR, (SCREEN_WIDTH//2)-SCREEN_WIDTH*.15, SCREEN_HEIGHT*.49)
 
     # Color selection for shift light 3
     pygame.draw.rect(screen, COLORS[shift_color_3], ((SCREEN_WIDTH//2)+SCREEN_WIDTH*.1, SCREEN_HEIGHT*.56, SCREEN_WIDTH * 0.1, SCREEN_HEIGHT*.1))
-    draw_text(screen, "<", font_medium, FONT_COLOR, SCREEN_WIDTH * 0.55, SCREEN_HEIGHT*.61)
-    draw_text(screen, ">", font_medium, FONT_COLOR, SCREEN_WIDTH * 0.75, SCREEN_HEIGHT*.61)
+    draw_text(screen, "<", font_medium, FONT_COLOR, *buttons["color_3_left"].center)
+    draw_text(screen, ">", font_medium, FONT_COLOR, *buttons["color_3_right"].center)
     draw_text(screen, f"{shift_color_3+1}", font_small, BLACK if COLORS[shift_color_3] != BLACK else WHITE, (SCREEN_WIDTH//2)+SCREEN_WIDTH*.15, SCREEN_HEIGHT*.61)
     draw_text(screen, "Shift Light Color 3", font_small_clean, FONT_COLOR, (SCREEN_WIDTH//2)-SCREEN_WIDTH*.15, SCREEN_HEIGHT*.61)
 
     # Color selection for shift light 4
     pygame.draw.rect(screen, COLORS[shift_color_4], ((SCREEN_WIDTH//2)+SCREEN_WIDTH*.1, SCREEN_HEIGHT*.68, SCREEN_WIDTH * 0.1, SCREEN_HEIGHT*.1))
-    draw_text(screen, "<", font_medium, FONT_COLOR, SCREEN_WIDTH * 0.55, SCREEN_HEIGHT*.73)
-    draw_text(screen, ">", font_medium, FONT_COLOR, SCREEN_WIDTH * 0.75, SCREEN_HEIGHT*.73)
+    draw_text(screen, "<", font_medium, FONT_COLOR, *buttons["color_4_left"].center)
+    draw_text(screen, ">", font_medium, FONT_COLOR, *buttons["color_4_right"].center)
     draw_text(screen, f"{shift_color_4+1}", font_small, BLACK if COLORS[shift_color_4] != BLACK else WHITE, (SCREEN_WIDTH//2)+SCREEN_WIDTH*.15, SCREEN_HEIGHT*.73)
     draw_text(screen, "Shift Light Color 4", font_small_clean, FONT_COLOR, (SCREEN_WIDTH//2)-SCREEN_WIDTH*.15, SCREEN_HEIGHT*.73)
 
     # Adjust shift starting RPM
-    pygame.draw.rect(screen, RED, (SCREEN_WIDTH * 0.50, SCREEN_HEIGHT*.80, SCREEN_WIDTH * 0.1, SCREEN_HEIGHT*.1))
-    pygame.draw.rect(screen, GREEN, (SCREEN_WIDTH * 0.70, SCREEN_HEIGHT*.80, SCREEN_WIDTH * 0.1, SCREEN_HEIGHT*.1))
+    pygame.draw.rect(screen, RED, buttons["start_down"])
+    pygame.draw.rect(screen, GREEN, buttons["start_up"])
 
-    draw_text(screen, "-", font_medium, BLACK, SCREEN_WIDTH * 0.55, SCREEN_HEIGHT*.85)
-    draw_text(screen, "+", font_medium, BLACK, SCREEN_WIDTH * 0.75, SCREEN_HEIGHT*.85)
+    draw_text(screen, "-", font_medium, BLACK, *buttons["start_down"].center)
+    draw_text(screen, "+", font_medium, BLACK, *buttons["start_up"].center)
     draw_text(screen, f"{shift - (14 * shift_padding)}", font_small, FONT_COLOR, (SCREEN_WIDTH//2)+SCREEN_WIDTH*.15, SCREEN_HEIGHT*.85)
     draw_text(screen, "Shift Starting RPM", font_small_clean, FONT_COLOR, (SCREEN_WIDTH//2)-SCREEN_WIDTH*.15, SCREEN_HEIGHT*.85)
 
-def developmental_page(screen, FONT_COLOR, show_fps, query_times):
+def developmental_page(screen, FONT_COLOR, show_fps, query_times, link_stats):
     """
     Displays development settings, allowing the user to toggle FPS display  and see current average times each query is taking.
 
@@ -450,23 +514,31 @@ def developmental_page(screen, FONT_COLOR, show_fps, query_times):
         FONT_COLOR: Color for the text.
         show_fps: Boolean indicating if FPS display is enabled.
         query_times: Dictionary of rolling average query times.
+        link_stats: Dictionary with the number of reconnects and the total time the connection was down.
     """
         
     draw_text(screen, "Development Settings", font_small_clean, FONT_COLOR, SCREEN_WIDTH//2, SCREEN_HEIGHT*.05)
 
     # Toggle FPS display
-    pygame.draw.rect(screen, GREEN if show_fps else RED, (SCREEN_WIDTH // 2 + SCREEN_WIDTH*.1, SCREEN_HEIGHT*.2, SCREEN_WIDTH*.1, SCREEN_HEIGHT*.1))
-    draw_text(screen, "On" if show_fps else "Off", font_small_clean, BLACK, (SCREEN_WIDTH//2)+SCREEN_WIDTH*.15, SCREEN_HEIGHT*.25)
+    pygame.draw.rect(screen, GREEN if show_fps else RED, BUTTONS["Development"]["show_fps"])
+    draw_text(screen, "On" if show_fps else "Off", font_small_clean, BLACK, *BUTTONS["Development"]["show_fps"].center)
     draw_text(screen, "Frames Per Second", font_small_clean, FONT_COLOR, (SCREEN_WIDTH//2)-SCREEN_WIDTH*.15, SCREEN_HEIGHT*.25)
 
+    # Display connection stability
+    downtime = link_stats["downtime"] + (time.time() - link_stats["down_since"] if link_stats["down_since"] else 0)
+    draw_text(screen, f"Reconnects: {link_stats['reconnects']}, down for {downtime:.1f} seconds", font_small_clean, FONT_COLOR, SCREEN_WIDTH//2, SCREEN_HEIGHT*.35)
+
+    # Display how often text is drawn without rendering it again
+    draw_text(screen, f"Text cache: {text_cache_stats['hits']} hits, {text_cache_stats['misses']} misses", font_small_clean, FONT_COLOR, SCREEN_WIDTH//2, SCREEN_HEIGHT*.41)
+
     # Display query times
-    y_offset = SCREEN_HEIGHT * 0.4  # Starting Y position for query times
+    y_offset = SCREEN_HEIGHT * 0.49  # Starting Y position for query times
     for query, data in query_times.items():
         query_text = f"{query}: {data['average']:.4f} seconds"
         draw_text(screen, query_text, font_small_clean, FONT_COLOR, SCREEN_WIDTH//2, y_offset)
         y_offset += SCREEN_HEIGHT * 0.06  # Move down for the next query
 
-def performance_page(screen, FONT_COLOR, BACKGROUND_2_COLOR, shift_color_1, shift_color_2, shift_color_3, shift_color_4, shift_padding, rpm, shift, top_speed, last_top_speed, tracking, elapsed_time, zero_to_sixty_time, zero_to_hundred_time):
+def performance_page(screen, FONT_COLOR, BACKGROUND_2_COLOR, shift_color_1, shift_color_2, shift_color_3, shift_color_4, shift_padding, rpm, shift, top_speed, last_top_speed, tracking, elapsed_time, zero_to_sixty_time, zero_to_sixty_error, zero_to_hundred_time, zero_to_hundred_error):
     """
     Draw the performance page to track different performance related stats.
 
@@ -486,7 +558,9 @@ def performance_page(screen, FONT_COLOR, BACKGROUND_2_COLOR, shift_color_1, shif
         tracking: Flag if currently tracking. 
         elapsed_time: How long its been tracking.
         zero_to_sixty_time: Current 0-60 time.
+        zero_to_sixty_error: Seconds the 0-60 time may be off by.
         zero_to_hundred_time: Current 0-100 time.
+        zero_to_hundred_error: Seconds the 0-100 time may be off by.
     """
     
     # Draw top speeds
@@ -503,28 +577,30 @@ def performance_page(screen, FONT_COLOR, BACKGROUND_2_COLOR, shift_color_1, shif
     # Draw 0-60 time
     if zero_to_sixty_time:
         draw_text(screen, f"0-60 MPH: {zero_to_sixty_time:.2f}", font_medium_clean, FONT_COLOR, (SCREEN_WIDTH//2)-SCREEN_WIDTH*.25, SCREEN_HEIGHT*.5)
+        draw_text(screen, f"± {zero_to_sixty_error:.2f} s", font_xsmall_clean, FONT_COLOR, (SCREEN_WIDTH//2)-SCREEN_WIDTH*.25, SCREEN_HEIGHT*.57)
 
     # Draw 0-100 time
     if zero_to_hundred_time:
         draw_text(screen, f"0-100 MPH: {zero_to_hundred_time:.2f}", font_medium_clean, FONT_COLOR, (SCREEN_WIDTH//2)+SCREEN_WIDTH*.25, SCREEN_HEIGHT*.5)
+        draw_text(screen, f"± {zero_to_hundred_error:.2f} s", font_xsmall_clean, FONT_COLOR, (SCREEN_WIDTH//2)+SCREEN_WIDTH*.25, SCREEN_HEIGHT*.57)
     
     # Draw shift light
     draw_shift_light(screen, FONT_COLOR, BACKGROUND_2_COLOR, shift_color_1, shift_color_2, shift_color_3, shift_color_4, shift_padding, rpm, shift, 0)
 
     # Draw tracking button
-    pygame.draw.rect(screen, RED if tracking else GREEN, (SCREEN_WIDTH//2 - SCREEN_WIDTH*.05, SCREEN_HEIGHT-SCREEN_HEIGHT*.2, SCREEN_WIDTH*.1, SCREEN_HEIGHT*.1))
-    draw_text(screen, "Start" if not tracking else "Stop", font_small_clean, BLACK, SCREEN_WIDTH//2, SCREEN_HEIGHT-SCREEN_HEIGHT*.15)
+    pygame.draw.rect(screen, RED if tracking else GREEN, BUTTONS["Performance"]["tracking"])
+    draw_text(screen, "Start" if not tracking else "Stop", font_small_clean, BLACK, *BUTTONS["Performance"]["tracking"].center)
 
 def speed_time_graph_page(screen):
     """
     Display the speed/rpm vs time graph
     """
     
-    display_graph(screen, "speed_time_graph.png", (0, 0), SCREEN_WIDTH*.97, SCREEN_HEIGHT*.94)
+    display_graph(screen, "speed_time", (0, 0))
 
 def speed_rpm_graph_page(screen):
     """
     Display the speed vs rpm graph
     """
 
-    display_graph(screen, "speed_rpm_graph.png", (0, 0), SCREEN_WIDTH*.97, SCREEN_HEIGHT*.94)
\ No newline at end of file
+    display_graph(screen, "speed_rpm", (0, 0))
\ No newline at end of file
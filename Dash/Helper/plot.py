@@ -0,0 +1,397 @@
+import math
+import queue
+import threading
+from itertools import chain
+from operator import itemgetter
+from .builder import *
+
+# Pixels left around the plot for the title, tick labels and axis labels (left, top, right, bottom)
+PLOT_MARGINS = (70, 40, 70, 56)
+
+# Length in pixels of the dashes and the gaps between them in dashed lines
+DASH_LENGTH = 6
+
+# The graphs are drawn on the GraphWorker's thread and pygame fonts aren't thread-safe, so they get their own font
+# instead of sharing builder's with the render loop
+font_plot = pygame.font.Font(size=24)
+
+def nice_ticks(low, high, count=6):
+    """
+    Picks round numbers for the tick marks of an axis.
+
+    Args:
+        low (float): The bottom of the axis.
+        high (float): The top of the axis.
+        count (int, optional): The most ticks to have.
+
+    Returns:
+        list: The values to put ticks at, steps of 1, 2, 2.5 or 5 times a power of ten.
+    """
+
+    if high <= low:
+        return [low]
+
+    rough_step = (high - low) / count
+    magnitude = 10 ** math.floor(math.log10(rough_step))
+    step = next(step * magnitude for step in (1, 2, 2.5, 5, 10) if step * magnitude >= rough_step)
+
+    ticks = []
+    value = math.ceil(low / step) * step
+    while value <= high:
+        ticks.append(round(value, 10))
+        value += step
+    return ticks
+
+def data_range(parts, margin=.05):
+    """
+    Args:
+        parts (tuple): The values to fit on an axis, in parts like the columns of a RunBuffer.
+        margin (float, optional): Room to leave past the smallest and largest values, as a part of the range.
+
+    Returns:
+        tuple: The bottom and top of the axis.
+    """
+
+    low = min(min(part) for part in parts if len(part))
+    high = max(max(part) for part in parts if len(part))
+    if low == high:
+        low, high = low - 1, high + 1
+    padding = (high - low) * margin
+    return low - padding, high + padding
+
+def draw_dashed_line(surface, color, start, end, width=1):
+    """
+    Draws a dashed line, which pygame doesn't draw itself.
+
+    Args:
+        surface (pygame.Surface): The surface to draw on.
+        color (tuple): The color of the line.
+        start (tuple): The (x, y) the line starts at.
+        end (tuple): The (x, y) the line ends at.
+        width (int, optional): The width of the line.
+    """
+
+    length = math.dist(start, end)
+    if length == 0:
+        return
+
+    dx, dy = (end[0] - start[0]) / length, (end[1] - start[1]) / length
+    for offset in range(0, int(length), DASH_LENGTH * 2):
+        dash_end = min(offset + DASH_LENGTH, length)
+        pygame.draw.line(surface, color, (start[0] + dx * offset, start[1] + dy * offset),
+                         (start[0] + dx * dash_end, start[1] + dy * dash_end), width)
+
+def draw_marker(surface, color, center, radius, edge_color=None):
+    """
+    Draws a round marker for a point, with an outline if `edge_color` is given.
+    """
+
+    pygame.draw.circle(surface, color, center, radius)
+    if edge_color is not None:
+        pygame.draw.circle(surface, edge_color, center, radius, 2)
+
+class Axes:
+    """
+    Maps values onto a rectangle of a surface and draws them, like a matplotlib axes.
+
+    Args:
+        surface (pygame.Surface): The surface to draw on.
+        rect (pygame.Rect): The part of the surface the values are plotted in.
+        x_range (tuple): The values at the left and right of the rectangle.
+        y_range (tuple): The values at the bottom and top of the rectangle.
+    """
+
+    def __init__(self, surface, rect, x_range, y_range):
+        self.surface = surface
+        self.rect = rect
+        self.x_range = x_range
+        self.y_range = y_range
+
+    def twin(self, y_range):
+        """
+        Returns:
+            Axes: Axes over the same rectangle and x values with their own y values, for a second y-axis on the right.
+        """
+
+        return Axes(self.surface, self.rect, self.x_range, y_range)
+
+    def point(self, x, y):
+        """
+        Returns:
+            tuple: The pixel (x, y) on the surface of a value.
+        """
+
+        (x_low, x_high), (y_low, y_high) = self.x_range, self.y_range
+        return (self.rect.left + (x - x_low) / (x_high - x_low) * self.rect.width,
+                self.rect.bottom - (y - y_low) / (y_high - y_low) * self.rect.height)
+
+    def grid(self, color):
+        """
+        Draws dashed lines across the plot at each tick.
+        """
+
+        for x in nice_ticks(*self.x_range):
+            x = self.point(x, self.y_range[0])[0]
+            draw_dashed_line(self.surface, color, (x, self.rect.top), (x, self.rect.bottom))
+        for y in nice_ticks(*self.y_range):
+            y = self.point(self.x_range[0], y)[1]
+            draw_dashed_line(self.surface, color, (self.rect.left, y), (self.rect.right, y))
+
+    def x_axis(self, label, color):
+        """
+        Draws the x-axis along the bottom of the plot with its ticks, tick labels and label.
+        """
+
+        pygame.draw.line(self.surface, color, self.rect.bottomleft, self.rect.bottomright)
+        for value in nice_ticks(*self.x_range):
+            x = self.point(value, self.y_range[0])[0]
+            pygame.draw.line(self.surface, color, (x, self.rect.bottom), (x, self.rect.bottom + 5))
+            text = font_plot.render(f"{value:g}", True, color)
+            self.surface.blit(text, text.get_rect(midtop=(x, self.rect.bottom + 7)))
+
+        text = font_plot.render(label, True, color)
+        self.surface.blit(text, text.get_rect(midbottom=(self.rect.centerx, self.surface.get_height())))
+
+    def y_axis(self, label, color, right=False):
+        """
+        Draws a y-axis along the left of the plot, or the right if `right` is True, with its ticks, tick labels and label.
+        """
+
+        x = self.rect.right if right else self.rect.left
+        side = 1 if right else -1
+        pygame.draw.line(self.surface, color, (x, self.rect.top), (x, self.rect.bottom))
+
+        for value in nice_ticks(*self.y_range):
+            y = self.point(self.x_range[0], value)[1]
+            pygame.draw.line(self.surface, color, (x, y), (x + side * 5, y))
+            text = font_plot.render(f"{value:g}", True, color)
+            self.surface.blit(text, text.get_rect(midleft=(x + 7, y)) if right else text.get_rect(midright=(x - 7, y)))
+
+        text = pygame.transform.rotate(font_plot.render(label, True, color), -90 if right else 90)
+        if right:
+            self.surface.blit(text, text.get_rect(midright=(self.surface.get_width(), self.rect.centery)))
+        else:
+            self.surface.blit(text, text.get_rect(midleft=(0, self.rect.centery)))
+
+    def line(self, xs, ys, color, marker_radius=0):
+        """
+        Draws values joined by a line, with a marker on each one if `marker_radius` is given.
+        """
+
+        points = [self.point(x, y) for x, y in zip(xs, ys)]
+        if len(points) > 1:
+            pygame.draw.lines(self.surface, color, False, points, 2)
+        if marker_radius:
+            for point in points:
+                pygame.draw.circle(self.surface, color, point, marker_radius)
+
+    def scatter(self, xs, ys, color, radius, edge_color=None):
+        """
+        Draws a marker on each value.
+        """
+
+        for x, y in zip(xs, ys):
+            draw_marker(self.surface, color, self.point(x, y), radius, edge_color)
+
+    def vertical_line(self, x, color):
+        """
+        Draws a dashed line up the plot at a value.
+        """
+
+        x = self.point(x, self.y_range[0])[0]
+        draw_dashed_line(self.surface, color, (x, self.rect.top), (x, self.rect.bottom), 2)
+
+def draw_title(surface, title, color):
+    """
+    Draws the title of the plot centered along the top.
+    """
+
+    text = font_plot.render(title, True, color)
+    surface.blit(text, text.get_rect(midtop=(surface.get_width() // 2, 8)))
+
+def draw_legend(surface, position, entries, color):
+    """
+    Draws a key for the plot.
+
+    Args:
+        surface (pygame.Surface): The surface to draw on.
+        position (tuple): The top left corner of the key.
+        entries (list): The (label, color, style) of each entry, where style is "line", "dashed" or "marker".
+        color (tuple): The color of the labels.
+    """
+
+    line_height = font_plot.get_linesize()
+    labels = [font_plot.render(label, True, color) for label, _, _ in entries]
+    box = pygame.Rect(position, (max(label.get_width() for label in labels) + 46, line_height * len(entries) + 8))
+
+    pygame.draw.rect(surface, (0, 0, 0, 160), box, border_radius=4)
+    pygame.draw.rect(surface, color, box, 1, 4)
+
+    for i, ((_, entry_color, style), label) in enumerate(zip(entries, labels)):
+        y = box.top + 4 + line_height * i + line_height // 2
+        if style == "line":
+            pygame.draw.line(surface, entry_color, (box.left + 8, y), (box.left + 32, y), 2)
+        elif style == "dashed":
+            draw_dashed_line(surface, entry_color, (box.left + 8, y), (box.left + 32, y), 2)
+        else:
+            draw_marker(surface, entry_color, (box.left + 20, y), 6, BLACK)
+        surface.blit(label, label.get_rect(midleft=(box.left + 40, y)))
+
+def plot_rect(size):
+    """
+    Returns:
+        pygame.Rect: The part of a graph of `size` the values are plotted in, inside the margins.
+    """
+
+    left, top, right, bottom = PLOT_MARGINS
+    return pygame.Rect(left, top, size[0] - left - right, size[1] - top - bottom)
+
+def plot_speed_time(run, FONT_COLOR, size, crossings=()):
+    """
+    Draws the speed and RPM over time of a tracked run.
+
+    Args:
+        run (RunBuffer): The samples of the run.
+        FONT_COLOR (tuple): The color of the text, axes and speed.
+        size (tuple): The (width, height) of the graph.
+        crossings (tuple, optional): The (speed, seconds since the run started) of each speed reached, like the
+            0-60 and 0-100 times on the Performance page, with None for the speeds that weren't reached.
+
+    Returns:
+        pygame.Surface: The graph on a transparent background.
+
+    Description:
+        - Speed is plotted against the left y-axis and RPM against the right one, over the seconds since the run started.
+        - Marks the top speed and top RPM, and the times the speeds in `crossings` were reached.
+        - Reads the columns of the run in place, the times are already relative to the start of the run.
+    """
+
+    # Extract times, speeds, and RPMs
+    times, speeds, rpms = run.columns()
+
+    surface = pygame.Surface(size, pygame.SRCALPHA)
+    speed_axes = Axes(surface, plot_rect(size), data_range(times), data_range(speeds))
+    rpm_axes = speed_axes.twin(data_range(rpms))
+
+    draw_title(surface, "Speed and RPM Over Time", FONT_COLOR)
+    speed_axes.grid(FONT_COLOR)
+    speed_axes.x_axis("Time (seconds)", FONT_COLOR)
+    speed_axes.y_axis("Speed (MPH)", FONT_COLOR)
+    rpm_axes.y_axis("RPM", BLUE, right=True)
+
+    surface.set_clip(speed_axes.rect)
+    speed_axes.line(chain(*times), chain(*speeds), FONT_COLOR, 3)
+    rpm_axes.line(chain(*times), chain(*rpms), BLUE, 1)
+
+    entries = [("Speed", FONT_COLOR, "line"), ("RPM", BLUE, "line")]
+
+    # Draw vertical lines at the times the speed reached 60 and 100, the same times the Performance page shows
+    for target, reached in crossings:
+        if reached is not None:
+            speed_axes.vertical_line(reached, RED)
+            entries.append((f"{target} MPH Reached", RED, "dashed"))
+
+    # Add a larger circle at the max speed and max RPM
+    top_speed = max(zip(chain(*times), chain(*speeds)), key=itemgetter(1))
+    top_rpm = max(zip(chain(*times), chain(*rpms)), key=itemgetter(1))
+    speed_axes.scatter([top_speed[0]], [top_speed[1]], GREEN, 10, BLACK)
+    rpm_axes.scatter([top_rpm[0]], [top_rpm[1]], PURPLE, 10, BLACK)
+    entries += [("Top Speed", GREEN, "marker"), ("Top RPM", PURPLE, "marker")]
+
+    surface.set_clip(None)
+    draw_legend(surface, (speed_axes.rect.left + 8, speed_axes.rect.top + 8), entries, FONT_COLOR)
+    return surface
+
+def plot_speed_rpm(run, FONT_COLOR, size):
+    """
+    Draws the RPM against the speed of each sample of a tracked run.
+
+    Args:
+        run (RunBuffer): The samples of the run.
+        FONT_COLOR (tuple): The color of the text, axes and samples.
+        size (tuple): The (width, height) of the graph.
+
+    Returns:
+        pygame.Surface: The graph on a transparent background, with the highest RPM marked.
+    """
+
+    # Extract speeds and RPMs
+    _, speeds, rpms = run.columns()
+
+    surface = pygame.Surface(size, pygame.SRCALPHA)
+    axes = Axes(surface, plot_rect(size), data_range(speeds), data_range(rpms))
+
+    draw_title(surface, "RPM vs Speed", FONT_COLOR)
+    axes.grid(FONT_COLOR)
+    axes.x_axis("Speed (MPH)", FONT_COLOR)
+    axes.y_axis("RPM", FONT_COLOR)
+
+    surface.set_clip(axes.rect)
+    axes.scatter(chain(*speeds), chain(*rpms), (*FONT_COLOR, 180), 4)
+
+    # Highlight the maximum RPM point
+    top_rpm = max(zip(chain(*speeds), chain(*rpms)), key=itemgetter(1))
+    axes.scatter([top_rpm[0]], [top_rpm[1]], FONT_COLOR, 10, BLACK)
+
+    surface.set_clip(None)
+    draw_legend(surface, (axes.rect.left + 8, axes.rect.top + 8),
+                [("RPM vs Speed", FONT_COLOR, "marker"), ("Max RPM", FONT_COLOR, "marker")], FONT_COLOR)
+    return surface
+
+class GraphWorker:
+    """
+    Draws the graphs of finished runs on a thread of its own, so the render loop never waits for them.
+
+    Args:
+        size (tuple): The (width, height) to draw the graphs at.
+
+    Description:
+        - `submit` hands over the samples of a finished run and returns straight away, the thread is started the
+          first time it is needed.
+        - Runs handed over while the worker is busy wait for it, and only the newest of them is drawn.
+        - `poll` hands back each set of graphs once, when both are drawn, so the pages never show a graph of one run
+          next to one of another.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.jobs = queue.Queue()
+        self.results = queue.Queue()
+        self.thread = None
+
+    def submit(self, run, FONT_COLOR, crossings=()):
+        """
+        Args:
+            run (RunBuffer): The samples of the run, copied so the buffer can be reused for the next run.
+            FONT_COLOR (tuple): The color to draw the graphs in.
+            crossings (tuple, optional): The (speed, seconds since the run started) of each speed reached, see `plot_speed_time`.
+        """
+
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.work, daemon=True)
+            self.thread.start()
+        self.jobs.put((run.copy(), FONT_COLOR, tuple(crossings)))
+
+    def work(self):
+        while True:
+            run, FONT_COLOR, crossings = self.jobs.get()
+
+            # Skip to the newest run
+            while not self.jobs.empty():
+                run, FONT_COLOR, crossings = self.jobs.get()
+
+            self.results.put({
+                "speed_time": plot_speed_time(run, FONT_COLOR, self.size, crossings),
+                "speed_rpm": plot_speed_rpm(run, FONT_COLOR, self.size),
+            })
+
+    def poll(self):
+        """
+        Returns:
+            dict: The newest graphs by name if any were drawn since the last call, otherwise None.
+        """
+
+        graphs = None
+        while not self.results.empty():
+            graphs = self.results.get()
+        return graphs
@@ -0,0 +1,226 @@
+from .builder import *
+from .brain import prewarm_backgrounds
+from .pages import *
+from .events import *
+
+class DashState:
+    """
+    Everything the pages show and change, besides the readings from the car.
+
+    Description:
+        - Created once by `main()` and handed to every page, so pages read and change the settings by name instead
+          of through long lists of arguments.
+        - The colors are worked out from the selected color indices whenever they are read.
+    """
+
+    def __init__(self):
+        # Saved settings
+        self.brightness = 0
+        self.rpm_max = 0
+        self.shift = 0
+        self.top_speed = 0
+        self.shift_light = True
+        self.delay = 0
+        self.optimize = 0
+        self.font_index = 0
+        self.background_1_index = 0
+        self.background_2_index = 0
+        self.shift_color_1 = 0
+        self.shift_color_2 = 0
+        self.shift_color_3 = 0
+        self.shift_color_4 = 0
+        self.shift_padding = 0
+        self.image_index = 0
+        self.images = []
+
+        # Settings that last until the dash is closed
+        self.FLIP = False
+        self.development_mode = False
+        self.show_fps = False
+        self.running = True
+        self.exit_text = "Exiting..."
+
+        # Trouble codes
+        self.clear = False
+        self.cleared = 0
+
+        # Performance tracking
+        self.tracking = False
+        self.reset_performance = False
+        self.last_top_speed = 0
+        self.speed_times = None  # The RunBuffer the samples of a tracked run go in, made by main()
+        self.elapsed_time = None
+        self.zero_to_sixty_time = None
+        self.zero_to_sixty_error = None
+        self.zero_to_hundred_time = None
+        self.zero_to_hundred_error = None
+
+        # Shared with the connection, refreshed by main() every frame
+        self.DEV = False
+        self.SYSTEM_VERSION = ""
+        self.connect = False
+        self.supported = None
+        self.wifi = 0
+        self.query_times = {}
+        self.link_stats = {}
+
+        # The page on screen, set by `show`
+        self.page = None
+
+    def show(self, page):
+        """
+        Switches the page on screen, letting the pages know when they come on and leave the screen.
+
+        Args:
+            page (Page): The page to show, nothing happens if it is already on screen.
+        """
+
+        if page is self.page:
+            return
+        if self.page is not None:
+            self.page.exit(self)
+        self.page = page
+        page.enter(self)
+
+    @property
+    def FONT_COLOR(self):
+        return COLORS[self.font_index]
+
+    @property
+    def BACKGROUND_1_COLOR(self):
+        return COLORS[self.background_1_index]
+
+    @property
+    def BACKGROUND_2_COLOR(self):
+        return COLORS[self.background_2_index]
+
+class Page:
+    """
+    A page of the dash.
+
+    Args:
+        name (str): The name the page has in the `pages` layout.
+        render (function): Draws the page, called as `render(screen, state, snapshot)`. Returns the regions that change
+            with the readings (see `changed_regions`), or None to have the whole screen updated.
+        handle (function, optional): Handles a touch, called as `handle(state, x, y, holding)` where `holding` is True
+            for the repeats of a held touch.
+        channels (tuple, optional): The values the page displays, only these are polled from the car while it is on screen.
+        optimize_channels (tuple, optional): The values polled instead of `channels` when optimize readings is on.
+        repeat (bool): True if holding a touch on the page repeats it.
+        guide (bool): True if the page indicators are drawn behind the page.
+        on_enter (function, optional): Called with the state when the page comes on screen.
+        on_exit (function, optional): Called with the state when the page leaves the screen.
+    """
+
+    __slots__ = ("name", "render", "handle", "channels", "optimize_channels", "repeat", "guide", "on_enter", "on_exit")
+
+    def __init__(self, name, render, handle=None, channels=(), optimize_channels=None, repeat=False, guide=True,
+                 on_enter=None, on_exit=None):
+        self.name = name
+        self.render = render
+        self.handle = handle
+        self.channels = channels
+        self.optimize_channels = optimize_channels
+        self.repeat = repeat
+        self.guide = guide
+        self.on_enter = on_enter
+        self.on_exit = on_exit
+
+    def subscription(self, optimize):
+        """
+        Args:
+            optimize (bool): If optimize readings is on.
+
+        Returns:
+            tuple: The names of the values to poll while the page is on screen.
+        """
+
+        if optimize and self.optimize_channels is not None:
+            return self.optimize_channels
+        return self.channels
+
+    def enter(self, state):
+        if self.on_enter is not None:
+            self.on_enter(state)
+
+    def exit(self, state):
+        if self.on_exit is not None:
+            self.on_exit(state)
+
+def render_main(screen, state, snapshot):
+    return main_page(screen, state.FONT_COLOR, state.BACKGROUND_1_COLOR, state.BACKGROUND_2_COLOR, snapshot.fuel_level, snapshot.rpm, state.rpm_max, state.shift, state.optimize, state.shift_light, snapshot.mpg, snapshot.speed, snapshot.air_temp, snapshot.voltage, state.shift_color_1, state.shift_color_2, state.shift_color_3, state.shift_color_4, state.shift_padding)
+
+def render_rpm(screen, state, snapshot):
+    rpm_page(screen, state.FONT_COLOR, state.DEV, state.supported, snapshot.rpm, state.rpm_max, state.shift, state.connect)
+
+def handle_rpm(state, x, y, holding):
+    state.rpm_max, state.shift = rpm_event(x, y, state.rpm_max, state.shift)
+
+def render_settings(screen, state, snapshot):
+    settings_page(screen, state.FONT_COLOR, state.BACKGROUND_2_COLOR, state.brightness, state.optimize, state.delay, state.reset_performance)
+
+def handle_settings(state, x, y, holding):
+    state.brightness, state.optimize, state.FLIP, state.delay, state.reset_performance, state.top_speed = settings_event(x, y, state.brightness, state.optimize, state.FLIP, state.delay, state.reset_performance, state.top_speed, holding)
+
+def render_trouble(screen, state, snapshot):
+    trouble_page(screen, state.FONT_COLOR, snapshot.codes, state.cleared)
+
+def handle_trouble(state, x, y, holding):
+    state.clear = trouble_event(x, y, state.clear)
+
+def render_info(screen, state, snapshot):
+    info_page(screen, state.FONT_COLOR, state.SYSTEM_VERSION, state.wifi, state.development_mode)
+
+def handle_info(state, x, y, holding):
+    state.running, state.exit_text, state.development_mode = info_event(x, y, state.wifi, state.running, state.exit_text, state.development_mode)
+
+def render_custom(screen, state, snapshot):
+    custom_page(screen, state.FONT_COLOR, state.font_index, state.background_1_index, state.background_2_index, state.images, state.image_index)
+
+def enter_custom(state):
+    # Get the backgrounds next to the selected one ready, so switching to them doesn't stall a frame
+    prewarm_backgrounds(state.images, state.image_index, state.BACKGROUND_2_COLOR)
+
+def handle_custom(state, x, y, holding):
+    image_index = state.image_index
+    state.font_index, state.background_1_index, state.background_2_index, state.image_index = custom_event(x, y, state.images, state.font_index, state.background_1_index, state.background_2_index, state.image_index, holding)
+    if state.image_index != image_index:
+        enter_custom(state)
+
+def render_color_1(screen, state, snapshot):
+    color_1_page(screen, state.FONT_COLOR, state.shift, state.shift_light, state.shift_color_1, state.shift_color_2, state.shift_color_3, state.shift_color_4, state.shift_padding)
+
+def handle_color_1(state, x, y, holding):
+    state.shift_light, state.shift_color_1, state.shift_color_2, state.shift_color_3, state.shift_color_4, state.shift_padding = color_1_event(x, y, state.shift_light, state.shift_color_1, state.shift_color_2, state.shift_color_3, state.shift_color_4, state.shift_padding)
+
+def render_development(screen, state, snapshot):
+    developmental_page(screen, state.FONT_COLOR, state.show_fps, state.query_times, state.link_stats)
+
+def handle_development(state, x, y, holding):
+    state.show_fps = development_event(x, y, state.show_fps)
+
+def render_performance(screen, state, snapshot):
+    performance_page(screen, state.FONT_COLOR, state.BACKGROUND_2_COLOR, state.shift_color_1, state.shift_color_2, state.shift_color_3, state.shift_color_4, state.shift_padding, snapshot.rpm, state.shift, state.top_speed, state.last_top_speed, state.tracking, state.elapsed_time, state.zero_to_sixty_time, state.zero_to_sixty_error, state.zero_to_hundred_time, state.zero_to_hundred_error)
+
+def handle_performance(state, x, y, holding):
+    state.tracking = performance_event(x, y, state.tracking)
+
+def render_off(screen, state, snapshot):
+    screen.fill(BLACK)
+
+# Every page of the dash by name, the `pages` layout decides where each one is
+PAGES = {page.name: page for page in (
+    Page("Main", render_main, channels=("RPM", "Speed", "MAF", "Fuel_Level", "Voltage", "Air_Temp"),
+         optimize_channels=("RPM", "Fuel_Level"), guide=False),
+    Page("RPM", render_rpm, handle_rpm, channels=("RPM", "CEL_Codes"), repeat=True),
+    Page("Settings", render_settings, handle_settings, repeat=True),
+    Page("Trouble", render_trouble, handle_trouble, channels=("RPM", "CEL_Codes")),
+    Page("Info", render_info, handle_info),
+    Page("Custom", render_custom, handle_custom, repeat=True, on_enter=enter_custom),
+    Page("Color1", render_color_1, handle_color_1, repeat=True),
+    Page("Development", render_development, handle_development),
+    Page("Performance", render_performance, handle_performance, channels=("RPM", "Speed")),
+    Page("Speed_Time", lambda screen, state, snapshot: speed_time_graph_page(screen)),
+    Page("Speed_RPM", lambda screen, state, snapshot: speed_rpm_graph_page(screen)),
+    Page("Off", render_off, guide=False),
+)}
@@ -0,0 +1,212 @@
+class Channel:
+    """
+    A single value the dash reads from the car.
+
+    Args:
+        name (str): Name used for storing the value and for the query timing averages.
+        pid (str): The Mode 01 PID as a hex string (e.g. '0x0C'), or None if it is always available.
+        command (str): Name of the python-obd command used to read the value.
+        interval (float): Target time in seconds between two reads of this value.
+        priority (int): How urgent the value is when several are overdue, higher is more urgent.
+        convert (function): Turns the python-obd response value into the dash's units.
+        size (int): Number of data bytes the car returns for the PID.
+        formula (function): Turns the raw data bytes straight into the dash's units, used by the lean ELM327 driver.
+    """
+
+    __slots__ = ("name", "pid", "command", "interval", "priority", "convert", "size", "formula", "last_polled")
+
+    def __init__(self, name, pid, command, interval, priority, convert, size=0, formula=None):
+        self.name = name
+        self.pid = pid
+        self.command = command
+        self.interval = interval
+        self.priority = priority
+        self.convert = convert
+        self.size = size
+        self.formula = formula
+        self.last_polled = 0
+
+# Every value the dash knows how to read, RPM is polled the fastest and slow moving values the slowest
+# Speed and MAF share an interval so they are read in the same request and MPG uses a matching pair
+CHANNELS = [
+    Channel("RPM", "0x0C", "RPM", .05, 3, lambda value: int(round(value.magnitude, 0)),
+            2, lambda data: (data[0] * 256 + data[1] + 2) >> 2),
+    Channel("Speed", "0x0D", "SPEED", .25, 2, lambda value: value.to('mile/hour').magnitude,
+            1, lambda data: data[0] * 0.621371),  # km/h to mph
+    Channel("MAF", "0x10", "MAF", .25, 2, lambda value: value.to('gram/second').magnitude,
+            2, lambda data: (data[0] * 256 + data[1]) / 100),
+    Channel("Fuel_Level", "0x2F", "FUEL_LEVEL", 2, 1, lambda value: value.magnitude,
+            1, lambda data: data[0] * 100 / 255),
+    Channel("Voltage", "0x42", "CONTROL_MODULE_VOLTAGE", 1.3, 1, lambda value: value.magnitude,
+            2, lambda data: (data[0] * 256 + data[1]) / 1000),
+    Channel("Air_Temp", "0x46", "AMBIANT_AIR_TEMP", 5, 1, lambda value: value.magnitude,
+            1, lambda data: data[0] - 40),
+    Channel("CEL_Codes", None, "GET_DTC", 2, 1, lambda value: value),
+]
+
+class PidScheduler:
+    """
+    Decides which value to read from the car next.
+
+    Args:
+        channels (list): All of the channels that can be polled.
+
+    Description:
+        - Pages subscribe to the channels they display, only those channels are polled.
+        - Each channel is due once its interval has passed since it was last read.
+        - Out of the due channels, the most overdue one is read next, weighted by its priority.
+        - With `delay` on, intervals are ignored so every subscribed value is read in turn.
+        - Intervals adapt to how fast the car answers, see `record`.
+    """
+
+    TARGET_LOAD = .8  # Share of the time to keep the adapter busy, leaving it room to keep up
+    MAX_SCALE = 8  # Most that intervals are stretched on a slow car
+    MIN_SCALE = .5  # Most that intervals are shortened on a fast car
+
+    def __init__(self, channels):
+        self.channels = {channel.name: channel for channel in channels}
+        self.subscribed = []
+        self.delay = False
+        self.latency = None  # Rolling average of seconds per request
+        self.load = 0  # Rolling average share of the time spent waiting on the car
+        self.scale = 1  # How much the channel intervals are stretched, or shortened below 1
+
+    def record(self, busy, idle, alpha=0.1):
+        """
+        Records how long a request took, and adapts the polling rate to it.
+
+        Args:
+            busy (float): Seconds the request took.
+            idle (float): Seconds spent waiting for something to be due since the last request.
+            alpha (float): Weight of the new measurement in the rolling averages, like `update_rolling_average`.
+
+        Description:
+            - Keeps rolling averages of the request time and of the share of time the adapter is busy.
+            - When the adapter is busier than `TARGET_LOAD` the intervals are stretched a little, so slow cars are not flooded with requests.
+            - When it is less busy the intervals shrink, down to `MIN_SCALE` of their targets, so fast cars are read more
+              often. `interval` still never lets them get shorter than a request takes.
+        """
+
+        self.latency = busy if self.latency is None else alpha * busy + (1 - alpha) * self.latency
+
+        load = busy / (busy + idle) if busy + idle > 0 else 1
+        self.load = alpha * load + (1 - alpha) * self.load
+
+        # Nudge the intervals towards keeping the adapter busy for TARGET_LOAD of the time
+        self.scale *= 1 + alpha * (self.load / self.TARGET_LOAD - 1)
+        self.scale = min(max(self.scale, self.MIN_SCALE), self.MAX_SCALE)
+
+    def interval(self, channel):
+        """
+        Returns:
+            float: Seconds between two reads of the channel, stretched for slow cars and never shorter than a request takes.
+        """
+
+        if self.delay:
+            return 0
+        return max(channel.interval * self.scale, self.latency or 0)
+
+    def idle_time(self, wait):
+        """
+        Works out how long to sleep while nothing is due.
+
+        Args:
+            wait (float): Seconds until the next channel is due.
+
+        Returns:
+            float: Seconds to sleep, short enough to notice page changes and to be on time for fast cars.
+        """
+
+        return min(wait, max(.005, min(.05, (self.latency or .05) / 2)))
+
+    def subscribe(self, names, supported):
+        """
+        Changes which channels are being polled.
+
+        Args:
+            names (iterable): Names of the channels to poll.
+            supported (list): The PIDs supported by the car.
+
+        Description:
+            - Channels whose PID is not supported by the car are left out.
+            - Channels keep their last read time, so switching pages does not reset their timing.
+        """
+
+        self.subscribed = [self.channels[name] for name in names
+                           if name in self.channels and (self.channels[name].pid is None or self.channels[name].pid in supported)]
+
+    def next_due(self, now):
+        """
+        Finds the channel that should be read next.
+
+        Args:
+            now (float): The current time in seconds.
+
+        Returns:
+            tuple: The channel to read (or None if nothing is subscribed) and how long to wait before it is due.
+        """
+
+        best = None
+        best_score = None
+        soonest = None
+        soonest_wait = None
+
+        for channel in self.subscribed:
+            overdue = now - (channel.last_polled + self.interval(channel))
+
+            if overdue >= 0:
+                score = (overdue * channel.priority, channel.priority)
+                if best_score is None or score > best_score:
+                    best = channel
+                    best_score = score
+            elif soonest_wait is None or -overdue < soonest_wait:
+                soonest = channel
+                soonest_wait = -overdue
+
+        if best is not None:
+            return best, 0
+        return soonest, soonest_wait or 0
+
+    def next_batch(self, now, limit):
+        """
+        Finds the channels to read together in the next request.
+
+        Args:
+            now (float): The current time in seconds.
+            limit (int): The most channels that can be read in one request.
+
+        Returns:
+            tuple: The channels to read (empty if nothing is subscribed) and how long to wait before they are due.
+
+        Description:
+            - Starts with the most overdue channel from `next_due`.
+            - Fills the rest of the request with other Mode 01 channels that are due, or will be before the next request
+              could be made, most overdue first. Reading a channel any earlier would poll it more often than its interval.
+            - Channels without a PID (like trouble codes) are always read on their own.
+        """
+
+        first, wait = self.next_due(now)
+        if first is None or wait > 0 or first.pid is None or limit <= 1:
+            return ([first] if first else []), wait
+
+        extra = []
+        for channel in self.subscribed:
+            if channel is first or channel.pid is None:
+                continue
+            overdue = now - (channel.last_polled + self.interval(channel))
+            if overdue >= -(self.latency or 0):
+                extra.append((overdue * channel.priority, channel))
+
+        extra.sort(key=lambda item: item[0], reverse=True)
+        return [first] + [channel for _, channel in extra[:limit - 1]], 0
+
+    def mark_polled(self, channel, now):
+        """
+        Records that a channel was just read.
+
+        Args:
+            channel (Channel): The channel that was read.
+            now (float): The time it was read at.
+        """
+
+        channel.last_polled = now
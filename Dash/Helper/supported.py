@@ -0,0 +1,88 @@
+class SupportedPids:
+    """
+    The Mode 01 PIDs a car supports, stored as one integer with a bit per PID.
+
+    Args:
+        bits (int): The bitmap, bit N is set if PID N is supported.
+
+    Description:
+        - Checking a PID (e.g. `'0x0C' in supported` or `0x0C in supported`) is a single bit test.
+        - Built straight from the 4 byte bitmaps the car returns for PIDS_A, PIDS_B and PIDS_C (0100, 0120 and 0140).
+        - Iterating gives the PIDs as hex strings (e.g. '0x0C'), like the list it replaces.
+    """
+
+    __slots__ = ("bits",)
+
+    def __init__(self, bits=0):
+        self.bits = bits
+
+    def add_range(self, base, bitmap):
+        """
+        Adds the answer to one of the supported PID requests.
+
+        Args:
+            base (int): The PID that was requested (0x00, 0x20 or 0x40).
+            bitmap (int): The 4 data bytes as an integer, the most significant bit is PID base + 1.
+        """
+
+        # Flip the bit order so PID base + 1 lands on bit base + 1
+        self.bits |= int(f"{bitmap:032b}"[::-1], 2) << (base + 1)
+
+    def __contains__(self, pid):
+        if isinstance(pid, str):
+            pid = int(pid, 16)
+        return pid is not None and pid >= 0 and (self.bits >> pid) & 1 == 1
+
+    def __iter__(self):
+        bits = self.bits
+        pid = 0
+        while bits:
+            if bits & 1:
+                yield f"0x{pid:02X}"
+            bits >>= 1
+            pid += 1
+
+    def __len__(self):
+        return bin(self.bits).count("1")
+
+    def __eq__(self, other):
+        return isinstance(other, SupportedPids) and other.bits == self.bits
+
+    def __repr__(self):
+        return f"SupportedPids({list(self)})"
+
+    def to_hex(self):
+        """
+        Returns:
+            str: The bitmap as hex, for saving to a file.
+        """
+
+        return f"{self.bits:X}"
+
+    @classmethod
+    def from_hex(cls, text):
+        """
+        Args:
+            text (str): A bitmap saved by `to_hex`.
+
+        Returns:
+            SupportedPids: The supported PIDs.
+        """
+
+        return cls(int(text, 16))
+
+def parse_vin(data):
+    """
+    Turns the data of a VIN (0902) response into the VIN.
+
+    Args:
+        data (bytes): The VIN's characters, possibly padded with null bytes.
+
+    Returns:
+        str: The 17 character VIN, or None if the data is not a valid VIN.
+    """
+
+    vin = bytes(data).strip(b"\x00\x01\x02 ").decode("ascii", "ignore")
+    if len(vin) == 17 and vin.isalnum():
+        return vin.upper()
+    return None
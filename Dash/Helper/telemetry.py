@@ -0,0 +1,220 @@
+from array import array
+from .brain import calculate_mpg
+
+# The values the dash displays, in the dash's units
+FIELDS = ("rpm", "speed", "maf", "mpg", "fuel_level", "voltage", "air_temp", "codes")
+
+# The field each channel's readings are stored in
+CHANNEL_FIELDS = {
+    "RPM": "rpm",
+    "Speed": "speed",
+    "MAF": "maf",
+    "Fuel_Level": "fuel_level",
+    "Voltage": "voltage",
+    "Air_Temp": "air_temp",
+    "CEL_Codes": "codes",
+}
+
+class Telemetry:
+    """
+    One consistent set of readings from the car.
+
+    Description:
+        - Each value has a matching `<value>_time` with the time it was read at, or 0 if it has not been read yet.
+        - `<value>_error` is how many seconds the time it was read at may be off by, the car answers somewhere during
+          the request so it is half of how long the request took.
+        - `mpg` is worked out from a `speed` and `maf` read together, its time is the older of the two.
+        - `stale` is True while the connection to the car is lost, the values are the last ones read before it.
+    """
+
+    __slots__ = FIELDS + tuple(f"{field}_time" for field in FIELDS) + tuple(f"{field}_error" for field in FIELDS) + ("stale",)
+
+    def __init__(self):
+        for field in FIELDS:
+            setattr(self, field, 0)
+            setattr(self, f"{field}_time", 0)
+            setattr(self, f"{field}_error", 0)
+        self.codes = []
+        self.stale = False
+
+    def copy(self):
+        """
+        Returns:
+            Telemetry: A new frame with the same values and times.
+        """
+
+        frame = Telemetry.__new__(Telemetry)
+        for slot in Telemetry.__slots__:
+            setattr(frame, slot, getattr(self, slot))
+        return frame
+
+    def readings(self):
+        """
+        Returns:
+            tuple: The values and `stale`, without the times they were read at, to tell if anything on screen changed.
+        """
+
+        return tuple(getattr(self, field) for field in FIELDS) + (self.stale,)
+
+class TelemetryBuffer:
+    """
+    Hands readings from the query thread to the render loop without locking.
+
+    Description:
+        - The query thread writes readings into the back frame with `store`, then calls `publish` once per request.
+        - `publish` swaps a copy of the back frame in as the front frame. A frame is never changed once it is published,
+          so the render loop can keep the one it got from `snapshot` for the whole frame while new readings come in.
+        - Swapping the front frame is a single assignment, so readers always see a whole frame, never half of an update.
+    """
+
+    def __init__(self):
+        self.back = Telemetry()
+        self.front = self.back.copy()
+        self.fresh = set()  # Which of the speed and MAF were read since MPG was last worked out
+
+    def store(self, name, value, now, error=0):
+        """
+        Writes a reading into the back frame, it shows up in snapshots after the next `publish`.
+
+        Args:
+            name (str): The channel name (e.g. "RPM") or field name (e.g. "rpm") of the value.
+            value: The reading, in the dash's units.
+            now (float): The time the reading was taken at.
+            error (float, optional): How many seconds `now` may be off by.
+        """
+
+        field = CHANNEL_FIELDS.get(name, name)
+        setattr(self.back, field, value)
+        setattr(self.back, f"{field}_time", now)
+        setattr(self.back, f"{field}_error", error)
+        self.back.stale = False
+
+        # Only work out MPG once both the speed and MAF have a new reading, so it never mixes an old one with a new one.
+        # They are read in the same request when the car allows it, otherwise in requests right after each other
+        if field == "speed" or field == "maf":
+            self.fresh.add(field)
+            if len(self.fresh) == 2:
+                self.back.mpg = calculate_mpg(self.back.speed, self.back.maf)
+                self.back.mpg_time = min(self.back.speed_time, self.back.maf_time)
+                self.back.mpg_error = max(self.back.speed_error, self.back.maf_error)
+                self.fresh.clear()
+
+    def mark_stale(self):
+        """
+        Marks the readings as old, until the next one is stored, and publishes them.
+        """
+
+        self.back.stale = True
+        self.publish()
+
+    def publish(self):
+        """
+        Makes everything stored so far visible to `snapshot`.
+        """
+
+        self.front = self.back.copy()
+
+    def snapshot(self):
+        """
+        Returns:
+            Telemetry: The newest published frame, which must not be changed.
+        """
+
+        return self.front
+
+class RunBuffer:
+    """
+    The samples of a tracked run, in preallocated arrays with a column for each value.
+
+    Args:
+        capacity (int): The most samples kept, once it is full each new sample replaces the oldest one.
+        seconds (float, optional): The longest stretch of the run kept, older samples are dropped as new ones come in.
+
+    Description:
+        - The arrays are allocated once, so adding a sample never allocates memory and a run that is never stopped
+          can't keep growing.
+        - With `seconds` the run is cut by time rather than by how many samples fit, so it covers the same stretch
+          however fast the speed is read. `capacity` then only needs to fit that many seconds at the fastest rate.
+        - `columns` gives the times, speeds and RPMs as views of the arrays without copying them, in two parts once
+          the buffer has wrapped around.
+    """
+
+    __slots__ = ("capacity", "seconds", "times", "speeds", "rpms", "start", "count")
+
+    def __init__(self, capacity, seconds=None):
+        self.capacity = capacity
+        self.seconds = seconds
+        self.times = array("d", bytes(8 * capacity))
+        self.speeds = array("d", bytes(8 * capacity))
+        self.rpms = array("d", bytes(8 * capacity))
+        self.start = 0  # Index of the oldest sample
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def append(self, elapsed_time, speed, rpm):
+        """
+        Adds a sample, dropping the samples older than `seconds` and replacing the oldest one if the buffer is full.
+
+        Args:
+            elapsed_time (float): Seconds since the run started.
+            speed (float): The speed in MPH.
+            rpm (float): The RPM.
+        """
+
+        # Drop the samples that fell out of the kept stretch of the run
+        if self.seconds is not None:
+            while self.count and self.times[self.start] < elapsed_time - self.seconds:
+                self.start = (self.start + 1) % self.capacity
+                self.count -= 1
+
+        i = (self.start + self.count) % self.capacity
+        self.times[i] = elapsed_time
+        self.speeds[i] = speed
+        self.rpms[i] = rpm
+
+        if self.count < self.capacity:
+            self.count += 1
+        else:
+            self.start = (self.start + 1) % self.capacity
+
+    def clear(self):
+        """
+        Empties the buffer for the next run, keeping its arrays.
+        """
+
+        self.start = 0
+        self.count = 0
+
+    def columns(self):
+        """
+        Returns:
+            tuple: The times, speeds and RPMs, each as a tuple of memoryviews of the arrays to read in order.
+
+        Description:
+            - Each column is in one part, or in two once the buffer has wrapped around: from the oldest sample to the
+              end of the array, then from the start of the array to the newest sample.
+        """
+
+        end = self.start + self.count
+        if end <= self.capacity:
+            return tuple((memoryview(column)[self.start:end],) for column in (self.times, self.speeds, self.rpms))
+        return tuple((memoryview(column)[self.start:], memoryview(column)[:end - self.capacity])
+                     for column in (self.times, self.speeds, self.rpms))
+
+    def copy(self):
+        """
+        Returns:
+            RunBuffer: A new buffer with only these samples, to hand the run to another thread.
+        """
+
+        run = RunBuffer.__new__(RunBuffer)
+        run.times, run.speeds, run.rpms = array("d"), array("d"), array("d")
+        for copy, parts in zip((run.times, run.speeds, run.rpms), self.columns()):
+            for part in parts:
+                copy.frombytes(part.cast("B"))
+        run.capacity = run.count = self.count
+        run.start = 0
+        run.seconds = self.seconds
+        return run
@@ -0,0 +1,52 @@
+class HoldRepeat:
+    """
+    Turns a held touch into repeated presses, without sleeping on the render loop.
+
+    Args:
+        delay (float): Seconds a touch has to be held before it starts repeating.
+        interval (float): Seconds between the first repeats.
+        min_interval (float): Fewest seconds between repeats, the repeats speed up to it the longer the touch is held.
+        acceleration (float): What each interval is multiplied by to get the next one.
+
+    Description:
+        - `press` records when the touch started, `release` ends it.
+        - `due` is checked every frame, and is True once for each repeat that has come up.
+    """
+
+    def __init__(self, delay=.4, interval=.15, min_interval=.04, acceleration=.85):
+        self.delay = delay
+        self.interval = interval
+        self.min_interval = min_interval
+        self.acceleration = acceleration
+        self.pressed_at = None
+        self.next_repeat = None
+        self.repeats = 0
+
+    def press(self, now):
+        """
+        Args:
+            now (float): The time the touch started.
+        """
+
+        self.pressed_at = now
+        self.next_repeat = now + self.delay
+        self.repeats = 0
+
+    def release(self):
+        self.pressed_at = None
+
+    def due(self, now):
+        """
+        Args:
+            now (float): The current time.
+
+        Returns:
+            bool: True if the held touch should be handled again.
+        """
+
+        if self.pressed_at is None or now < self.next_repeat:
+            return False
+
+        self.repeats += 1
+        self.next_repeat = now + max(self.min_interval, self.interval * self.acceleration ** self.repeats)
+        return True
@@ -0,0 +1,173 @@
+import argparse
+import os
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+import dash
+from Helper import brain
+from Helper.emulator import Elm327Emulator, FAULT_PROFILES
+from Helper.scheduler import PidScheduler, CHANNELS
+
+# Readings further apart than this count as a gap in the data
+GAP = .5
+
+def run(backend, page, latency, duration, faults=None):
+    """
+    Runs the dash's real connection and query code against the ELM327 emulator.
+
+    Args:
+        backend (str): The backend to connect with ("obd" or "elm327").
+        page (str): The page to pretend is on screen, it decides which values are polled.
+        latency (float): Seconds the emulator waits before answering each request.
+        duration (float): Seconds to keep querying for.
+        faults (dict, optional): Faults for the emulator to inject, see `FAULT_PROFILES`.
+
+    Returns:
+        tuple: Seconds it took to connect, the times of the readings stored for each value, the emulator's outages,
+        the time querying started and the dash's reconnect stats.
+    """
+
+    emulator = Elm327Emulator(latency=latency, faults=faults)
+
+    dash.PORT = emulator.start()
+    dash.DEV = False
+    dash.BACKEND = backend
+    dash.connect = False
+    dash.scheduler = PidScheduler(CHANNELS)  # Start each run with fresh timings
+    dash.logging = True
+    dash.link_stats.update(reconnects=0, downtime=0.0, down_since=None)
+    dash.current_page = next((x, y) for x, row in enumerate(dash.pages) for y, name in enumerate(row) if name == page)
+
+    # Record the time of every reading query() stores
+    readings = defaultdict(list)
+    store_reading = dash.store_reading
+
+    def record_reading(name, value, sample_time, sample_error):
+        readings[name].append(time.time())
+        store_reading(name, value, sample_time, sample_error)
+
+    dash.store_reading = record_reading
+
+    # The dash's connection thread connects, queries, and reconnects when the connection is lost
+    start_time = time.time()
+    thread = threading.Thread(target=dash.connect_thread, daemon=True)
+    thread.start()
+    while not dash.connect and time.time() - start_time < 30:
+        time.sleep(.01)
+    connect_time = time.time() - start_time
+    start_time = time.time()
+
+    if dash.connect:
+        time.sleep(duration)
+
+    # Let the thread finish its current query before closing everything
+    dash.logging = False
+    thread.join()
+    dash.store_reading = store_reading
+    if dash.connection is not None:
+        dash.connection.close()
+    emulator.stop()
+
+    return connect_time, readings, emulator.outages, start_time, dict(dash.link_stats)
+
+def gaps(times, start_time, end_time):
+    """
+    Finds the stretches without readings.
+
+    Args:
+        times (list): The times of the readings.
+        start_time (float): When querying started.
+        end_time (float): When querying stopped.
+
+    Returns:
+        list: The length in seconds of each gap longer than `GAP`.
+    """
+
+    edges = [start_time] + times + [end_time]
+    return [b - a for a, b in zip(edges, edges[1:]) if b - a > GAP]
+
+def recovery_times(times, outages, end_time):
+    """
+    Works out how long it took for readings to come back after each disconnect.
+
+    Args:
+        times (list): The times of the readings.
+        outages (list): The (start, end) time of each disconnect.
+        end_time (float): When querying stopped.
+
+    Returns:
+        list: Seconds from the end of each disconnect to the next reading, None if readings never came back.
+    """
+
+    recoveries = []
+    for _, end in outages:
+        if end >= end_time:
+            continue  # The run finished during the disconnect
+        after = [t for t in times if t >= end]
+        recoveries.append(after[0] - end if after else None)
+    return recoveries
+
+def report(backend, args, scenario):
+    """
+    Benchmarks a backend in a scenario and prints the results.
+
+    Args:
+        backend (str): The backend to connect with ("obd" or "elm327").
+        args (argparse.Namespace): The command line options.
+        scenario (str): The name of the faults for the emulator to inject, see `FAULT_PROFILES`.
+    """
+
+    connect_time, readings, outages, start_time, link_stats = run(backend, args.page, args.latency, args.duration,
+                                                                  FAULT_PROFILES[scenario])
+    end_time = start_time + args.duration
+
+    print(f"\n{backend} backend, {args.page} page, {args.latency * 1000:.0f} ms latency, {scenario} scenario")
+    print(f"  Connect: {connect_time:.2f} seconds")
+    for name, times in sorted(readings.items()):
+        print(f"  {name}: {len(times) / args.duration:.1f} samples/second")
+    print(f"  Total: {sum(len(times) for times in readings.values()) / args.duration:.1f} samples/second")
+    print(f"  Adapter busy {dash.scheduler.load * 100:.0f}% of the time, intervals stretched x{dash.scheduler.scale:.2f}")
+
+    # The fastest value shows the gaps best
+    times = max(readings.values(), key=len, default=[])
+    missing = gaps(times, start_time, end_time)
+    print(f"  Gaps over {GAP} seconds: {len(missing)}, longest {max(missing, default=0):.2f} seconds")
+
+    recoveries = recovery_times(times, outages, end_time)
+    if recoveries:
+        recovered = [recovery for recovery in recoveries if recovery is not None]
+        text = f", slowest {max(recovered):.2f} seconds" if recovered else ""
+        print(f"  Recovered from {len(recovered)} of {len(recoveries)} disconnects{text}")
+        print(f"  Reconnects: {link_stats['reconnects']}, down for {link_stats['downtime']:.2f} seconds")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the dash's queries against an emulated ELM327 adapter.")
+    parser.add_argument("--backend", choices=("obd", "elm327"), nargs="+", default=["obd", "elm327"])
+    parser.add_argument("--page", default="Main")
+    parser.add_argument("--latency", type=float, default=.03)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--scenario", choices=FAULT_PROFILES, nargs="+", default=["clean"],
+                        help="Faults for the emulator to inject")
+    parser.add_argument("--detect", action="store_true",
+                        help="Ignore the saved adapter settings, to time a connection that detects them")
+    args = parser.parse_args()
+
+    if args.detect:
+        dash.load_adapter = lambda: (None, None)
+
+    # The runs save the emulated adapter's settings and supported PIDs in a temporary directory, keeping the real ones
+    saved_files = brain.ADAPTER_FILE, brain.SUPPORTED_FILE
+    with tempfile.TemporaryDirectory() as directory:
+        brain.ADAPTER_FILE = os.path.join(directory, "adapter.txt")
+        brain.SUPPORTED_FILE = os.path.join(directory, "supported_pids.txt")
+        try:
+            for scenario in args.scenario:
+                for backend in args.backend:
+                    report(backend, args, scenario)
+        finally:
+            brain.ADAPTER_FILE, brain.SUPPORTED_FILE = saved_files
+
+if __name__ == "__main__":
+    main()
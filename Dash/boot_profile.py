@@ -0,0 +1,116 @@
+import argparse
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+# Seconds importing the dash should take at most before the logo can show
+BOOT_BUDGET = .5
+
+# A line of Python's -X importtime output: "import time: <self us> | <cumulative us> | <indent><module>"
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+def import_times(module):
+    """
+    Imports a module in a fresh Python and records how long each module it pulls in takes to import.
+
+    Args:
+        module (str): The module to import, e.g. "dash".
+
+    Returns:
+        list: The (name, self seconds, cumulative seconds, depth) of each module imported, in the order they finished.
+
+    Description:
+        - Uses Python's `-X importtime`, so the times are for a cold import with nothing cached in the process.
+        - The display is set to SDL's dummy driver so importing pygame doesn't open a window.
+    """
+
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy")
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=os.path.dirname(os.path.abspath(__file__)), env=env, capture_output=True, text=True)
+
+    times = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            self_time, cumulative, indent, name = match.groups()
+            times.append((name, int(self_time) / 1e6, int(cumulative) / 1e6, len(indent) // 2))
+    return times
+
+def import_tree(times):
+    """
+    Puts the import times back into the tree of which module imported which.
+
+    Args:
+        times (list): The import times from `import_times`.
+
+    Returns:
+        tuple: The (name, self seconds, cumulative seconds, children) of the last module imported at the top level.
+
+    Description:
+        - Python reports each module once it finishes importing, after everything it imported, so the modules one
+          level deeper reported since the last module at the same level are its children.
+    """
+
+    pending = defaultdict(list)
+    for name, self_time, cumulative, depth in times:
+        pending[depth].append((name, self_time, cumulative, pending.pop(depth + 1, [])))
+    return pending[0][-1]
+
+def flatten(node):
+    """
+    Yields a module from `import_tree` and every module below it.
+    """
+
+    yield node
+    for child in node[3]:
+        yield from flatten(child)
+
+def print_tree(node, total, depth, indent="  "):
+    """
+    Prints a module and the modules it imported that took at least a millisecond, slowest first.
+
+    Args:
+        node (tuple): A module from `import_tree`.
+        total (float): The seconds the whole import took.
+        depth (int): How many levels of imports to print below the module.
+        indent (str, optional): Spaces to print before the module.
+    """
+
+    name, _, cumulative, children = node
+    print(f"{indent}{name}: {cumulative * 1000:.1f} ms ({cumulative / total * 100:.0f}%)")
+    if depth > 0:
+        for child in sorted(children, key=lambda child: -child[2]):
+            if child[2] >= .001:
+                print_tree(child, total, depth - 1, indent + "  ")
+
+def main():
+    parser = argparse.ArgumentParser(description="Report how long each module takes to import when the dash boots.")
+    parser.add_argument("--module", default="dash")
+    parser.add_argument("--top", type=int, default=15, help="Number of the slowest modules to list")
+    parser.add_argument("--depth", type=int, default=2, help="Levels of imports to show below the module")
+    parser.add_argument("--budget", type=float, default=BOOT_BUDGET, help="Seconds importing the dash should take at most")
+    args = parser.parse_args()
+
+    times = import_times(args.module)
+    if not times:
+        print(f"Could not import {args.module}")
+        return
+
+    # The module asked for finishes last, so its cumulative time is the whole import
+    tree = import_tree(times)
+    total = tree[2]
+    status = "within" if total <= args.budget else "over"
+    print(f"\nImporting {args.module}: {total:.3f} seconds, {status} the {args.budget:.3f} second budget")
+
+    # What the dash imports, with everything each of those pulls in
+    print("\n  Imports taking at least 1 ms:")
+    print_tree(tree, total, args.depth, "    ")
+
+    print(f"\n  Slowest {args.top} modules by their own import time:")
+    for name, self_time, _, _ in sorted(flatten(tree), key=lambda node: -node[1])[:args.top]:
+        print(f"    {name}: {self_time * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -1,51 +1,67 @@
 import random
-import obd
 import threading
 import math
 from Helper.brain import *
 from Helper.pages import *
 from Helper.events import *
+from Helper.scheduler import PidScheduler, CHANNELS
+from Helper.frames import FrameScheduler
+from Helper.touch import HoldRepeat
+from Helper.registry import PAGES, DashState
+from Helper.elm327 import Elm327Backend
+from Helper.telemetry import TelemetryBuffer, RunBuffer
+from Helper.supported import SupportedPids
 
 from collections import defaultdict
 
+# Settings and everything else the pages show and change, besides the readings
+state = DashState()
+
 # Load Brightness
-brightness = get_brightness()
+state.brightness = get_brightness()
 
 # Load RPM
-rpm_max, shift = load_rpm()
+state.rpm_max, state.shift = load_rpm()
 
 # Load Performance Stats
-top_speed = load_performance()
+state.top_speed = load_performance()
 
 # Environment Variables
 DEV = True
 PI = False
 SYSTEM_VERSION = "2.7.0"
+PORT = "/dev/rfcomm0" # The Bluetooth port for RFCOMM on Raspberry Pi
+BACKEND = "obd" # "obd" to use python-obd, "elm327" to use the lean ELM327 driver
+EMULATOR = False # Run the real connection path against the bundled ELM327 emulator instead of fake values (with DEV)
+EMULATOR_LATENCY = .03 # Seconds the emulator waits before answering each request
+MAX_FAILURES = 3 # Failed queries in a row before the connection counts as lost
+LINK_TIMEOUT = 5 # Seconds without a reading before a failed query counts the connection as lost
+BACKOFF_START = 1 # Seconds to wait before the first reconnect attempt, doubling each attempt
+BACKOFF_MAX = 30 # Most seconds to wait between reconnect attempts
+ADAPTER_FAILURES = 3 # Attempts in a row the adapter doesn't answer at the saved baud rate before the saved settings are forgotten
+RUN_SECONDS = 300 # Longest tracked run kept, the oldest samples are dropped after that
+RUN_SAMPLES = RUN_SECONDS * FPS # Room for a sample every frame, the fastest a run can get new speed readings
 
 # Global Variables
-supported = []
+supported = SupportedPids()
 connect = False
-delay = 0
-optimize = 0
-cleared = 0
-clear = False
-rpm = 0
-speed = 0
-maf = 0
-mpg = 0
-fuel_level= 0
-voltage = 0
-air_temp = 0
-codes = []
 logging = True
-exit_text = "Exiting..."
 connection = None
 current_page = (0, 0)
-development_mode = False
+adapter_failures = 0
+
+# Readings from the car, written by the query thread and read once per frame by the render loop
+telemetry = TelemetryBuffer()
+
+# Decides which value to read from the car next
+scheduler = PidScheduler(CHANNELS)
 
 # Initialize a dictionary to store only the rolling averages
 query_times = defaultdict(lambda: {"average": None})
 
+# How stable the connection to the car is
+link_stats = {"reconnects": 0, "downtime": 0.0, "down_since": None}
+
 pages = [
     ["Main"],
     ["Performance"],
@@ -60,91 +76,119 @@ def try_connect():
     Attempts to establish a connection to the OBD-II adapter via Bluetooth, unless development mode is enabled.
 
     Description:
-        - In development mode (`DEV=True`), the function skips the connection process, assuming simulated data is being used.
-        - If not in development mode (`DEV=False`), the function tries to connect to the OBD-II adapter using the "/dev/rfcomm0" port on a Raspberry Pi.
-        - Once connected, it checks if supported PIDs (Parameter IDs) are already loaded.
-        - If supported PIDs are not loaded, the function queries the OBD-II adapter for the supported PIDs (commands A, B, and C).
-        - The results from the adapter are converted into binary strings to identify supported PIDs, which are then saved for later use.
+        - In development mode (`DEV=True`), the function skips the connection process, assuming simulated data is being used, unless `EMULATOR` is on.
+        - If not in development mode (`DEV=False`), the function tries to connect to the OBD-II adapter on `PORT` ("/dev/rfcomm0" on a Raspberry Pi).
+        - `BACKEND` picks between python-obd and the lean ELM327 driver for talking to the adapter.
+        - The baud rate and protocol that last worked are tried first, which skips the slow detection, and saved again once connected.
+        - If the adapter doesn't answer at the saved baud rate `ADAPTER_FAILURES` times in a row, the saved settings are forgotten so the next attempt detects them.
+        - Once connected, it reads the car's VIN and checks if supported PIDs (Parameter IDs) are already saved for that car.
+        - If supported PIDs are not saved, the function queries the OBD-II adapter for the supported PIDs (commands A, B, and C) and saves them for later use under the VIN.
+        - Cars that don't report a VIN have their supported PIDs queried on every connection, so another car's PIDs are never used.
         - The connection is retried up to 3 times if it fails.
 
     Global Variables:
         connect (bool): Indicates if the connection to the OBD-II adapter was successful.
-        connection (obd.OBD): The connection object representing the OBD-II connection.
-        supported (list): List of supported PIDs retrieved from the OBD-II adapter.
+        connection (ObdBackend or Elm327Backend): The connection object representing the OBD-II connection.
+        supported (SupportedPids): The supported PIDs retrieved from the OBD-II adapter.
 
     Exceptions:
         - Catches and prints any exceptions that occur during the connection attempt.
         - Prints an error message if the connection fails after multiple attempts.
     """
 
-    global connect, connection, supported
-    if not DEV:
+    global connect, connection, supported, adapter_failures
+    if not DEV or EMULATOR:
         for i in range(3):
+            if not logging:
+                break  # The dash is shutting down
             try:
                 print('\nAttempting to connect...\n')
 
-                # The Bluetooth port for RFCOMM on Raspberry Pi
-                port = "/dev/rfcomm0"
-                    
                 # Connect to the OBD-II adapter
-                connection = obd.OBD(portstr=port)
+                baudrate, protocol = load_adapter()
+                if BACKEND == "elm327":
+                    connection = Elm327Backend(PORT, baudrate or 38400, protocol=protocol)
+                else:
+                    # python-obd takes seconds to import on the Pi, so it is only loaded on this thread when it is needed
+                    from Helper.obd_backend import ObdBackend
+                    connection = ObdBackend(PORT, baudrate, protocol)
 
                 # Print a message indicating connection
                 if connection.is_connected():
                     print("Connected to OBD-II adapter. Turning on display.")
+                    adapter_failures = 0
 
-                    supported = load_supported()
+                    # Remember what worked for the next connection
+                    if (connection.baudrate(), connection.protocol_id()) != (baudrate, protocol):
+                        save_adapter(connection.baudrate(), connection.protocol_id())
+
+                    vin = connection.vin()
+                    supported = load_supported(vin) if vin else SupportedPids()
 
                     if len(supported) == 0:
-                        # Query the supported PIDs for different ranges
-                        supported_response_a = connection.query(obd.commands.PIDS_A)
-                        supported_response_b = connection.query(obd.commands.PIDS_B)
-                        supported_response_c = connection.query(obd.commands.PIDS_C)
-
-                        # Initialize an empty string for the combined binary string
-                        combined_binary_string = ""
-
-                        # Convert each supported response to a binary string and concatenate
-                        if supported_response_a.value:
-                            bit_array_a = supported_response_a.value
-                            binary_string_a = ''.join(str(int(bit)) for bit in bit_array_a)
-                            combined_binary_string += binary_string_a  # Append A's binary string
-                        
-                        if supported_response_b.value:
-                            bit_array_b = supported_response_b.value
-                            binary_string_b = ''.join(str(int(bit)) for bit in bit_array_b)
-                            combined_binary_string += binary_string_b  # Append B's binary string
-                        
-                        if supported_response_c.value:
-                            bit_array_c = supported_response_c.value
-                            binary_string_c = ''.join(str(int(bit)) for bit in bit_array_c)
-                            combined_binary_string += binary_string_c  # Append C's binary string
-
-                        # Loop through each bit and check if the PID is supported
-                        for i, bit in enumerate(combined_binary_string):
-                            pid_number = i + 1  # PIDs start from 1
-                            if bit == '1':
-                                supported.append(f"0x{pid_number:02X}")
-
-                        save_supported(supported)
+                        supported = connection.supported_pids()
+                        if vin:
+                            save_supported(vin, supported)
                     
                     connect = True
                     break
                 else:
                     print("Could not connect to OBD-II adapter.")
+            except ConnectionError as e:
+                # The adapter didn't answer at the saved baud rate, keep the settings unless it keeps happening
+                print(e)
+                adapter_failures += 1
+                if adapter_failures >= ADAPTER_FAILURES:
+                    print("Forgetting the saved adapter settings, they will be detected again.")
+                    forget_adapter()
+                    adapter_failures = 0
             except Exception as e:
                 print(e)
                 print('An error occurred.')
 
-# Function to constantly try to connect
+# Function to work out how long to wait before the next reconnect attempt
+def backoff_time(attempt):
+    # Double the wait each attempt, with some randomness so retries don't line up with the adapter's own resets
+    return min(BACKOFF_MAX, BACKOFF_START * 2 ** attempt) * random.uniform(.5, 1)
+
+# Function to keep the connection to the car alive, reconnecting whenever it is lost
 def connect_thread():
-    try_connect()
-    while not connect:
-        time.sleep(5)
+    attempt = 0
+    while logging:
         try_connect()
-    
-    # Run Queries on Separate Thread
-    threading.Thread(target=query, daemon=True).start()
+        if not connect:
+            # Wait in short steps so shutting down isn't held up
+            retry_time = time.time() + backoff_time(attempt)
+            while logging and time.time() < retry_time:
+                time.sleep(.1)
+            attempt += 1
+            continue
+
+        attempt = 0
+        if link_stats["down_since"] is not None:
+            # Back after losing the connection
+            link_stats["reconnects"] += 1
+            link_stats["downtime"] += time.time() - link_stats["down_since"]
+            link_stats["down_since"] = None
+
+        # Run the queries until the connection is lost
+        query()
+
+# Function to give up on a connection that stopped working
+def lose_connection():
+    global connect
+
+    print('Lost the connection to the car, reconnecting.')
+    connect = False
+    link_stats["down_since"] = time.time()
+
+    # Keep showing the last readings, but mark them as old
+    telemetry.mark_stale()
+
+    try:
+        connection.close()
+    except Exception as e:
+        print(f'An error occurred while closing the connection: {e}')
 
 # Function to update the rolling average using the exponential moving average (EMA)
 def update_rolling_average(query_name, time_taken, alpha=0.1):
@@ -156,202 +200,115 @@ def update_rolling_average(query_name, time_taken, alpha=0.1):
         avg = query_times[query_name]["average"]
         query_times[query_name]["average"] = alpha * time_taken + (1 - alpha) * avg
 
+# Function to store a value read from the car, it is shown once the telemetry is published
+def store_reading(name, value, sample_time, sample_error):
+    telemetry.store(name, value, sample_time, sample_error)
+
 # Function for making the queries for everything needed in the dash
 def query():
-    # Get global variables
-    global clear, cleared, rpm, speed, maf, mpg, fuel_level, voltage, air_temp, codes, development_mode
-
-    delay1 = time.time()
-    delay2 = time.time()
-
-    # Made it these specific times so that all queries only line up every 9.1 seconds
-    first_delay = .7
-    second_delay = 1.3
+    subscription = None
+    idle = 0
+    failures = 0
+    last_reading = time.time()
     while logging and connect:
-        current_time = time.time()
         try:
-            if pages[current_page[0]][current_page[1]] == "Main":
-                # Get RPM
-                if '0x0C' in supported:
-                    if development_mode:
-                        start_time = time.time()  # Track start time
-                    response_rpm = connection.query(obd.commands.RPM)
-                    if not response_rpm.is_null():
-                        rpm = int(round(response_rpm.value.magnitude, 0))
-                    if development_mode:
-                        query_time = time.time() - start_time  # Calculate query time
-                        update_rolling_average("RPM", query_time)
-
-                # Run every first_delay seconds or if delay is on
-                if current_time - delay1 >= first_delay or delay:
-                    delay1 = current_time
-
-                    if not optimize:
-                        # Get Speed and MPG
-                        if '0x0D' in supported and '0x10' in supported:
-                            if development_mode:
-                                start_time_speed = time.time()  # Start timer for speed query
-                            response_speed = connection.query(obd.commands.SPEED)  # Vehicle speed
-                            if not response_speed.is_null():
-                                speed = response_speed.value.to('mile/hour').magnitude
-                            if development_mode:
-                                query_time_speed = time.time() - start_time_speed  # Time taken for speed query
-                                update_rolling_average("Speed", query_time_speed)  # Update rolling average for speed
-
-                            if development_mode:
-                                start_time_maf = time.time()  # Start timer for MAF query
-                            response_maf = connection.query(obd.commands.MAF)  # Mass Air Flow
-                            if not response_maf.is_null():
-                                maf = response_maf.value.to('gram/second').magnitude
-                            if development_mode:
-                                query_time_maf = time.time() - start_time_maf  # Time taken for MAF query
-                                update_rolling_average("MAF", query_time_maf)  # Update rolling average for MAF
-
-                            # If both speed and MAF are valid, calculate MPG
-                            if not response_speed.is_null() and not response_maf.is_null():
-                                mpg = calculate_mpg(speed, maf)
-
-                    # Get fuel level
-                    if '0x2F' in supported:
-                        if development_mode:
-                            start_time = time.time()
-                        response_fuel_level = connection.query(obd.commands.FUEL_LEVEL)
-                        if not response_fuel_level.is_null():
-                            fuel_level = response_fuel_level.value.magnitude
-                        if development_mode:
-                            query_time = time.time() - start_time
-                            update_rolling_average("Fuel_Level", query_time)
-
-                # Run every second_delay second or if delay is on
-                if not optimize:
-                    if current_time - delay2 >= second_delay or delay:
-                        delay2 = current_time
-
-                        # Get voltage
-                        if '0x42' in supported:
-                            if development_mode:
-                                start_time = time.time()
-                            response_voltage = connection.query(obd.commands.CONTROL_MODULE_VOLTAGE)
-                            if not response_voltage.is_null():
-                                voltage = response_voltage.value.magnitude
-                            if development_mode:
-                                query_time = time.time() - start_time
-                                update_rolling_average("Voltage", query_time)
-
-                        # Get air temperature
-                        if '0x46' in supported:
-                            if development_mode:
-                                start_time = time.time()
-                            response_air_temp = connection.query(obd.commands.AMBIANT_AIR_TEMP)
-                            if not response_air_temp.is_null():
-                                air_temp = response_air_temp.value.magnitude
-                            if development_mode:
-                                query_time = time.time() - start_time
-                                update_rolling_average("Air_Temp", query_time)
-
-            elif pages[current_page[0]][current_page[1]] == "Trouble" or pages[current_page[0]][current_page[1]] == "RPM":
-                # Get RPM
-                if '0x0C' in supported:
-                    if development_mode:
-                        start_time = time.time()
-                    response_rpm = connection.query(obd.commands.RPM)
-                    if not response_rpm.is_null():
-                        rpm = int(round(response_rpm.value.magnitude, 0))
-                    if development_mode:
-                        query_time = time.time() - start_time
-                        update_rolling_average("RPM_Trouble", query_time)
-
-                    # Get CEL codes
-                    if development_mode:
+            page = PAGES[pages[current_page[0]][current_page[1]]]
+
+            # Only poll what the current page displays
+            if (page, state.optimize) != subscription:
+                scheduler.subscribe(page.subscription(state.optimize), supported)
+                subscription = (page, state.optimize)
+            scheduler.delay = state.delay
+
+            # Attempt to clear CEL
+            if state.clear and page.name in ("Trouble", "RPM") and '0x0C' in supported:
+                if telemetry.snapshot().rpm == 0:  # Only run if engine is off
+                    if state.development_mode:
                         start_time = time.time()
-                    response_cel = connection.query(obd.commands.GET_DTC)
-                    if not response_cel.is_null():
-                        codes = response_cel.value
-                    if development_mode:
+                    if connection.clear_codes():
+                        state.cleared = 1  # Success
+                        state.clear = False
+                    else:
+                        state.cleared = 2  # Error
+                    if state.development_mode:
                         query_time = time.time() - start_time
-                        update_rolling_average("CEL_Codes", query_time)
-
-                    # Attempt to clear CEL
-                    if clear:
-                        if rpm == 0:  # Only run if engine is off
-                            if development_mode:
-                                start_time = time.time()
-                            response_clear = connection.query(obd.commands.CLEAR_DTC)
-                            if not response_clear.is_null():
-                                cleared = 1  # Success
-                                clear = False
-                            else:
-                                cleared = 2  # Error
-                            if development_mode:
-                                query_time = time.time() - start_time
-                                update_rolling_average("Clear_DTC", query_time)
-                        else:
-                            cleared = 3  # Engine needs to be off
-    
-            elif pages[current_page[0]][current_page[1]] == "Performance":
-                if '0x0C' in supported:
-                    if development_mode:
-                        start_time = time.time()  # Track start time
-                    response_rpm = connection.query(obd.commands.RPM)
-                    if not response_rpm.is_null():
-                        rpm = int(round(response_rpm.value.magnitude, 0))
-                    if development_mode:
-                        query_time = time.time() - start_time  # Calculate query time
-                        update_rolling_average("RPM_Performance", query_time)
-
-                # Get Speed
-                if '0x0D' in supported:
-                    if development_mode:
-                        start_time_speed = time.time()  # Start timer for speed query
-                    response_speed = connection.query(obd.commands.SPEED)  # Vehicle speed
-                    if not response_speed.is_null():
-                        speed = response_speed.value.to('mile/hour').magnitude
-                    if development_mode:
-                        query_time_speed = time.time() - start_time_speed  # Time taken for speed query
-                        update_rolling_average("Speed_Performance", query_time_speed)  # Update rolling average for speed
-
-            time.sleep(.03)  # Increasing this will slow down queries
+                        update_rolling_average("Clear_DTC", query_time)
+                else:
+                    state.cleared = 3  # Engine needs to be off
+
+            # Wait until something is due, checking back often in case the page changes
+            channels, wait = scheduler.next_batch(time.time(), connection.batch_limit())
+            if not channels or wait > 0:
+                sleep_time = scheduler.idle_time(wait) if channels else .05
+                time.sleep(sleep_time)
+                idle += sleep_time
+                continue
+
+            start_time = time.time()
+            values = connection.read(channels)
+            query_time = time.time() - start_time
+            for channel in channels:
+                scheduler.mark_polled(channel, start_time)
+
+            # The car read the values somewhere during the request, the middle is the best guess and off by at most half of it
+            sample_time = start_time + query_time / 2
+            for name, value in values.items():
+                store_reading(name, value, sample_time, query_time / 2)
+            telemetry.publish()
+
+            # Adapt the polling rate to how fast the car is answering
+            scheduler.record(query_time, idle)
+            idle = 0
+            update_rolling_average(channels[0].name if len(channels) == 1 else "Batch", query_time)
+
+            if values:
+                failures = 0
+                last_reading = time.time()
+            else:
+                failures += 1
 
         except Exception as e:
             print(f'An error occurred: {e}')
-            print('Restarting script')
-            exit()
+            failures += 1
+            time.sleep(.1)
+
+        # Retry a few times in case it was a one off, then reconnect
+        if failures >= MAX_FAILURES or (failures and time.time() - last_reading > LINK_TIMEOUT) or not connection.is_connected():
+            lose_connection()
             
 # Main function for the Pygame interface
 def main():
     # Get global variables
-    global delay, optimize, brightness, rpm_max, shift, cleared, clear, rpm, speed, maf, mpg, fuel_level, voltage, air_temp, codes, logging, exit_text, current_page, development_mode, top_speed
+    global logging, current_page, PORT
 
     # Initialize variables
-    FLIP = False
     mouse_button_down = False
-    skip = True
-    changed_image = False
+    hold = HoldRepeat()
     previous_info = []
-    last_top_speed = 0
-    tracking = False
-    speed_times = []
     performance_graph_added = False
-    elapsed_time = None
-    reset_performance = False
 
     # Show development things in DEV mode
-    if DEV:
-        development_mode = True
-        show_fps = True
-    else:
-        development_mode = False
-        show_fps = False
+    state.development_mode = DEV
+    state.show_fps = DEV
+
+    # Share what the pages show from the connection
+    state.DEV = DEV
+    state.SYSTEM_VERSION = SYSTEM_VERSION
+    state.query_times = query_times
+    state.link_stats = link_stats
+
+    # Samples of tracked runs, allocated once up to RUN_SAMPLES and cut to the last RUN_SECONDS
+    state.speed_times = RunBuffer(RUN_SAMPLES, RUN_SECONDS)
 
     swipe_start_x = 0
     swipe_start_y = 0
     swipe_threshold = 50  # Threshold for swipe detection (in pixels)
 
     # Find images
-    images = find_images("Images/backgrounds/")
+    state.images = find_images("Images/backgrounds/")
 
     # Load saved information
-    current_page, shift_light, delay, optimize, font_index, background_1_index, background_2_index, shift_color_1, shift_color_2, shift_color_3, shift_color_4, shift_padding, image_index = read_info(pages, len(images))
+    current_page, state.shift_light, state.delay, state.optimize, state.font_index, state.background_1_index, state.background_2_index, state.shift_color_1, state.shift_color_2, state.shift_color_3, state.shift_color_4, state.shift_padding, state.image_index = read_info(pages, len(state.images))
 
     # Load Pygame
     if not PI:
@@ -362,8 +319,9 @@ def main():
     screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
     pygame.display.set_caption("Smart Dash")
     clock = pygame.time.Clock()
+    frame_scheduler = FrameScheduler(FPS, IDLE_FPS)
 
-    if DEV:
+    if DEV and not EMULATOR:
         # Set fake initial values
         rpm = 650
         fuel_level = random.randint(0,100)
@@ -372,21 +330,29 @@ def main():
         voltage = 15.5
         current_gear = 0
     else:
+        if EMULATOR:
+            # The emulator needs a pseudo-terminal, which Windows doesn't have, so it is only loaded when it is used
+            from Helper.emulator import Elm327Emulator
+
+            # Point the connection at an emulated adapter instead of the car
+            emulator = Elm327Emulator(latency=EMULATOR_LATENCY)
+            PORT = emulator.start()
+
         # Keep trying to connect on Separate Thread
         threading.Thread(target=connect_thread, daemon=True).start()
 
         # Display Chevrolet logo
         display_logo(screen_2)
 
-    # Load the image you want to display
-    background_image = pygame.image.load(images[image_index])
-    background_image = pygame.transform.scale(background_image, (SCREEN_WIDTH, SCREEN_HEIGHT))
-    
     # Development variables
     develop_added = False
 
+    # What was drawn last frame, to only update the parts of the display that changed
+    previous_regions = None
+    previous_frame = None
+
     while logging:
-        if development_mode:
+        if state.development_mode:
             if not develop_added:
                 pages.append(["Development"])
                 develop_added = True
@@ -394,27 +360,23 @@ def main():
             pages.remove(["Development"])
             develop_added = False
 
-        if changed_image:
-            # Load and change the new background
-            background_image = pygame.image.load(images[image_index])
-            background_image = pygame.transform.scale(background_image, (SCREEN_WIDTH, SCREEN_HEIGHT))
-            changed_image = False
-
-        FONT_COLOR = COLORS[font_index] # Default font color
-        BACKGROUND_1_COLOR = COLORS[background_1_index] # Default background 1 color
-        BACKGROUND_2_COLOR = COLORS[background_2_index] # Default background 2 color
-
-        # Create a mask surface that will use the BACKGROUND_2_COLOR and become transparent
-        screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        FONT_COLOR = state.FONT_COLOR # Default font color
+        BACKGROUND_2_COLOR = state.BACKGROUND_2_COLOR # Default background 2 color
 
         # Set the color key to make BACKGROUND_2_COLOR transparent on the mask
-        screen.set_colorkey(BACKGROUND_2_COLOR)
+        if screen.get_colorkey() != (*BACKGROUND_2_COLOR, 255):
+            screen.set_colorkey(BACKGROUND_2_COLOR)
 
-        # Tint the background image with BACKGROUND_2_COLOR
-        tinted_background = tint_image(background_image, BACKGROUND_2_COLOR)
+        # Get the background image tinted with BACKGROUND_2_COLOR, it is only loaded and tinted again when one of them changes
+        tinted_background = get_background(state.images[state.image_index], BACKGROUND_2_COLOR)
 
         # Check if connected to internet
-        wifi = check_wifi()
+        state.wifi = check_wifi()
+
+        # Look up the page on screen, going back to the first page of the row if it is gone
+        if current_page[1] >= len(pages[current_page[0]]):
+            current_page = (current_page[0], 0)
+        page = PAGES[pages[current_page[0]][current_page[1]]]
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
@@ -430,82 +392,60 @@ def main():
 
                 mouseX, mouseY = event.pos[0], event.pos[1]
 
-                if FLIP:
+                if state.FLIP:
                     mouseY = SCREEN_HEIGHT - mouseY
 
                 if event.button == 1:  # Left mouse button
+                    if page.handle is not None:
+                        page.handle(state, mouseX, mouseY, False)
 
-                    if pages[current_page[0]][current_page[1]] == "RPM":
-                        rpm_max, shift = rpm_event(mouseX, mouseY, rpm_max, shift)
-
-                    elif pages[current_page[0]][current_page[1]] == "Settings":
-                        brightness, optimize, FLIP, delay, reset_performance, top_speed = settings_event(mouseX, mouseY, brightness, optimize, FLIP, delay, reset_performance, top_speed)
-
-                    elif pages[current_page[0]][current_page[1]] == "Trouble":
-                        clear = trouble_event(mouseX, mouseY, clear)
-
-                    elif pages[current_page[0]][current_page[1]] == "Info":
-                        logging, exit_text, development_mode = info_event(mouseX, mouseY, wifi, logging, exit_text, development_mode)
-                    
-                    elif pages[current_page[0]][current_page[1]] == "Development":
-                        show_fps = development_event(mouseX, mouseY, show_fps)
-
-                    elif pages[current_page[0]][current_page[1]] == "Custom":
-                        font_index, background_1_index, background_2_index, image_index, changed_image = custom_event(mouseX, mouseY, images, font_index, background_1_index, background_2_index, image_index, changed_image)
-                    
-                    elif pages[current_page[0]][current_page[1]] == "Color1":
-                        shift_light, shift_color_1, shift_color_2, shift_color_3, shift_color_4, shift_padding = color_1_event(mouseX, mouseY, shift_light, shift_color_1, shift_color_2, shift_color_3, shift_color_4, shift_padding)
-                    
-                    elif pages[current_page[0]][current_page[1]] == "Performance":
-                        tracking = performance_event(mouseX, mouseY, tracking)
-
-                skip = True
-                time.sleep(.1) # How long someone presses for a single click
+                    # Start timing the touch for repeating it while it is held
+                    hold.press(time.time())
             
             elif event.type == pygame.MOUSEBUTTONUP:
                 if event.button == 1:
                     mouse_button_down = False
+                    hold.release()
 
-        # If holding down button
-        if mouse_button_down:
-            if not skip:
+        # If holding down button, repeat the press each time it comes up
+        if mouse_button_down and page.repeat:
+            if hold.due(time.time()):
                 mouseX, mouseY = pygame.mouse.get_pos()
 
-                if pages[current_page[0]][current_page[1]] == "RPM":
-                    rpm_max, shift = rpm_event(mouseX, mouseY, rpm_max, shift)
+                if state.FLIP:
+                    mouseY = SCREEN_HEIGHT - mouseY
 
-                elif pages[current_page[0]][current_page[1]] == "Settings":
-                    brightness, optimize, FLIP, delay, reset_performance, top_speed = settings_event(mouseX, mouseY, brightness, optimize, FLIP, delay, reset_performance, top_speed, True)
-                
-                elif pages[current_page[0]][current_page[1]] == "Custom":
-                    font_index, background_1_index, background_2_index, image_index, changed_image = custom_event(mouseX, mouseY, images, font_index, background_1_index, background_2_index, image_index, changed_image, True)
+                page.handle(state, mouseX, mouseY, True)
 
-                elif pages[current_page[0]][current_page[1]] == "Color1":
-                    shift_light, shift_color_1, shift_color_2, shift_color_3, shift_color_4, shift_padding = color_1_event(mouseX, mouseY, shift_light, shift_color_1, shift_color_2, shift_color_3, shift_color_4, shift_padding)
+        # Closed from the Info page
+        if not state.running:
+            logging = False
 
-                time.sleep(.1) # How long it takes to cycle to the next item
-            
-            skip = False
-        
         # Only write to file if the information has changed
-        new_info = [current_page, shift_light, delay, optimize, font_index, background_1_index, background_2_index, shift_color_1, shift_color_2, shift_color_3, shift_color_4, shift_padding, image_index]
+        new_info = [current_page, state.shift_light, state.delay, state.optimize, state.font_index, state.background_1_index, state.background_2_index, state.shift_color_1, state.shift_color_2, state.shift_color_3, state.shift_color_4, state.shift_padding, state.image_index]
         if new_info != previous_info:
-            write_info(current_page, shift_light, delay, optimize, font_index, background_1_index, background_2_index, shift_color_1, shift_color_2, shift_color_3, shift_color_4, shift_padding, image_index)
+            write_info(*new_info)
             previous_info = new_info
 
-        top_speed, last_top_speed, speed_times, graph_made, elapsed_time, zero_to_sixty_time, zero_to_hundred_time = calculate_performance(FONT_COLOR, speed, top_speed, last_top_speed, tracking, speed_times, rpm, elapsed_time)
+        # Use the same readings for everything drawn this frame
+        snapshot = telemetry.snapshot()
+        state.connect = connect
+        state.supported = supported
+
+        state.top_speed, state.last_top_speed, state.speed_times, state.elapsed_time, state.zero_to_sixty_time, state.zero_to_sixty_error, state.zero_to_hundred_time, state.zero_to_hundred_error = calculate_performance(FONT_COLOR, snapshot.speed, state.top_speed, state.last_top_speed, state.tracking, state.speed_times, snapshot.rpm, state.elapsed_time, snapshot.speed_time, snapshot.speed_error)
         
         # Reset the flag
-        if top_speed:
-            reset_performance = False
+        if state.top_speed:
+            state.reset_performance = False
 
-        if graph_made:
+        # Show the graph pages once the worker has drawn the graphs of a finished run
+        if collect_graphs():
             if not performance_graph_added:
                 pages[1].append("Speed_Time")
                 pages[1].append("Speed_RPM")
                 performance_graph_added = True
 
-        if DEV:
+        if DEV and not EMULATOR:
             # Define maximum speed
             max_speed = 300
 
@@ -516,11 +456,11 @@ def main():
             current_ratio = gear_ratios[current_gear]
 
             # RPM calculation with some randomness to simulate fluctuations
-            rpm = random.randint(max(0, rpm - 10), min(rpm + 10, rpm_max))
+            rpm = random.randint(max(0, rpm - 10), min(rpm + 10, state.rpm_max))
 
-            if tracking:
+            if state.tracking:
                 # Check if RPM exceeds shift point, shift up if possible
-                if rpm >= shift + random.randint(-5, 5) and current_gear < len(gear_ratios) - 1:
+                if rpm >= state.shift + random.randint(-5, 5) and current_gear < len(gear_ratios) - 1:
                     current_gear += 1
                     current_ratio = gear_ratios[current_gear]
                     # Adjust RPM for new gear, simulating the effect of shifting
@@ -528,10 +468,10 @@ def main():
 
                 # Increment RPM logarithmically for smooth progression
                 rpm_increment = 10 * (current_ratio**2)
-                rpm = min(int(rpm + rpm_increment), rpm_max)  # Increment RPM with cap at max RPM
+                rpm = min(int(rpm + rpm_increment), state.rpm_max)  # Increment RPM with cap at max RPM
                 
-                if rpm < rpm_max:
-                    speed_increment = (rpm/rpm_max)*(current_ratio / max(gear_ratios))
+                if rpm < state.rpm_max:
+                    speed_increment = (rpm/state.rpm_max)*(current_ratio / max(gear_ratios))
 
                     # Increase speed
                     speed += speed_increment
@@ -540,95 +480,90 @@ def main():
                     speed = min(speed, max_speed)
 
             # Ensure RPM does not exceed rpm_max
-            rpm = min(rpm, rpm_max)
+            rpm = min(rpm, state.rpm_max)
 
             maf = round(maf,0)
             maf = random.randint(max(1,maf-1), min(maf+1,80))
-            mpg = calculate_mpg(speed, maf)
             if fuel_level<=0:
                 fuel_level=100
             fuel_level -= .1
             voltage = random.uniform(max(14,voltage-.1), min(voltage+.1,15))
             air_temp = random.randint(0,50)
-            if clear:
-                cleared = random.randint(1,3)
-                clear = False
+            if state.clear:
+                state.cleared = random.randint(1,3)
+                state.clear = False
 
-            if cleared != 1:
+            if state.cleared != 1:
                 codes = [("P0104", "Mass or Volume Air Flow Circuit Intermittent"),("B0123", "This is a very long message to simulate a long description hoping for it to be cut off properly to have a consistent message flow."),("C0123", f"{' '.join(['*' for i in range(60)])}"), ("D0123", ""), ("E0123", "")]
             else:
                 codes = []
 
-        # Render pages
-        try:
-            if pages[current_page[0]][current_page[1]] == "Main":
-                main_page(screen, FONT_COLOR, BACKGROUND_1_COLOR, BACKGROUND_2_COLOR, fuel_level, rpm, rpm_max, shift, optimize, shift_light, mpg, speed, air_temp, voltage, shift_color_1, shift_color_2, shift_color_3, shift_color_4, shift_padding)
-            
-            elif pages[current_page[0]][current_page[1]] == "RPM":
-                page_guide(screen, screen_2, FONT_COLOR, BACKGROUND_2_COLOR, pages, current_page)
-                rpm_page(screen, FONT_COLOR, DEV, supported, rpm, rpm_max, shift, connect)
+            # Publish the fake values like the query thread would
+            now = time.time()
+            for name, value in (("rpm", rpm), ("speed", speed), ("maf", maf), ("fuel_level", fuel_level), ("voltage", voltage), ("air_temp", air_temp), ("codes", codes)):
+                telemetry.store(name, value, now)
+            telemetry.publish()
 
-            elif pages[current_page[0]][current_page[1]] == "Settings":
-                page_guide(screen, screen_2, FONT_COLOR, BACKGROUND_2_COLOR, pages, current_page)
-                settings_page(screen, FONT_COLOR, BACKGROUND_2_COLOR, brightness, optimize, delay, reset_performance)
-            
-            elif pages[current_page[0]][current_page[1]] == "Trouble":
-                page_guide(screen, screen_2, FONT_COLOR, BACKGROUND_2_COLOR, pages, current_page)
-                trouble_page(screen, FONT_COLOR, codes, cleared)
-            
-            elif pages[current_page[0]][current_page[1]] == "Info":
-                page_guide(screen, screen_2, FONT_COLOR, BACKGROUND_2_COLOR, pages, current_page)
-                info_page(screen, FONT_COLOR, SYSTEM_VERSION, wifi, development_mode)
-            
-            elif pages[current_page[0]][current_page[1]] == "Custom":
-                page_guide(screen, screen_2, FONT_COLOR, BACKGROUND_2_COLOR, pages, current_page)
-                custom_page(screen, FONT_COLOR, font_index, background_1_index, background_2_index, images, image_index)
-            
-            elif pages[current_page[0]][current_page[1]] == "Color1":
-                page_guide(screen, screen_2, FONT_COLOR, BACKGROUND_2_COLOR, pages, current_page)
-                color_1_page(screen, FONT_COLOR, shift, shift_light, shift_color_1, shift_color_2, shift_color_3, shift_color_4, shift_padding)
-            
-            elif pages[current_page[0]][current_page[1]] == "Development":
-                page_guide(screen, screen_2, FONT_COLOR, BACKGROUND_2_COLOR, pages, current_page)
-                developmental_page(screen, FONT_COLOR, show_fps, query_times)
+        # Swiping may have changed the page
+        if current_page[1] >= len(pages[current_page[0]]):
+            current_page = (current_page[0], 0)
+        page = PAGES[pages[current_page[0]][current_page[1]]]
 
-            elif pages[current_page[0]][current_page[1]] == "Performance":
-                page_guide(screen, screen_2, FONT_COLOR, BACKGROUND_2_COLOR, pages, current_page)
-                performance_page(screen, FONT_COLOR, BACKGROUND_2_COLOR, shift_color_1, shift_color_2, shift_color_3, shift_color_4, shift_padding, rpm, shift, top_speed, last_top_speed, tracking, elapsed_time, zero_to_sixty_time, zero_to_hundred_time)            
-            
-            elif pages[current_page[0]][current_page[1]] == "Speed_Time":
-                page_guide(screen, screen_2, FONT_COLOR, BACKGROUND_2_COLOR, pages, current_page)
-                speed_time_graph_page(screen)
+        # Let the pages know when they come on and leave the screen
+        state.show(page)
 
-            elif pages[current_page[0]][current_page[1]] == "Speed_RPM":
-                page_guide(screen, screen_2, FONT_COLOR, BACKGROUND_2_COLOR, pages, current_page)
-                speed_rpm_graph_page(screen)       
+        # Render the page, the ones that report their regions only have those parts updated on the display
+        if page.guide:
+            page_guide(screen, screen_2, FONT_COLOR, BACKGROUND_2_COLOR, pages, current_page)
+        regions = page.render(screen, state, snapshot)
 
-            elif pages[current_page[0]][current_page[1]] == "Off":
-                screen.fill(BLACK)
-                
-        except IndexError:
-            current_page = (current_page[0],0)
+        # Show that the readings are old while reconnecting
+        if snapshot.stale:
+            stale_rect = draw_text(screen, "Reconnecting...", font_small_clean, FONT_COLOR, SCREEN_WIDTH/2, SCREEN_HEIGHT*.85)
+            if regions is not None:
+                regions["stale"] = (stale_rect, True)
 
         # Show FPS
-        if development_mode and show_fps:
-            draw_text(screen, f"{clock.get_fps():.1f}", font_small_clean, FONT_COLOR, SCREEN_WIDTH*.96, SCREEN_HEIGHT*.96)
-
-        # Blit the tinted background image onto the screen first
-        screen_2.blit(tinted_background, (0, 0))
-
-        # Then blit the mask surface onto the screen (with transparency)
-        screen_2.blit(screen, (0, 0))
-
-        if FLIP:
-            flipped_screen = pygame.transform.flip(screen_2, False, True)
-            screen_2.blit(flipped_screen, (0, 0))
-
-        # Update the display
-        pygame.display.flip()
-        clock.tick(FPS)
-
-    print(exit_text)
+        if state.development_mode and state.show_fps:
+            fps_text = f"{clock.get_fps():.1f}"
+            fps_rect = draw_text(screen, fps_text, font_small_clean, FONT_COLOR, SCREEN_WIDTH*.96, SCREEN_HEIGHT*.96)
+            if regions is not None:
+                regions["fps"] = (fps_rect, fps_text)
+
+        # Anything besides the readings changing means the whole screen has to be drawn again
+        frame = (current_page, FONT_COLOR, state.BACKGROUND_1_COLOR, BACKGROUND_2_COLOR, state.image_index, state.optimize, state.shift_light, state.FLIP)
+
+        if regions is None or previous_regions is None or frame != previous_frame or state.FLIP:
+            # Blit the tinted background image onto the screen first
+            screen_2.blit(tinted_background, (0, 0))
+
+            # Then blit the mask surface onto the screen (with transparency)
+            screen_2.blit(screen, (0, 0))
+
+            if state.FLIP:
+                flipped_screen = pygame.transform.flip(screen_2, False, True)
+                screen_2.blit(flipped_screen, (0, 0))
+
+            # Update the display
+            pygame.display.flip()
+        else:
+            # Only put the regions that changed back together and send them to the display
+            rects = changed_regions(regions, previous_regions)
+            for rect in rects:
+                screen_2.blit(tinted_background, rect, rect)
+                screen_2.blit(screen, rect, rect)
+            pygame.display.update(rects)
+
+        previous_regions = regions
+        previous_frame = frame
+
+        # Draw less often while nothing on screen is changing, new readings or a touch draw the next frame straight away
+        blinking = snapshot.rpm > state.shift and (page.name == "Performance" or (page.name == "Main" and state.shift_light))
+        readings = snapshot.readings()
+        frame_scheduler.wait(mouse_button_down or state.tracking or blinking, lambda: pygame.event.peek() or telemetry.snapshot().readings() != readings)
+        clock.tick()
+
+    print(state.exit_text)
 
     if connect:
         # Close the connection